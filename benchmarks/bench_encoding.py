@@ -0,0 +1,91 @@
+"""Micro-benchmark: CompiledEncoder vs. the prediction page's original ``encode_input``.
+
+    python -m benchmarks.bench_encoding --rows 1 100 10000 100000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+from core.encoding import FEATURE_COLUMNS
+from core.model_registry import ENCODER_PATH, get_model, load_label_encoders
+
+
+def legacy_encode_input(label_encoders, job_title, experience_level, employment_type,
+                        company_location, company_size, education_required, years_experience):
+    """The page's encode_input before it was replaced, kept verbatim as the baseline."""
+    input_data = pd.DataFrame({
+        "job_title": [job_title],
+        "experience_level": [experience_level],
+        "employment_type": [employment_type],
+        "company_location": [company_location],
+        "company_size": [company_size],
+        "education_required": [education_required],
+        "years_experience": [years_experience]
+    })
+
+    for col in input_data.columns:
+        if input_data[col].dtype == "object":
+            if col in label_encoders:
+                le = label_encoders[col]
+                input_data[col] = input_data[col].apply(lambda x: x if x in le.classes_ else le.classes_[0])
+                input_data[col] = le.transform(input_data[col])
+            else:
+                le = LabelEncoder()
+                input_data[col] = le.fit_transform(input_data[col])
+
+    return input_data
+
+
+def random_profiles(label_encoders, n, seed=0):
+    """``n`` profiles drawn from the encoders' classes, with ~5% unseen values."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for col in FEATURE_COLUMNS:
+        if col in label_encoders:
+            values = rng.choice(np.append(label_encoders[col].classes_, "None"), n).astype(object)
+            data[col] = np.where(rng.random(n) < 0.05, "Unseen", values)
+        else:
+            data[col] = rng.integers(0, 31, n)
+    return pd.DataFrame(data)
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 100, 10_000, 100_000])
+    parser.add_argument("--legacy-max", type=int, default=1_000, help="largest row count to run the slow baseline on")
+    args = parser.parse_args(argv)
+
+    bundle = get_model()
+    # The baseline needs real LabelEncoders (transform), even if the app loads the JSON classes
+    encoder, label_encoders = bundle.encoder, load_label_encoders(ENCODER_PATH)
+
+    profiles = random_profiles(label_encoders, max(args.rows))
+    rows = list(profiles.itertuples(index=False, name=None))
+    expected = np.vstack([legacy_encode_input(label_encoders, *row).to_numpy() for row in rows[:200]])
+    assert np.array_equal(encoder.encode(profiles.iloc[:200]), expected), "encoders disagree"
+    assert np.array_equal(np.vstack([encoder.encode_row(*row) for row in rows[:200]]), expected), "encoders disagree"
+
+    print(f"{'rows':>8} {'legacy loop':>14} {'encode_row loop':>16} {'encode (batch)':>15} {'per row':>10}")
+    for n in args.rows:
+        subset, subset_rows = profiles.iloc[:n], rows[:n]
+        legacy = (f"{timed(lambda: [legacy_encode_input(label_encoders, *row) for row in subset_rows], repeat=1) * 1e3:.2f}ms"
+                  if n <= args.legacy_max else "-")
+        single = timed(lambda: [encoder.encode_row(*row) for row in subset_rows])
+        batch = timed(lambda: encoder.encode(subset))
+        print(f"{n:>8} {legacy:>14} {single * 1e3:>14.3f}ms {batch * 1e3:>13.3f}ms {batch / n * 1e6:>8.2f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Cold-import profiler and import-time budget check for the app's scripts.
+
+Runs each target's top-level imports in a fresh interpreter under
+``python -X importtime`` and reports the total plus the most expensive
+packages. Targets are page scripts (their module-level ``import`` statements
+are what Streamlit pays before the first element renders) or module names::
+
+    python -m benchmarks.import_time                       # profile the default targets
+    python -m benchmarks.import_time "pages/3 💰 Salary Prediction.py" --top 20
+    python -m benchmarks.import_time --check               # exit 1 if a budget is exceeded
+
+``--check`` compares the median of ``--repeat`` runs against ``BUDGETS``
+(seconds, measured on a warm disk cache); ``--budget`` overrides the budget
+for every target, e.g. on slower CI machines.
+"""
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from core.paths import BASE_DIR
+
+# Cold-import budgets in seconds
+BUDGETS = {
+    "Homepage.py": 1.2,
+    "pages/2 📊 Job Market Insights.py": 1.5,
+    "pages/3 💰 Salary Prediction.py": 1.5,
+}
+
+
+def import_statements(script):
+    """The module-level import statements of ``script``, as source code."""
+    with open(os.path.join(BASE_DIR, script), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def target_code(target):
+    return import_statements(target) if target.endswith(".py") else f"import {target}"
+
+
+def profile(target):
+    """``(seconds, {module: (self_us, cumulative_us)})`` for one cold import of ``target``."""
+    code = "import time\n_start = time.perf_counter()\n" + target_code(target) + "\nprint(time.perf_counter() - _start)"
+    env = dict(os.environ, PYTHONPATH=BASE_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=BASE_DIR, env=env,
+                            capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return float(result.stdout.strip().splitlines()[-1]), modules
+
+
+def by_package(modules):
+    """Self time summed per top-level package, in microseconds, most expensive first."""
+    totals = defaultdict(int)
+    for name, (self_us, _) in modules.items():
+        totals[name.split(".")[0]] += self_us
+    return sorted(totals.items(), key=lambda item: -item[1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile cold import time of the app's scripts.")
+    parser.add_argument("targets", nargs="*", help="page scripts or module names (default: the budgeted scripts)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per target; the median is reported (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=10, help="packages to list per target (default: %(default)s)")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 if a target exceeds its budget")
+    parser.add_argument("--budget", type=float, help="budget in seconds for every target, instead of BUDGETS")
+    args = parser.parse_args(argv)
+
+    over = []
+    for target in args.targets or list(BUDGETS):
+        runs = [profile(target) for _ in range(args.repeat)]
+        seconds = statistics.median(run[0] for run in runs)
+        budget = args.budget if args.budget is not None else BUDGETS.get(target)
+        status = "" if budget is None else f" (budget {budget:.2f}s{', OVER' if seconds > budget else ''})"
+        print(f"{target}: {seconds:.3f}s{status}")
+        for package, self_us in by_package(runs[-1][1])[:args.top]:
+            print(f"    {package:<24} {self_us / 1e3:9.1f} ms")
+        if budget is not None and seconds > budget:
+            over.append(target)
+
+    if args.check and over:
+        print(f"Import-time budget exceeded: {', '.join(over)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Macro-benchmark: full headless runs of the page scripts through Streamlit's ``AppTest``.
+
+Each page is run once from a fresh ``AppTest`` (which, in a fresh process,
+includes loading the dataset and model), then rerun ``--rounds`` times; the
+prediction page also times a "Predict Salary" click. Point ``AI_JOB_DATASET``
+at another CSV to benchmark the pages on it::
+
+    python -m benchmarks.pages --rounds 5
+    AI_JOB_DATASET=big.csv python -m benchmarks.pages --json
+
+``benchmarks.suite`` runs this in a subprocess per dataset scale.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+import warnings
+
+from core.paths import BASE_DIR
+
+PAGES = {
+    "homepage": "Homepage.py",
+    "insights": "pages/2 📊 Job Market Insights.py",
+    "prediction": "pages/3 💰 Salary Prediction.py",
+}
+TIMEOUT = 600
+
+
+def _timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    seconds = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"page raised: {at.exception[0].value}")
+    return seconds
+
+
+def _widget(widgets, label):
+    return next(widget for widget in widgets if widget.label == label)
+
+
+def bench_page(name, rounds):
+    """``{benchmark: [seconds, ...]}`` for one page."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(BASE_DIR, PAGES[name]), default_timeout=TIMEOUT)
+    results = {f"page.{name}.first_run": [_timed_run(at)]}
+    results[f"page.{name}.rerun"] = [_timed_run(at) for _ in range(rounds)]
+    if name == "prediction":
+        clicks = []
+        for i in range(rounds):
+            # A different profile each round, so the prediction cache doesn't answer it
+            job_title = _widget(at.selectbox, "Job Title")
+            job_title.select(job_title.options[1 + i % (len(job_title.options) - 1)])
+            _widget(at.selectbox, "Experience Level").select("Senior Level")
+            _widget(at.button, "Predict Salary").click()
+            clicks.append(_timed_run(at))
+        results["page.prediction.predict"] = clicks
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time full headless runs of the page scripts.")
+    parser.add_argument("pages", nargs="*", help=f"pages to run: {', '.join(PAGES)} (default: all)")
+    parser.add_argument("--rounds", type=int, default=5, help="reruns per page (default: %(default)s)")
+    parser.add_argument("--json", action="store_true", help="print the raw timings as JSON")
+    args = parser.parse_args(argv)
+    unknown = set(args.pages) - set(PAGES)
+    if unknown:
+        parser.error(f"unknown page(s): {', '.join(sorted(unknown))}")
+
+    warnings.filterwarnings("ignore")
+    results = {}
+    for name in args.pages or list(PAGES):
+        results.update(bench_page(name, args.rounds))
+    if args.json:
+        print(json.dumps(results))
+        return
+    for benchmark, times in results.items():
+        print(f"{benchmark:<32} {statistics.median(times) * 1e3:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""Benchmark suite: data load, encoding, inference, aggregation, PDFs and full page runs.
+
+Micro-benchmarks time one operation in-process with ``timeit`` (auto-ranged,
+median of ``--rounds``); where the app has replaced a slow path, the original
+is timed next to it as a ``legacy`` entry. Macro-benchmarks run
+``benchmarks.pages`` in a subprocess per dataset. Benchmarks that depend on
+the data run once per ``--scale``, on a copy of the CSV repeated that many
+times (built once into ``.cache/benchmarks``)::
+
+    python -m benchmarks.suite                          # 1x, micro + macro
+    python -m benchmarks.suite --scale 1 10 100 --save  # record a baseline
+    python -m benchmarks.suite --scale 1 10 --check     # exit 1 on a regression
+
+``--check`` fails when a benchmark's median is more than ``--tolerance``
+slower than in the saved baseline. Timings only compare on the same machine,
+so baselines are local files, not part of the repository.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+import pandas as pd
+
+from core.hashing import content_hash
+from core.paths import BASE_DIR
+
+DATA_PATH = os.path.join(BASE_DIR, "ai_job_dataset.csv")
+CACHE_DIR = os.path.join(BASE_DIR, ".cache", "benchmarks")
+BASELINE_PATH = os.path.join(BASE_DIR, "benchmarks", "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+
+# name -> (setup(context) -> callable, depends on the dataset size)
+BENCHMARKS = {}
+
+
+def benchmark(name, scaled=True):
+    """Register ``setup(context)``, which returns the zero-argument callable to time."""
+    def register(setup):
+        BENCHMARKS[name] = (setup, scaled)
+        return setup
+    return register
+
+
+def scaled_csv(scale, source=DATA_PATH):
+    """Path of ``source`` repeated ``scale`` times, with unique job ids; built on first use."""
+    if scale == 1:
+        return source
+    target = os.path.join(CACHE_DIR, f"ai_job_dataset.{content_hash(source)[:12]}.x{scale}.csv")
+    if not os.path.exists(target):
+        frame = pd.read_csv(source)
+        copies = []
+        for i in range(scale):
+            copy = frame.copy()
+            copy["job_id"] = copy["job_id"].astype(str) + f"-{i}"
+            copies.append(copy)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{target}.{os.getpid()}.tmp"
+        pd.concat(copies, ignore_index=True).to_csv(tmp, index=False)
+        os.replace(tmp, target)
+    return target
+
+
+class Context:
+    """What the benchmarks share at one scale; the dataset and model load on first use."""
+
+    def __init__(self, path, scale):
+        self.path = path
+        self.scale = scale
+        self._frame = None
+        self._bundle = None
+
+    @property
+    def frame(self):
+        if self._frame is None:
+            from core.dataset import read_dataset
+
+            self._frame = read_dataset(self.path)
+        return self._frame
+
+    @property
+    def bundle(self):
+        if self._bundle is None:
+            from core.model_registry import get_model
+
+            self._bundle = get_model()
+        return self._bundle
+
+    def profile(self):
+        """The first posting's features, in ``FEATURE_COLUMNS`` order."""
+        from core.encoding import FEATURE_COLUMNS
+
+        return tuple(self.frame[FEATURE_COLUMNS].iloc[0].tolist())
+
+
+# ---------- micro-benchmarks ----------
+@benchmark("data.csv_load")
+def bench_csv_load(ctx):
+    from core.dataset import read_dataset
+
+    return lambda: read_dataset(ctx.path)
+
+
+@benchmark("encode.legacy_encode_input", scaled=False)
+def bench_legacy_encode(ctx):
+    from benchmarks.bench_encoding import legacy_encode_input
+    from core.model_registry import ENCODER_PATH, load_label_encoders
+
+    label_encoders, profile = load_label_encoders(ENCODER_PATH), ctx.profile()
+    return lambda: legacy_encode_input(label_encoders, *profile)
+
+
+@benchmark("encode.encode_row", scaled=False)
+def bench_encode_row(ctx):
+    encoder, profile = ctx.bundle.encoder, ctx.profile()
+    return lambda: encoder.encode_row(*profile)
+
+
+@benchmark("encode.frame")
+def bench_encode_frame(ctx):
+    from core.encoding import FEATURE_COLUMNS
+
+    encoder, features = ctx.bundle.encoder, ctx.frame[FEATURE_COLUMNS]
+    return lambda: encoder.encode(features)
+
+
+@benchmark("predict.single", scaled=False)
+def bench_predict_single(ctx):
+    from core.encoding import predict_salaries
+
+    model, encoded = ctx.bundle.model, ctx.bundle.encoder.encode_row(*ctx.profile())
+    return lambda: predict_salaries(model, encoded)
+
+
+@benchmark("predict.batch")
+def bench_predict_batch(ctx):
+    from core.encoding import FEATURE_COLUMNS, predict_salaries
+
+    model, encoded = ctx.bundle.model, ctx.bundle.encoder.encode(ctx.frame[FEATURE_COLUMNS])
+    return lambda: predict_salaries(model, encoded)
+
+
+@benchmark("insights.legacy_groupbys")
+def bench_legacy_groupbys(ctx):
+    # The Insights page's per-rerun group-bys before the salary cube
+    def run():
+        df = ctx.frame.assign(converted_salary=ctx.frame["salary_usd"] * 4.7)
+        df.groupby("employee_residence", observed=True).size()
+        df["industry"].value_counts()
+        df.groupby("experience_level", observed=True)["converted_salary"].agg(["count", "mean", "median", "min", "max"])
+        df.groupby("company_size", observed=True)["converted_salary"].mean()
+        df.groupby(["years_experience", "education_required"], observed=True)["converted_salary"].mean()
+    return run
+
+
+@benchmark("insights.salary_cube_build")
+def bench_salary_cube_build(ctx):
+    from core.aggregates import SalaryCube
+
+    return lambda: SalaryCube(ctx.frame)
+
+
+@benchmark("insights.salary_cube_query")
+def bench_salary_cube_query(ctx):
+    from core.aggregates import SalaryCube
+
+    cube = SalaryCube(ctx.frame)
+
+    def run():
+        cube.stats(("employee_residence",))
+        cube.stats(("industry",))
+        cube.stats(("experience_level",), 4.7)
+        cube.stats(("company_size",), 4.7)
+        cube.stats(("years_experience", "education_required"), 4.7)
+    return run
+
+
+@benchmark("insights.salary_cube_build_sketched")
+def bench_salary_cube_build_sketched(ctx):
+    from core.aggregates import SalaryCube
+    from core.sketches import DEFAULT_K
+
+    return lambda: SalaryCube(ctx.frame, sketch_k=DEFAULT_K)
+
+
+@benchmark("percentiles.exact_build")
+def bench_percentiles_exact(ctx):
+    from core.partition import TitlePartition
+    from core.percentiles import SalaryDistribution
+
+    return lambda: SalaryDistribution(TitlePartition(ctx.frame))
+
+
+@benchmark("percentiles.sketch_build")
+def bench_percentiles_sketch(ctx):
+    from core.percentiles import SalarySketches
+
+    return lambda: SalarySketches(ctx.frame)
+
+
+@benchmark("percentiles.sketch_rank")
+def bench_percentiles_sketch_rank(ctx):
+    import numpy as np
+
+    from core.percentiles import SalarySketches
+
+    sketches = SalarySketches(ctx.frame)
+    titles = np.array(sketches.keys * 50, dtype=object)
+    salaries = np.linspace(30_000, 300_000, len(titles))
+    return lambda: sketches.percentiles(titles, salaries)
+
+
+@benchmark("skills.legacy_explode")
+def bench_legacy_explode(ctx):
+    skills = ctx.frame["required_skills"]
+    return lambda: skills.dropna().str.split(", ").explode().value_counts().head(10)
+
+
+@benchmark("skills.index_build")
+def bench_skill_index(ctx):
+    from core.skills import SkillIndex
+
+    skills = ctx.frame["required_skills"]
+    return lambda: SkillIndex.from_series(skills).top(10)
+
+
+@benchmark("career_pdf.render", scaled=False)
+def bench_career_pdf(ctx):
+    from core.career_plan import render_career_pdf
+    from core.certifications import SKILL_CERTIFICATIONS, recommend_certifications
+
+    rec_df = recommend_certifications(list(SKILL_CERTIFICATIONS)[:6])
+    return lambda: render_career_pdf(rec_df, "Data Scientist", 90_000, 120_000)
+
+
+def measure(fn, rounds):
+    """Per-call seconds for each of ``rounds`` timeit rounds (auto-ranged to >= 0.2s each)."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return [seconds / number for seconds in timer.repeat(rounds, number)]
+
+
+def run_micro(scales, rounds, selected):
+    results = {}
+    for scale in scales:
+        ctx = Context(scaled_csv(scale), scale)
+        for name, (setup, scaled) in BENCHMARKS.items():
+            if not selected(name) or (not scaled and scale != scales[0]):
+                continue
+            key = f"{name}@x{scale}" if scaled else name
+            results[key] = measure(setup(ctx), rounds)
+            report(key, results[key])
+    return results
+
+
+def run_macro(scales, rounds, selected):
+    results = {}
+    for scale in scales:
+        env = dict(os.environ, AI_JOB_DATASET=scaled_csv(scale),
+                   PYTHONPATH=BASE_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+        output = subprocess.run([sys.executable, "-m", "benchmarks.pages", "--json", "--rounds", str(rounds)],
+                                cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True)
+        for name, times in json.loads(output.stdout.strip().splitlines()[-1]).items():
+            if selected(name):
+                key = f"{name}@x{scale}"
+                results[key] = times
+                report(key, times)
+    return results
+
+
+def report(key, times):
+    print(f"{key:<42} {_format(statistics.median(times)):>10}  (min {_format(min(times))})", flush=True)
+
+
+def _format(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+def compare(results, baseline, tolerance):
+    """Benchmarks whose median is more than ``tolerance`` slower than the baseline's."""
+    regressions = []
+    for key, times in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        now = statistics.median(times)
+        if now > before * (1 + tolerance):
+            regressions.append((key, before, now))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1], help="dataset multiples to run at (default: %(default)s)")
+    parser.add_argument("--only", nargs="+", metavar="PATTERN", help="benchmark name globs, e.g. 'predict.*' 'page.*'")
+    parser.add_argument("--rounds", type=int, default=5, help="timing rounds per benchmark (default: %(default)s)")
+    parser.add_argument("--no-micro", action="store_true", help="skip the in-process micro-benchmarks")
+    parser.add_argument("--no-macro", action="store_true", help="skip the headless page runs")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file (default: benchmarks/baseline.json)")
+    parser.add_argument("--save", action="store_true", help="write these results to the baseline file")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 if a benchmark regressed against the baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before --check fails, as a fraction (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    def selected(name):
+        return not args.only or any(fnmatch.fnmatch(name, pattern) for pattern in args.only)
+
+    results = {}
+    if not args.no_micro:
+        results.update(run_micro(args.scale, args.rounds, selected))
+    if not args.no_macro:
+        results.update(run_macro(args.scale, args.rounds, selected))
+
+    regressions = []
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}; run with --save first", file=sys.stderr)
+            sys.exit(2)
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        for key, before, now in regressions:
+            print(f"REGRESSION {key}: {_format(before)} -> {_format(now)} ({now / before - 1:+.0%})", file=sys.stderr)
+        if not regressions:
+            print(f"No regressions beyond {args.tolerance:.0%}")
+
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)["results"]
+        # Merge, so a partial run (--only, one scale) updates just its own entries
+        baseline.update({key: statistics.median(times) for key, times in results.items()})
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"machine": platform.node(), "python": platform.python_version(),
+                       "saved_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": baseline}, f, indent=2, sort_keys=True)
+        print(f"Saved {len(results)} results to {args.baseline}")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
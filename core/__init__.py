@@ -0,0 +1 @@
+"""Shared, Streamlit-independent building blocks for the AI Career Navigator pages."""
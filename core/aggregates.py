@@ -0,0 +1,235 @@
+"""Materialized salary aggregates for the Job Market Insights dashboard.
+
+Every rerun of the Insights page used to run five group-bys over the full
+frame, and toggling USD/MYR ran them all again. The cube computes count, sum,
+min, max and median of ``salary_usd`` per dimension combination once per
+dataset version. Currency changes only multiply the (tiny) cached tables by a
+rate, so rendering a tab no longer depends on the number of rows.
+
+Appended rows are folded in without a rebuild: count, sum, min and max merge
+with the new rows' partial aggregates. The median does not merge, so the cube
+also keeps each group's salaries sorted, and the new rows are merged into the
+groups they touch: an append costs the size of those groups, not a scan of the
+frame (a coarse grouping such as company size still touches most rows). The
+sorted salaries are built with the tables, from one sort of the salary column
+shared by every grouping, and the medians are read from them instead of from
+``groupby().median()``. That keeps the build within ~10% of what it was, and
+the first append costs no more than later ones; built lazily, it had to scan
+the whole frame (~2 s at 1.5M rows). They hold 8 bytes per salary per
+grouping, ~6 MB per 100k rows for the default groupings.
+
+With ``SALARY_STATS=sketch`` each group keeps a KLL sketch instead (see
+``core.sketches``) and medians are estimated from it; sketches merge in
+``O(k)`` per group, whatever its size.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core.sketches import DEFAULT_K, SKETCH_STATS, group_sketches, merge_sketches
+
+SALARY_COLUMN = "salary_usd"
+SALARY_STATS = ["sum", "mean", "min", "max", "median"]
+MERGE = {"count": "sum", "sum": "sum", "min": "min", "max": "max", "median": "last"}
+
+# Groupings the dashboard needs; built eagerly so the first visitor doesn't pay for them.
+GROUPINGS = [
+    ("employee_residence",),
+    ("job_title", "employee_residence"),
+    ("job_title",),
+    ("industry",),
+    ("experience_level",),
+    ("company_size",),
+    ("years_experience", "education_required"),
+]
+
+
+class SalaryCube:
+    """Per-grouping ``count``/``sum``/``min``/``max``/``median`` of salaries in USD.
+
+    With ``sketch_k`` set, medians come from per-group sketches of that size.
+    """
+
+    def __init__(self, frame, groupings=GROUPINGS, sketch_k=None):
+        self._frame = frame
+        self.sketch_k = sketch_k
+        self._tables = {}
+        self._sketches = {}
+        # Per grouping, {group key: sorted salaries}, for merging appended rows
+        self._values = {}
+        self._lock = threading.Lock()
+        # One sort of the salaries, shared by the groupings built here
+        salary_order = _salary_order(frame) if sketch_k is None and groupings else None
+        for dims in groupings:
+            self._table(dims, salary_order)
+
+    def _table(self, dims, salary_order=None):
+        table = self._tables.get(dims)
+        if table is None:
+            with self._lock:
+                table = self._tables.get(dims)
+                if table is None:
+                    if self.sketch_k is None:
+                        grouped = self._frame.groupby(list(dims), observed=True)[SALARY_COLUMN]
+                        table = grouped.agg(["count", "sum", "min", "max"])
+                        values = _group_values(self._frame, list(dims), table.index, salary_order)
+                        table["median"] = [_median(values[key]) for key in table.index]
+                        self._values[dims] = values
+                    else:
+                        table, self._sketches[dims] = _sketched(self._frame, list(dims), self.sketch_k)
+                    table["mean"] = table["sum"] / table["count"]
+                    self._tables[dims] = table
+        return table
+
+    def extended(self, frame, start):
+        """The cube of ``frame``, given that this one covers its rows before ``start``."""
+        cube = SalaryCube(frame, groupings=(), sketch_k=self.sketch_k)
+        delta = frame.iloc[start:]
+        with self._lock:
+            tables = list(self._tables.items())
+        for dims, table in tables:
+            if self.sketch_k is None:
+                cube._tables[dims], cube._values[dims] = _merge_rows(table, self._values[dims], frame, delta, list(dims))
+            else:
+                cube._tables[dims], cube._sketches[dims] = _merge_sketched(
+                    table, self._sketches[dims], frame, delta, list(dims), self.sketch_k)
+        return cube
+
+    def stats(self, dims, rate=1.0, where=None):
+        """Salary statistics grouped by ``dims``, scaled by the currency ``rate``.
+
+        ``where`` optionally restricts to one value of another dimension, e.g.
+        ``stats(("employee_residence",), where=("job_title", "Data Scientist"))``.
+        Groupings that were not precomputed are built on first use and kept.
+        Returns a frame with the ``dims`` as columns followed by
+        ``count, sum, mean, min, max, median``.
+        """
+        dims = tuple(dims)
+        if where is None:
+            table = self._table(dims)
+        else:
+            col, value = where
+            table = self._table((col,) + dims)
+            try:
+                table = table.xs(value, level=col)
+            except KeyError:
+                table = table.iloc[0:0].droplevel(col)
+        result = table[["count"] + SALARY_STATS]
+        if rate != 1.0:
+            result = result.assign(**{stat: result[stat] * rate for stat in SALARY_STATS})
+        return result.reset_index()
+
+    def count(self, where=None):
+        """Number of rows, optionally restricted to ``where=(column, value)``."""
+        if where is None:
+            return len(self._frame)
+        col, value = where
+        return int(self._table((col,))["count"].get(value, 0))
+
+
+def _merge_rows(table, values, frame, delta, dims):
+    """``(table, values)`` (grouped by ``dims``) updated with the rows of ``delta``, which ``frame`` ends with.
+
+    ``values`` maps each group to its sorted salaries; the delta's salaries are
+    merged into the groups it touches and the other arrays are shared.
+    """
+    partial = delta.groupby(dims, observed=True)[SALARY_COLUMN].agg(["count", "sum", "min", "max"])
+    if partial.empty:
+        return table, values
+    values = dict(values)
+    for key, new in _group_values(delta, dims, partial.index).items():
+        old = values.get(key)
+        values[key] = new if old is None else np.insert(old, np.searchsorted(old, new), new)
+    partial["median"] = [_median(values[key]) for key in partial.index]
+    return _combine(table, partial, frame, dims), values
+
+
+def _salary_order(frame):
+    """``(rows, salaries)``: the rows that have a salary, in salary order, and those salaries."""
+    salaries = frame[SALARY_COLUMN].to_numpy()
+    rows = np.argsort(salaries)
+    # NaN sorts last
+    rows = rows[:len(rows) - np.count_nonzero(pd.isna(salaries))]
+    return rows, salaries[rows]
+
+
+def _group_values(frame, dims, keys, salary_order=None):
+    """``{key: sorted salaries}`` of ``frame`` grouped by ``dims``; ``keys`` is the groups' index, in order.
+
+    ``salary_order`` is :func:`_salary_order` of ``frame``, if the caller already has it.
+    """
+    rows, salaries = salary_order if salary_order is not None else _salary_order(frame)
+    codes = _group_codes(frame, dims)
+    if len(keys) < 1 << 15:
+        # numpy radix-sorts 16-bit integers (and gathers them faster)
+        codes = codes.astype(np.int16)
+    # Rows in salary order, then stably by group: much faster than np.lexsort
+    codes = codes[rows]
+    missing = codes < 0
+    if missing.any():
+        codes, salaries = codes[~missing], salaries[~missing]
+    order = np.argsort(codes, kind="stable")
+    salaries = salaries[order]
+    bounds = np.searchsorted(codes[order], np.arange(len(keys) + 1))
+    return {key: salaries[bounds[i]:bounds[i + 1]] for i, key in enumerate(keys)}
+
+
+def _median(values):
+    """Median of sorted ``values``, as ``Series.median`` computes it."""
+    n = len(values)
+    if not n:
+        return np.nan
+    return (float(values[(n - 1) // 2]) + float(values[n // 2])) / 2
+
+
+def _group_codes(frame, dims):
+    """Each row's group number in ``groupby(dims, observed=True)`` order; -1 for a missing key.
+
+    Same numbering as ``GroupBy.ngroup()``, which is several times slower.
+    """
+    codes, sizes = zip(*((c, len(u)) for c, u in (pd.factorize(frame[d], sort=True) for d in dims)))
+    if len(dims) == 1:
+        # Only observed values get a code, in sorted order: already the group numbers
+        return codes[0]
+    missing = np.logical_or.reduce([c < 0 for c in codes])
+    combined = np.ravel_multi_index([np.maximum(c, 0) for c in codes], sizes)
+    # Number the observed combinations in order: O(rows + combinations), no sort
+    observed = np.bincount(combined[~missing], minlength=int(np.prod(sizes))) > 0
+    return np.where(missing, -1, np.cumsum(observed)[combined] - 1)
+
+
+def _sketched(frame, dims, k):
+    """``(table, {group key: sketch})``: exact count/sum/min/max and sketched medians of ``frame`` by ``dims``."""
+    table = frame.groupby(dims, observed=True)[SALARY_COLUMN].agg(["count", "sum", "min", "max"])
+    salaries = frame[SALARY_COLUMN].to_numpy(dtype=np.float64)
+    sketches = dict(zip(table.index, group_sketches(salaries, _group_codes(frame, dims), len(table), k)))
+    table["median"] = [sketches[key].quantile(0.5) for key in table.index]
+    return table, sketches
+
+
+def _merge_sketched(table, sketches, frame, delta, dims, k):
+    """Like :func:`_merge_rows`, merging the delta's group sketches instead of re-reading old rows."""
+    partial, updates = _sketched(delta, dims, k)
+    if partial.empty:
+        return table, sketches
+    sketches = merge_sketches(sketches, updates)
+    partial["median"] = [sketches[key].quantile(0.5) for key in partial.index]
+    return _combine(table, partial, frame, dims), sketches
+
+
+def _combine(table, partial, frame, dims):
+    """``table`` with the delta's ``partial`` aggregates folded in (``partial`` medians replace old ones)."""
+    rows = pd.concat([table[list(MERGE)].reset_index(), partial.reset_index()], ignore_index=True)
+    # Old group keys carry the old category dictionaries; align them with the frame's
+    rows = rows.astype({d: frame[d].dtype for d in dims})
+    merged = rows.groupby(dims, observed=True).agg(MERGE)
+    merged["mean"] = merged["sum"] / merged["count"]
+    return merged
+
+
+def get_salary_cube(dataset):
+    """Return the cube for ``dataset``, built once per dataset version."""
+    sketch_k = DEFAULT_K if SKETCH_STATS else None
+    return dataset.derived("salary_cube", lambda ds: SalaryCube(ds.frame, sketch_k=sketch_k),
+                           extend=lambda cube, ds, start: cube.extended(ds.frame, start))
@@ -0,0 +1,82 @@
+"""Batch salary prediction for large CSV files.
+
+Streams the input in fixed-size chunks, so memory stays bounded by the chunk
+size rather than the file size, and predicts each chunk with a single
+``model.predict`` call. Usage::
+
+    python -m core.batch_predict profiles.csv -o predictions.csv --chunksize 20000
+
+The input needs the seven model features (``job_title``, ``experience_level``,
+``employment_type``, ``company_location``, ``company_size``,
+``education_required``, ``years_experience``). Coded columns accept either the
+dataset codes ("SE", "FT", "L") or the labels shown in the app ("Senior Level",
+"Full Time", "Large"). All input columns are copied to the output with a
+``predicted_salary_usd`` column appended. With ``--percentile`` a
+``market_percentile`` column ranks each prediction against the dataset's
+postings for the same job title.
+"""
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+from core.dataset import get_dataset
+from core.encoding import FEATURE_COLUMNS, predict_salaries
+from core.labels import to_codes
+from core.model_registry import ModelRegistry, get_model
+from core.percentiles import get_salary_distribution
+
+DEFAULT_CHUNKSIZE = 10_000
+
+
+def predict_chunk(chunk, bundle, salary_distribution=None):
+    """Return ``chunk`` with a ``predicted_salary_usd`` (and optionally ``market_percentile``) column."""
+    chunk.columns = chunk.columns.str.lower().str.strip()
+    missing = [col for col in FEATURE_COLUMNS if col not in chunk.columns]
+    if missing:
+        raise ValueError(f"Input is missing required columns: {', '.join(missing)}")
+
+    features = to_codes(chunk[FEATURE_COLUMNS])
+    encoded = bundle.encoder.encode(features)
+    result = chunk.assign(predicted_salary_usd=predict_salaries(bundle.model, encoded).round(2))
+    if salary_distribution is not None:
+        percentiles = salary_distribution.percentiles(features["job_title"], result["predicted_salary_usd"])
+        result["market_percentile"] = percentiles.round(1)
+    return result
+
+
+def run(input_path, output_path, bundle, chunksize=DEFAULT_CHUNKSIZE, progress=None, salary_distribution=None):
+    """Predict every row of ``input_path`` into ``output_path``; return ``(rows, seconds)``."""
+    rows = 0
+    start = time.perf_counter()
+    for i, chunk in enumerate(pd.read_csv(input_path, chunksize=chunksize)):
+        result = predict_chunk(chunk, bundle, salary_distribution)
+        result.to_csv(output_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        rows += len(result)
+        if progress:
+            elapsed = time.perf_counter() - start
+            progress(f"{rows:,} rows ({rows / elapsed:,.0f} rows/s)")
+    return rows, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Predict annual salaries for every row of a CSV file.")
+    parser.add_argument("input", help="CSV file with one job profile per row")
+    parser.add_argument("-o", "--output", required=True, help="CSV file to write predictions to")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="rows per chunk (default: %(default)s)")
+    parser.add_argument("--model", help="model file (.pkl or .cbm) to use instead of the app's current model")
+    parser.add_argument("--percentile", action="store_true", help="add each prediction's percentile among postings for the same job title")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print the final summary")
+    args = parser.parse_args(argv)
+
+    bundle = ModelRegistry(model_path=args.model).get() if args.model else get_model()
+    progress = None if args.quiet else (lambda msg: print(msg, file=sys.stderr))
+    salary_distribution = get_salary_distribution(get_dataset()) if args.percentile else None
+    rows, seconds = run(args.input, args.output, bundle, args.chunksize, progress, salary_distribution)
+    rate = rows / seconds if seconds else 0.0
+    print(f"Predicted {rows:,} rows in {seconds:.2f}s ({rate:,.0f} rows/s) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
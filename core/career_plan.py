@@ -0,0 +1,158 @@
+"""Career-plan PDF rendering, done on demand and cached by content.
+
+Page 3 used to build the whole FPDF document on every rerun after a
+prediction, including every change of the known-skills multiselect, whether
+or not anyone downloaded it. The page now hands the download button a callable,
+so a plan is only rendered when it is requested. Rendering runs in a small
+shared thread pool, which bounds how many documents are laid out at once
+across all sessions. Finished documents are kept in an LRU keyed by a hash of
+the recommendation table, job title and salaries, so asking again for the same
+plan (from any session) returns the stored bytes.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from core.labels import USD_TO_MYR
+from core.metrics import span
+
+DEFAULT_MAXSIZE = 128
+DEFAULT_WORKERS = 2
+
+# Text styles of the document, as (family, style, size)
+TITLE_FONT = ("Arial", "B", 18)
+BODY_FONT = ("Arial", "", 12)
+HEADING_FONT = ("Arial", "B", 14)
+DETAIL_FONT = ("Arial", "", 10)
+
+
+def plan_key(rec_df, job_title, current_salary, potential_salary):
+    """Content hash of everything that ends up in the PDF."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((job_title, float(current_salary), float(potential_salary), list(rec_df.columns))).encode())
+    digest.update(pd.util.hash_pandas_object(rec_df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _monthly_myr(usd):
+    return usd * USD_TO_MYR / 12
+
+
+def render_career_pdf(rec_df, job_title, current_salary, potential_salary):
+    """Lay out the career plan and return the PDF bytes."""
+    with span("career_plan", "render_pdf"):
+        return _render(rec_df, job_title, current_salary, potential_salary)
+
+
+def _render(rec_df, job_title, current_salary, potential_salary):
+    # Deferred until a plan is actually requested; most page views never render one
+    from fpdf import FPDF
+
+    # A fresh document per plan on purpose: the static title block costs ~0.25 ms
+    # of a ~33 ms render (nearly all multi_cell line breaking below), and cloning a
+    # prepared template with copy.deepcopy measured ~0.7 ms, slower than building it
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font(*TITLE_FONT)
+    pdf.cell(0, 10, "Career Growth Plan", ln=True, align='C')
+    pdf.ln(5)
+
+    pdf.set_font(*BODY_FONT)
+    pdf.cell(0, 8, f"Job Title: {job_title}", ln=True)
+    pdf.cell(0, 8, f"Current Monthly Salary: RM {_monthly_myr(current_salary):,.0f}", ln=True)
+    pdf.cell(0, 8, f"Potential Monthly Salary: RM {_monthly_myr(potential_salary):,.0f}", ln=True)
+    increase_pct = ((potential_salary - current_salary) / current_salary * 100)
+    pdf.cell(0, 8, f"Potential Monthly Increase: RM {_monthly_myr(potential_salary - current_salary):,.0f} ({increase_pct:.1f}%)", ln=True)
+    pdf.ln(10)
+
+    pdf.set_font(*HEADING_FONT)
+    pdf.cell(0, 10, "Recommended Certifications", ln=True)
+    pdf.ln(5)
+
+    pdf.set_font(*DETAIL_FONT)
+    for row in rec_df.to_dict("records"):
+        pdf.multi_cell(0, 6,
+            f"Skill: {row['Skill']}\n" +
+            f"Course: {row['Course']}\n" +
+            f"Duration: {row['Duration']} | Fee: RM {row['Fee (USD)'] * USD_TO_MYR:.0f} | Impact: {row['Impact']}\n" +
+            f"Monthly Salary Boost: +RM {_monthly_myr(row['Salary Boost']):,.0f}\n" +
+            f"Link: {row['Link']}\n")
+        pdf.ln(3)
+
+    return bytes(pdf.output())
+
+
+class CareerPlanCache:
+    """LRU of rendered plans, filled by a shared worker pool.
+
+    Entries are futures, so two sessions asking for the same plan at the same
+    time share one rendering instead of doing it twice.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, workers=DEFAULT_WORKERS):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="career-pdf")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def submit(self, rec_df, job_title, current_salary, potential_salary):
+        """Return a future for the plan's PDF bytes, rendering it only if it isn't cached."""
+        key = plan_key(rec_df, job_title, current_salary, potential_salary)
+        with self._lock:
+            future = self._entries.get(key)
+            if future is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return future
+            self.misses += 1
+            # Render from a copy: the caller may keep mutating its frame
+            future = self._pool.submit(render_career_pdf, rec_df.copy(), job_title, current_salary, potential_salary)
+            self._entries[key] = future
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        future.add_done_callback(lambda f: f.exception() and self._discard(key, f))
+        return future
+
+    def render(self, rec_df, job_title, current_salary, potential_salary, timeout=None):
+        """PDF bytes for the plan, waiting for the worker if it is still rendering."""
+        return self.submit(rec_df, job_title, current_salary, potential_salary).result(timeout)
+
+    def _discard(self, key, future):
+        # Failed renders are not cached, so the next request retries
+        with self._lock:
+            if self._entries.get(key) is future:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_cache = CareerPlanCache()
+
+
+def get_career_plans():
+    """Return the process-wide :class:`CareerPlanCache`."""
+    return _cache
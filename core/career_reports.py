@@ -0,0 +1,182 @@
+"""Bulk career-plan PDFs for a whole cohort file.
+
+Produces, for every person in a CSV, the same career plan the prediction page
+offers for download: salaries for the whole chunk are predicted with one
+vectorized ``model.predict``, skill gaps are the job title's top skills minus
+the person's known skills, and the PDFs are rendered across a process pool
+(fpdf2 is pure Python, so threads would share one core). Usage::
+
+    python -m core.career_reports cohort.csv -o plans/          # one PDF per person
+    python -m core.career_reports cohort.csv -o plans.zip       # single zip archive
+    python -m core.career_reports cohort.csv -o - > plans.zip   # zip streamed to stdout
+
+The cohort needs the seven model features (see ``core.batch_predict``).
+Optional columns: ``employee_id`` names the files, ``skills`` lists the
+person's known skills, comma-separated. Memory stays bounded: the cohort is
+read in chunks, at most ``2 * workers`` batches are in flight, and each PDF is
+written out as soon as its batch returns.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import pandas as pd
+
+from core.batch_predict import predict_chunk
+from core.career_plan import render_career_pdf
+from core.certifications import recommend_certifications, skill_gaps
+from core.dataset import get_dataset
+from core.model_registry import ModelRegistry, get_model
+from core.partition import get_title_partition
+from core.skills import SKILL_DELIMITER, get_skill_index
+
+DEFAULT_CHUNKSIZE = 2_000
+DEFAULT_BATCH_SIZE = 25
+ID_COLUMN = "employee_id"
+SKILLS_COLUMN = "skills"
+TOP_SKILLS = 10
+
+
+def plan_filename(person_id, job_title):
+    """File name of one person's plan, matching the page's ``Career_Plan_<title>.pdf``."""
+    return re.sub(r"[^\w.-]+", "_", f"Career_Plan_{person_id}_{job_title}") + ".pdf"
+
+
+def render_batch(tasks):
+    """Worker entry point: ``[(filename, pdf bytes or None), ...]`` for ``(filename, title, salary, missing skills)`` tasks.
+
+    ``None`` marks people without a plan, because they already have the
+    role's top skills or none of their missing skills has a certification.
+    """
+    results = []
+    for filename, job_title, salary, missing_skills in tasks:
+        rec_df = recommend_certifications(missing_skills)
+        if rec_df.empty:
+            results.append((filename, None))
+            continue
+        potential_salary = salary + rec_df["Salary Boost"].sum()
+        results.append((filename, render_career_pdf(rec_df, job_title, salary, potential_salary)))
+    return results
+
+
+class PlanWriter:
+    """Writes PDFs into a directory, a zip file, or a zip stream on stdout (``"-"``)."""
+
+    def __init__(self, output):
+        self.output = output
+        self._stream = None
+        self._archive = None
+        if output == "-" or output.endswith(".zip"):
+            self._stream = sys.stdout.buffer if output == "-" else open(output, "wb")
+            # PDF content is already deflated; storing avoids compressing it twice
+            self._archive = zipfile.ZipFile(self._stream, "w", zipfile.ZIP_STORED)
+        else:
+            Path(output).mkdir(parents=True, exist_ok=True)
+
+    def write(self, filename, data):
+        if self._archive is not None:
+            self._archive.writestr(filename, data)
+        else:
+            Path(self.output, filename).write_bytes(data)
+
+    def close(self):
+        if self._archive is not None:
+            self._archive.close()
+            if self._stream is not sys.stdout.buffer:
+                self._stream.close()
+            else:
+                self._stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def plan_tasks(chunk, bundle, dataset, row_offset=0, top_skills=None):
+    """Predict ``chunk`` in one call and return its ``render_batch`` tasks."""
+    skill_index = get_skill_index(dataset)
+    partition = get_title_partition(dataset)
+    top_skills = {} if top_skills is None else top_skills
+
+    predicted = predict_chunk(chunk, bundle)
+    ids = predicted[ID_COLUMN] if ID_COLUMN in predicted.columns else pd.RangeIndex(row_offset + 1, row_offset + len(predicted) + 1)
+    if SKILLS_COLUMN in predicted.columns:
+        known = predicted[SKILLS_COLUMN].fillna("").astype(str).str.split(SKILL_DELIMITER)
+    else:
+        known = [[]] * len(predicted)
+
+    tasks = []
+    for person_id, job_title, salary, skills in zip(ids, predicted["job_title"], predicted["predicted_salary_usd"], known):
+        if job_title not in top_skills:
+            top_skills[job_title] = skill_index.top(TOP_SKILLS, rows=partition.rows(job_title)).index.tolist()
+        missing = skill_gaps(top_skills[job_title], (s.strip() for s in skills))
+        tasks.append((plan_filename(person_id, job_title), job_title, float(salary), missing))
+    return tasks
+
+
+def run(input_path, output, bundle, dataset, workers=None, chunksize=DEFAULT_CHUNKSIZE,
+        batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """Write a plan for every row of ``input_path``; return ``(rows, written, seconds)``."""
+    workers = workers or os.cpu_count() or 1
+    max_pending = 2 * workers
+    rows = written = 0
+    top_skills = {}
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, PlanWriter(output) as writer:
+        pending = set()
+
+        def collect(return_when):
+            nonlocal pending, written
+            done, pending = wait(pending, return_when=return_when)
+            for future in done:
+                for filename, data in future.result():
+                    if data is not None:
+                        writer.write(filename, data)
+                        written += 1
+
+        for chunk in pd.read_csv(input_path, chunksize=chunksize):
+            tasks = plan_tasks(chunk, bundle, dataset, rows, top_skills)
+            for i in range(0, len(tasks), batch_size):
+                while len(pending) >= max_pending:
+                    collect(FIRST_COMPLETED)
+                pending.add(pool.submit(render_batch, tasks[i:i + batch_size]))
+            rows += len(tasks)
+            if progress:
+                elapsed = time.perf_counter() - start
+                progress(f"{rows:,} rows queued, {written:,} PDFs written ({written / elapsed:,.1f} PDFs/s)")
+        collect("ALL_COMPLETED")
+
+    return rows, written, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a career-plan PDF for every person in a cohort CSV.")
+    parser.add_argument("input", help="CSV file with one person per row")
+    parser.add_argument("-o", "--output", required=True, help="directory, .zip file, or - for a zip stream on stdout")
+    parser.add_argument("-j", "--workers", type=int, help="rendering processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="rows read and predicted at a time (default: %(default)s)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="PDFs per worker task (default: %(default)s)")
+    parser.add_argument("--model", help="model file (.pkl or .cbm) to use instead of the app's current model")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print the final summary")
+    args = parser.parse_args(argv)
+
+    bundle = ModelRegistry(model_path=args.model).get() if args.model else get_model()
+    progress = None if args.quiet else (lambda msg: print(msg, file=sys.stderr))
+    rows, written, seconds = run(args.input, args.output, bundle, get_dataset(), args.workers,
+                                 args.chunksize, args.batch_size, progress)
+    rate = written / seconds if seconds else 0.0
+    # The summary goes to stderr too when the zip itself is on stdout
+    print(f"Wrote {written:,} career plans for {rows:,} rows in {seconds:.2f}s ({rate:,.1f} PDFs/s) -> {args.output}",
+          file=sys.stderr if args.output == "-" else sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
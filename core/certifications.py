@@ -0,0 +1,115 @@
+"""Certification catalogue and the skill-gap recommendations built from it.
+
+Shared by the prediction page's "Boost Your Salary" section and the bulk
+career-plan generator, so both recommend the same courses in the same order.
+"""
+import pandas as pd
+
+from core.labels import USD_TO_MYR
+
+# ROI shown for free courses
+UNLIMITED_ROI = 999999
+
+SKILL_CERTIFICATIONS = {
+    "Python": [
+        {"name": "Python for Everybody (Coursera)", "duration": "4 weeks", "fee_usd": 49, 
+         "link": "https://www.coursera.org/specializations/python", "impact": "Foundation", "salary_boost": 5000},
+        {"name": "AWS Machine Learning Specialty", "duration": "6 weeks", "fee_usd": 300, 
+         "link": "https://aws.amazon.com/certification/certified-machine-learning-specialty/", "impact": "High", "salary_boost": 15000}
+    ],
+    "Machine Learning": [
+        {"name": "Machine Learning by Andrew Ng", "duration": "11 weeks", "fee_usd": 0, 
+         "link": "https://www.coursera.org/learn/machine-learning", "impact": "High", "salary_boost": 20000},
+        {"name": "TensorFlow Developer Certificate", "duration": "8 weeks", "fee_usd": 100, 
+         "link": "https://www.tensorflow.org/certificate", "impact": "Medium", "salary_boost": 12000}
+    ],
+    "NLP": [
+        {"name": "Natural Language Processing Specialization", "duration": "6 weeks", "fee_usd": 79, 
+         "link": "https://www.coursera.org/specializations/natural-language-processing", "impact": "High", "salary_boost": 18000}
+    ],
+    "Deep Learning": [
+        {"name": "Deep Learning Specialization (Coursera)", "duration": "12 weeks", "fee_usd": 49, 
+         "link": "https://www.coursera.org/specializations/deep-learning", "impact": "High", "salary_boost": 22000}
+    ],
+    "Data Analysis": [
+        {"name": "Google Data Analytics Certificate", "duration": "6 months", "fee_usd": 0, 
+         "link": "https://grow.google/certificates/data-analytics/", "impact": "Foundation", "salary_boost": 8000}
+    ],
+    "AWS": [
+        {"name": "AWS Certified Solutions Architect", "duration": "8 weeks", "fee_usd": 150, 
+         "link": "https://aws.amazon.com/certification/", "impact": "High", "salary_boost": 16000}
+    ],
+    "Docker": [
+        {"name": "Docker Mastery (Udemy)", "duration": "4 weeks", "fee_usd": 15, 
+         "link": "https://www.udemy.com/course/docker-mastery/", "impact": "Medium", "salary_boost": 8000}
+    ],
+    "Kubernetes": [
+        {"name": "Certified Kubernetes Administrator (CKA)", "duration": "6 weeks", "fee_usd": 395, 
+         "link": "https://www.cncf.io/certification/cka/", "impact": "High", "salary_boost": 17000}
+    ],
+    "SQL": [
+        {"name": "SQL for Data Science (Coursera)", "duration": "4 weeks", "fee_usd": 49, 
+         "link": "https://www.coursera.org/learn/sql-for-data-science", "impact": "Foundation", "salary_boost": 6000}
+    ],
+    "Tableau": [
+        {"name": "Tableau Desktop Specialist Certification", "duration": "3 weeks", "fee_usd": 100, 
+         "link": "https://www.tableau.com/learn/certification", "impact": "Medium", "salary_boost": 9000}
+    ],
+    "PyTorch": [
+        {"name": "PyTorch for Deep Learning (Udacity)", "duration": "8 weeks", "fee_usd": 0, 
+         "link": "https://www.udacity.com/course/deep-learning-pytorch--ud188", "impact": "High", "salary_boost": 15000}
+    ],
+    "Linux": [
+        {"name": "Linux Foundation Certified System Administrator", "duration": "6 weeks", "fee_usd": 300, 
+         "link": "https://training.linuxfoundation.org/certification/", "impact": "Medium", "salary_boost": 10000}
+    ],
+    "Hadoop": [
+        {"name": "Cloudera Certified Data Engineer", "duration": "10 weeks", "fee_usd": 400, 
+         "link": "https://www.cloudera.com/about/training/certification.html", "impact": "High", "salary_boost": 18000}
+    ],
+    "Scala": [
+        {"name": "Scala Programming Specialization", "duration": "7 weeks", "fee_usd": 79, 
+         "link": "https://www.coursera.org/specializations/scala", "impact": "Medium", "salary_boost": 12000}
+    ],
+    "Java": [
+        {"name": "Oracle Certified Java Programmer", "duration": "8 weeks", "fee_usd": 245, 
+         "link": "https://education.oracle.com/java-se-11-developer", "impact": "Medium", "salary_boost": 11000}
+    ],
+    "Mathematics": [
+        {"name": "Mathematics for Machine Learning Specialization", "duration": "10 weeks", "fee_usd": 49, 
+         "link": "https://www.coursera.org/specializations/mathematics-machine-learning", "impact": "Foundation", "salary_boost": 7000}
+    ]
+}
+
+
+def skill_gaps(top_skills, known_skills):
+    """The role's top skills the person doesn't have yet, in ``top_skills`` order."""
+    known = set(known_skills)
+    return [skill for skill in top_skills if skill not in known]
+
+
+def recommend_certifications(missing_skills):
+    """Courses for ``missing_skills`` as the page's recommendation table, best ROI first.
+
+    Skills without courses in :data:`SKILL_CERTIFICATIONS` are skipped, so the
+    table can be empty.
+    """
+    recommendations = []
+    for skill in missing_skills:
+        if skill in SKILL_CERTIFICATIONS:
+            for course in SKILL_CERTIFICATIONS[skill]:
+                roi_value = course["salary_boost"] / course["fee_usd"] if course["fee_usd"] > 0 else UNLIMITED_ROI
+                recommendations.append({
+                    "Skill": skill,
+                    "Course": course["name"],
+                    "Duration": course["duration"],
+                    "Fee (USD)": course["fee_usd"],
+                    "Fee (MYR)": course["fee_usd"] * USD_TO_MYR,
+                    "Impact": course["impact"],
+                    "Salary Boost": course["salary_boost"],
+                    "ROI": roi_value,
+                    "Link": course["link"]
+                })
+    if not recommendations:
+        return pd.DataFrame()
+    return pd.DataFrame(recommendations).sort_values("ROI", ascending=False)
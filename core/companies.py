@@ -0,0 +1,114 @@
+"""Salary-sorted company postings per job title for the "Target Companies" section.
+
+The section looks for postings paying 5-30% more than the prediction, widens
+to 0-50% when fewer than five match, and shows the ten best paid. It used to
+do that with two full boolean masks and an ``nlargest``. Here each title's
+complete company rows are sorted by salary once per dataset version, so both
+windows are two ``np.searchsorted`` calls each. The top ten are then ranked
+within the window (a few dozen rows) with the same ``nlargest`` the section
+used, so postings with equal salaries come out in the same order.
+Appended rows are merged into their title's block in salary order.
+"""
+import numpy as np
+import pandas as pd
+
+from core.partition import get_title_partition
+
+COMPANY_COLUMNS = ["company_name", "salary_usd", "company_location", "company_size"]
+
+TARGET_WINDOW = (1.05, 1.30)
+WIDE_WINDOW = (1.00, 1.50)
+MIN_MATCHES = 5
+
+
+class CompanySalaryIndex:
+    """Row positions of each title's company postings, ordered by ``salary_usd``."""
+
+    def __init__(self, partition, columns=COMPANY_COLUMNS):
+        self.columns = columns
+        frame = partition.frame
+        first = partition.offsets[0]
+        rows = partition.order[first:]
+        group = np.repeat(np.arange(len(partition.keys)), np.diff(partition.offsets))
+        # Same rows the section's ``.dropna()`` kept: every company column present.
+        complete = frame[columns].notna().to_numpy().all(axis=1)[rows]
+        rows, group = rows[complete], group[complete]
+        salaries = frame["salary_usd"].to_numpy(dtype=np.float64)[rows]
+        # Ascending salary, later rows first on ties (extended() keeps the same order)
+        order = np.lexsort((-rows, salaries, group))
+        self.rows = rows[order]
+        self.salaries = salaries[order]
+        # nlargest's tie order depends on the dtype it sorts, so windows are ranked in the column's own
+        self.dtype = frame["salary_usd"].dtype
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(group, minlength=len(partition.keys)))])
+        self._positions = {key: i for i, key in enumerate(partition.keys)}
+
+    def extended(self, partition, start):
+        """The index over ``partition``, given that this one covers its rows before ``start``."""
+        frame = partition.frame
+        codes = partition.codes(start)
+        rows = np.arange(start, len(frame))
+        keep = (codes >= 0) & frame[self.columns].iloc[start:].notna().to_numpy().all(axis=1)
+        rows, codes = rows[keep], codes[keep]
+        salaries = frame["salary_usd"].iloc[start:].to_numpy(dtype=np.float64)[keep]
+        order = np.lexsort((-rows, salaries, codes))
+        rows, salaries, codes = rows[order], salaries[order], codes[order]
+
+        counts = np.zeros(len(partition.keys), dtype=np.int64)
+        counts[partition.positions(self._positions)] = np.diff(self.offsets)
+        starts = np.concatenate([[0], np.cumsum(counts)])[:-1]
+        at = np.empty(len(rows), dtype=np.intp)
+        for code in np.unique(codes):
+            block = slice(*np.searchsorted(codes, [code, code + 1]))
+            lo, hi = self._block(partition.keys[code])
+            # Left of equal salaries: new rows come later in the file, and later rows go first on ties
+            at[block] = starts[code] + np.searchsorted(self.salaries[lo:hi], salaries[block], side="left")
+        counts += np.bincount(codes, minlength=len(partition.keys))
+
+        index = CompanySalaryIndex.__new__(CompanySalaryIndex)
+        index.columns = self.columns
+        index.dtype = self.dtype
+        index.rows = np.insert(self.rows, at, rows)
+        index.salaries = np.insert(self.salaries, at, salaries)
+        index.offsets = np.concatenate([[0], np.cumsum(counts)])
+        index._positions = {key: i for i, key in enumerate(partition.keys)}
+        return index
+
+    def _block(self, title):
+        i = self._positions.get(title)
+        if i is None:
+            return 0, 0
+        return self.offsets[i], self.offsets[i + 1]
+
+    def count(self, title):
+        start, stop = self._block(title)
+        return int(stop - start)
+
+    def target_companies(self, title, salary, n=10, window=TARGET_WINDOW,
+                         wide_window=WIDE_WINDOW, min_matches=MIN_MATCHES):
+        """Best-paid postings within a salary window above ``salary``.
+
+        Uses ``window`` (multipliers of ``salary``) unless it holds fewer than
+        ``min_matches`` postings, in which case ``wide_window`` is used; both
+        are resolved in the same pass. Returns ``(rows, lower, upper)``: up to
+        ``n`` dataset row positions, highest salary first, and the bounds used.
+        """
+        start, stop = self._block(title)
+        block = self.salaries[start:stop]
+        bounds = np.array([window, wide_window]) * salary
+        lo = np.searchsorted(block, bounds[:, 0], side="left")
+        hi = np.searchsorted(block, bounds[:, 1], side="right")
+        pick = 0 if hi[0] - lo[0] >= min_matches else 1
+        lo, hi = start + lo[pick], start + hi[pick]
+        # The window in file order, as the section's boolean mask left it
+        in_file_order = np.argsort(self.rows[lo:hi])
+        window = pd.DataFrame({"salary_usd": self.salaries[lo:hi][in_file_order].astype(self.dtype)},
+                              index=self.rows[lo:hi][in_file_order])
+        top = window.nlargest(n, "salary_usd").index.to_numpy()
+        return top, bounds[pick, 0], bounds[pick, 1]
+
+
+def get_company_index(dataset):
+    """Return the company salary index for ``dataset``, built once per dataset version."""
+    return dataset.derived("company_index", lambda ds: CompanySalaryIndex(get_title_partition(ds)),
+                           extend=lambda index, ds, start: index.extended(get_title_partition(ds), start))
@@ -0,0 +1,338 @@
+"""Process-wide, read-only access to the AI job market dataset.
+
+Both dashboard pages used to call ``pd.read_csv`` at the top of the script, so
+every widget click in every session re-parsed the whole file. The store below
+parses it once per server process and hands every caller the same frame. The
+file is re-checked on each access (a cheap ``os.stat``) and reloaded only when
+its content actually changes.
+
+New postings arrive as delta CSVs in a ``<dataset>.deltas`` directory next to
+the file (see ``core.ingest``). Deltas are applied in file-name order on top
+of the loaded snapshot: rows whose ``job_id`` is already present are dropped,
+and the derived indexes that know how to are extended with the new rows
+instead of being rebuilt.
+"""
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype, union_categoricals
+
+from core.hashing import combine_hashes, content_hash
+from core.metrics import span
+from core.paths import BASE_DIR
+
+# Overridable so benchmarks can point the pages at a scaled-up copy
+DATA_PATH = os.environ.get("AI_JOB_DATASET", os.path.join(BASE_DIR, "ai_job_dataset.csv"))
+
+logger = logging.getLogger(__name__)
+
+# Low-cardinality text columns that are stored as pandas categoricals.
+CATEGORICAL_COLUMNS = [
+    "job_title",
+    "salary_currency",
+    "experience_level",
+    "employment_type",
+    "company_location",
+    "company_size",
+    "employee_residence",
+    "education_required",
+    "industry",
+    "company_name",
+    "posting_date",
+    "application_deadline",
+]
+# Free text, mostly unique per row: Arrow-backed strings instead of Python objects
+STRING_COLUMNS = ["job_id", "required_skills"]
+# Scores with one decimal that nothing computes with
+FLOAT32_COLUMNS = ["benefits_score"]
+ID_COLUMN = "job_id"
+DELTA_SUFFIX = ".deltas"
+
+
+class Dataset:
+    """An immutable snapshot of the dataset at one file version.
+
+    ``frame`` is shared by every session; callers must treat it as read-only
+    and derive new frames (``assign``, boolean indexing, ...) instead of
+    adding or overwriting columns in place.
+    """
+
+    def __init__(self, frame, version, path, mtime_ns):
+        self.frame = frame
+        self.version = version
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self._derived = {}
+        self._extenders = {}
+        self._derived_lock = threading.RLock()
+
+    def derived(self, key, build, extend=None):
+        """Return ``build(self)``, computed at most once for this dataset version.
+
+        Used for indexes and aggregates that are expensive to build but only
+        depend on the data, so they are shared by every session and dropped
+        together with the snapshot when the file changes. If given,
+        ``extend(value, dataset, start)`` returns ``value`` updated for
+        ``dataset``, whose rows from ``start`` on are new; :meth:`extended`
+        uses it to carry the value over to the next snapshot.
+        """
+        try:
+            return self._derived[key]
+        except KeyError:
+            pass
+        with self._derived_lock:
+            if key not in self._derived:
+                self._derived[key] = build(self)
+                self._extenders[key] = extend
+            return self._derived[key]
+
+    def derived_items(self):
+        """``(key, value)`` of everything :meth:`derived` has built so far."""
+        with self._derived_lock:
+            return list(self._derived.items())
+
+    def extended(self, delta, version):
+        """A new snapshot with ``delta``'s (prepared) rows appended.
+
+        Derived values registered with an ``extend`` function are updated from
+        the new rows, in the order they were built (so an index is extended
+        before the ones built from it); the others are rebuilt on first use.
+        An empty ``delta`` shares this snapshot's frame and derived values.
+        """
+        if not len(delta):
+            dataset = Dataset(self.frame, version, self.path, self.mtime_ns)
+            with self._derived_lock:
+                dataset._derived.update(self._derived)
+                dataset._extenders.update(self._extenders)
+            return dataset
+        start = len(self.frame)
+        dataset = Dataset(append_rows(self.frame, delta), version, self.path, self.mtime_ns)
+        with self._derived_lock:
+            items = [(key, value, self._extenders[key]) for key, value in self._derived.items()]
+        for key, value, extend in items:
+            if extend is not None:
+                dataset._derived[key] = extend(value, dataset, start)
+                dataset._extenders[key] = extend
+        return dataset
+
+    def __len__(self):
+        return len(self.frame)
+
+    def __repr__(self):
+        return f"Dataset(version={self.version!r}, rows={len(self.frame)})"
+
+
+def prepare_frame(frame):
+    """Normalize column names and store every column in its most compact dtype.
+
+    Text dimensions become categoricals (one code per row plus a small
+    dictionary), free text becomes Arrow strings, and integer columns are
+    downcast to the smallest type that holds their values.
+    """
+    frame.columns = frame.columns.str.lower().str.strip()
+    for col in CATEGORICAL_COLUMNS:
+        if col in frame.columns:
+            frame[col] = frame[col].astype("category")
+    for col in STRING_COLUMNS:
+        if col in frame.columns:
+            frame[col] = frame[col].astype("string[pyarrow]")
+    for col in FLOAT32_COLUMNS:
+        if col in frame.columns:
+            frame[col] = frame[col].astype("float32")
+    for col in frame.select_dtypes("integer").columns:
+        frame[col] = pd.to_numeric(frame[col], downcast="integer")
+    return frame
+
+
+def read_dataset(path):
+    """Parse the CSV at ``path`` into a prepared frame."""
+    return prepare_frame(pd.read_csv(path))
+
+
+def append_rows(frame, delta):
+    """``frame`` with ``delta``'s rows appended, keeping categoricals categorical.
+
+    ``delta`` must hold at least ``frame``'s columns (extra ones are dropped).
+    Category dictionaries are merged and kept sorted, as ``prepare_frame``
+    builds them.
+    """
+    missing = frame.columns.difference(delta.columns)
+    if len(missing):
+        raise ValueError(f"delta is missing columns: {', '.join(missing)}")
+    columns = {}
+    for col in frame.columns:
+        old, new = frame[col], delta[col]
+        if isinstance(old.dtype, pd.CategoricalDtype):
+            columns[col] = pd.Series(union_categoricals([old, new.astype("category")], sort_categories=True))
+        else:
+            columns[col] = pd.concat([old, new], ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+def check_delta(delta, frame):
+    """Raise ``ValueError`` if ``delta`` can't be appended to ``frame``."""
+    missing = frame.columns.difference(delta.columns)
+    if len(missing):
+        raise ValueError(f"delta is missing columns: {', '.join(missing)}")
+    if delta[ID_COLUMN].isna().any():
+        raise ValueError(f"delta has rows without a {ID_COLUMN}")
+    for col in frame.columns:
+        if is_numeric_dtype(frame[col]) and not is_numeric_dtype(delta[col]) and delta[col].notna().any():
+            raise ValueError(f"delta column {col!r} is not numeric")
+
+
+def new_rows(delta, seen_ids):
+    """Rows of ``delta`` whose ``job_id`` is neither in ``seen_ids`` nor repeated earlier in the delta.
+
+    Costs O(len(delta)): ``seen_ids`` is a set, looked up per row.
+    """
+    if ID_COLUMN not in delta.columns:
+        raise ValueError(f"delta has no {ID_COLUMN!r} column")
+    delta = delta.drop_duplicates(ID_COLUMN)
+    keep = np.fromiter((job_id not in seen_ids for job_id in delta[ID_COLUMN].tolist()), dtype=bool, count=len(delta))
+    return delta[keep]
+
+
+def delta_dir(path):
+    """Directory holding the delta CSVs for the dataset at ``path``."""
+    return os.path.splitext(path)[0] + DELTA_SUFFIX
+
+
+def list_deltas(directory):
+    """``{name: (mtime_ns, size)}`` of the delta CSVs in ``directory``, in application order."""
+    try:
+        entries = [e for e in os.scandir(directory)
+                   if e.name.endswith(".csv") and not e.name.startswith(".") and e.is_file()]
+    except FileNotFoundError:
+        return {}
+    return {e.name: (e.stat().st_mtime_ns, e.stat().st_size) for e in sorted(entries, key=lambda e: e.name)}
+
+
+class DatasetStore:
+    """Loads the dataset once, applies new delta files, and reloads it when the file changes.
+
+    A change is detected from the ``mtime``/size of the file and of every
+    delta file first; the content hash is only recomputed when those differ,
+    so a ``touch`` without new content keeps the already-parsed frame. New
+    delta files are appended incrementally; a delta that was changed or
+    removed after being applied forces a full reload. The version chains the
+    hash of every applied delta, including one whose rows were all already in
+    the dataset, so it depends only on the base file and the delta files.
+    A delta that can't be read or appended is logged and skipped, keeping the
+    last good dataset; once that file changes, the dataset is reloaded, so its
+    rows land in file-name order as they would after a restart.
+    """
+
+    def __init__(self, path=DATA_PATH):
+        self.path = path
+        self.delta_dir = delta_dir(path)
+        self._lock = threading.Lock()
+        self._dataset = None
+        self._stat = None
+        self._base_version = None
+        self._applied = {}
+        # Deltas skipped as malformed, with the stat they had then
+        self._rejected = {}
+        self._ids = set()
+
+    def _stat_key(self):
+        # Every delta file is stat'ed: a delta rewritten in place doesn't change the directory's mtime
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size, tuple(list_deltas(self.delta_dir).items())
+
+    def get(self):
+        """Return the current :class:`Dataset`, reloading or extending it if the files changed."""
+        stat_key = self._stat_key()
+        if self._dataset is not None and self._stat == stat_key:
+            return self._dataset
+
+        with self._lock:
+            if self._dataset is not None and self._stat == stat_key:
+                return self._dataset
+            deltas = dict(stat_key[2])
+            reload = (self._dataset is None
+                      or any(deltas.get(name) != st for name, st in self._applied.items())
+                      or any(name in deltas and deltas[name] != st for name, st in self._rejected.items()))
+            if self._dataset is None or self._stat[:2] != stat_key[:2]:
+                # Only hash the base file when its stat changed, so a new delta costs O(delta)
+                version = content_hash(self.path)
+                reload = reload or version != self._base_version
+            else:
+                version = self._base_version
+            if reload:
+                with span("dataset", "csv_read"):
+                    frame = read_dataset(self.path)
+                self._dataset = Dataset(frame, version, self.path, stat_key[0])
+                self._base_version = version
+                self._applied = {}
+                self._rejected = {}
+                self._ids = set(frame[ID_COLUMN].tolist()) if ID_COLUMN in frame.columns else set()
+            pending = [name for name in deltas if name not in self._applied and name not in self._rejected]
+            if pending:
+                with span("dataset", "delta_ingest"):
+                    self._apply(pending, deltas)
+            self._stat = stat_key
+            return self._dataset
+
+    def _apply(self, names, deltas):
+        """Append the rows of the delta files ``names`` that are not in the dataset yet."""
+        frames, valid = [], []
+        for name in names:
+            try:
+                frame = read_dataset(os.path.join(self.delta_dir, name))
+                check_delta(frame, self._dataset.frame)
+            except (OSError, ValueError) as e:
+                self._reject([name], deltas, e)
+                continue
+            frames.append(frame)
+            valid.append(name)
+        if not frames:
+            return
+        delta = new_rows(pd.concat(frames, ignore_index=True), self._ids)
+        # Chained per file, so the version doesn't depend on how many deltas were applied at once
+        version = self._dataset.version
+        for name in valid:
+            version = combine_hashes(version, content_hash(os.path.join(self.delta_dir, name)))
+        try:
+            dataset = self._dataset.extended(delta, version)
+        except (TypeError, ValueError) as e:
+            self._reject(valid, deltas, e)
+            return
+        self._dataset = dataset
+        self._ids.update(delta[ID_COLUMN].tolist())
+        for name in valid:
+            self._applied[name] = deltas[name]
+
+    def _reject(self, names, deltas, error):
+        logger.warning("Skipping delta %s in %s: %s", ", ".join(names), self.delta_dir, error)
+        for name in names:
+            self._rejected[name] = deltas[name]
+
+    def clear(self):
+        """Drop the cached snapshot so the next ``get`` re-reads the file."""
+        with self._lock:
+            self._dataset = None
+            self._stat = None
+            self._base_version = None
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path=DATA_PATH):
+    """Return the process-wide store for ``path``."""
+    path = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = DatasetStore(path)
+        return store
+
+
+def get_dataset(path=DATA_PATH):
+    """Return the shared :class:`Dataset` for ``path``."""
+    return get_store(path).get()
@@ -0,0 +1,77 @@
+"""Turn raw job profiles into the numeric feature matrix the salary model expects."""
+import numpy as np
+
+# Model input columns, in the order the model was trained on.
+FEATURE_COLUMNS = [
+    "job_title",
+    "experience_level",
+    "employment_type",
+    "company_location",
+    "company_size",
+    "education_required",
+    "years_experience",
+]
+NUMERIC_COLUMNS = ("years_experience",)
+
+
+class CompiledEncoder:
+    """Precompiled replacement for per-call ``LabelEncoder.transform``.
+
+    Built once per model version from ``label_encoders.pkl``. Each categorical
+    column gets a dict (for single rows) and a sorted class array (for batches)
+    so encoding never touches pandas or scikit-learn. Values an encoder has
+    never seen, including the UI's "None", map to ``fallback``: an integer code
+    or a ``{column: code}`` dict. The default of 0 matches the page's original
+    behaviour of substituting the first class.
+    """
+
+    def __init__(self, label_encoders, fallback=0, columns=FEATURE_COLUMNS):
+        self.columns = list(columns)
+        self.tables = {}
+        self.fallbacks = {}
+        self._sorted = {}
+        for col in self.columns:
+            if col in NUMERIC_COLUMNS:
+                continue
+            le = label_encoders.get(col)
+            classes = np.asarray(le.classes_ if le is not None else [], dtype=str)
+            order = np.argsort(classes, kind="stable")
+            self.tables[col] = {value: code for code, value in enumerate(classes.tolist())}
+            self.fallbacks[col] = fallback.get(col, 0) if isinstance(fallback, dict) else fallback
+            self._sorted[col] = (classes[order], order)
+
+    def encode_row(self, *values):
+        """Encode one profile given in ``columns`` order; returns a ``(1, n_features)`` array."""
+        row = [
+            self.tables[col].get(value, self.fallbacks[col]) if col in self.tables else value
+            for col, value in zip(self.columns, values)
+        ]
+        return np.array([row], dtype=np.float64)
+
+    def encode(self, data):
+        """Encode many profiles at once.
+
+        ``data`` is a DataFrame or a mapping of column name to array-like.
+        Returns an ``(n_rows, n_features)`` float array.
+        """
+        n_rows = len(data[self.columns[0]])
+        out = np.empty((n_rows, len(self.columns)), dtype=np.float64)
+        for j, col in enumerate(self.columns):
+            values = np.asarray(data[col])
+            out[:, j] = self._lookup(col, values) if col in self.tables else values
+        return out
+
+    def _lookup(self, col, values):
+        sorted_classes, order = self._sorted[col]
+        fallback = self.fallbacks[col]
+        if len(sorted_classes) == 0:
+            return np.full(len(values), fallback)
+        values = values.astype(str)
+        idx = np.searchsorted(sorted_classes, values)
+        idx[idx == len(sorted_classes)] = 0
+        return np.where(sorted_classes[idx] == values, order[idx], fallback)
+
+
+def predict_salaries(model, encoded):
+    """Predict annual salaries in USD, undoing the model's log1p target transform."""
+    return np.expm1(model.predict(encoded))
@@ -0,0 +1,113 @@
+"""Process-wide LRU cache of Plotly figures keyed on everything they depend on.
+
+Every chart on the dashboard pages used to be rebuilt on every rerun, even
+when its inputs had not changed. Each chart now names its own inputs (filter
+values, currency, dataset version, model version) and the figure is built
+only when that exact combination has not been seen before. Figures are stored
+as serialized JSON, which is compact, immutable (so sharing between sessions
+is safe) and makes the byte budget easy to enforce.
+"""
+import threading
+from collections import OrderedDict
+
+from core.metrics import span
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class FigureCache:
+    """Thread-safe LRU of figure JSON, bounded by total serialized size."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cached figure JSON for ``key``, or ``None``."""
+        with self._lock:
+            spec = self._entries.get(key)
+            if spec is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return spec
+
+    def put(self, key, spec):
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= len(self._entries.pop(key))
+            if len(spec) > self.max_bytes:
+                return
+            self._entries[key] = spec
+            self.bytes += len(spec)
+            while self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_cache = FigureCache()
+
+
+def get_figure_cache():
+    """Return the process-wide :class:`FigureCache`."""
+    return _cache
+
+
+def figure_key(chart_id, dataset=None, model=None, **params):
+    """Cache key: the chart, the data/model versions it reads and its own parameters."""
+    return (
+        chart_id,
+        getattr(dataset, "version", None),
+        getattr(model, "version", None),
+        tuple(sorted(params.items())),
+    )
+
+
+def cached_figure(chart_id, build, dataset=None, model=None, cache=None, **params):
+    """Return the figure for ``chart_id`` and ``params``, calling ``build()`` only on a miss.
+
+    ``dataset``/``model`` are the :class:`~core.dataset.Dataset` and
+    :class:`~core.model_registry.ModelBundle` the chart reads, if any; their
+    versions become part of the key, so a new CSV or model invalidates exactly
+    the charts that use it. ``params`` must be hashable.
+    """
+    # Deferred: pages import this module before they know whether they will draw anything
+    import plotly.io as pio
+
+    if cache is None:
+        cache = _cache
+    key = figure_key(chart_id, dataset, model, **params)
+    spec = cache.get(key)
+    if spec is None:
+        with span("figure", chart_id):
+            spec = build().to_json()
+        cache.put(key, spec)
+    return pio.from_json(spec)
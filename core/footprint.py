@@ -0,0 +1,163 @@
+"""Memory footprint report, for sizing the app's pods.
+
+Reports what every session shares (the dataset frame, column by column, and
+the indexes derived from it) and what each additional session costs: the
+memory a page run retains for its session, and the transient peak while it
+reruns. A pod needs roughly ``shared + sessions x retained + concurrent
+reruns x peak``::
+
+    python -m core.footprint                     # frame and derived structures
+    python -m core.footprint --sessions          # plus per-session cost of each page
+    python -m core.footprint --csv big.csv --sessions --estimate 200 8
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from core.dataset import DATA_PATH, get_dataset
+
+
+def deep_nbytes(obj, _seen=None):
+    """Approximate bytes held by ``obj``, following containers and object attributes."""
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes + (deep_nbytes(obj.tolist(), seen) if obj.dtype == object else 0)
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return size + sum(deep_nbytes(k, seen) + deep_nbytes(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(deep_nbytes(item, seen) for item in obj)
+    if hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += deep_nbytes(vars(obj), seen)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, slot):
+            size += deep_nbytes(getattr(obj, slot), seen)
+    return size
+
+
+def column_footprint(frame):
+    """Bytes per column of ``frame``, largest first."""
+    usage = frame.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        "dtype": frame.dtypes.astype(str),
+        "bytes": usage,
+        "bytes_per_row": usage / max(len(frame), 1),
+    })
+    return report.sort_values("bytes", ascending=False)
+
+
+def derived_footprint(dataset):
+    """Bytes per structure derived from ``dataset``, after building the ones the pages use."""
+    from core.aggregates import get_salary_cube
+    from core.companies import get_company_index
+    from core.labels import get_display_options
+    from core.partition import get_title_partition
+    from core.percentiles import get_salary_distribution
+    from core.skills import get_skill_index
+    from core.violin import get_violin_summary
+
+    for build in (get_salary_cube, get_company_index, get_display_options, get_title_partition,
+                  get_salary_distribution, get_skill_index, get_violin_summary):
+        build(dataset)
+    # The partition and the cube keep a reference to the frame; it is counted once, above
+    seen = {id(dataset.frame)}
+    sizes = {}
+    for key, value in dataset.derived_items():
+        # Parameterised keys ("violin", column, ...) are summed under their name
+        name = key[0] if isinstance(key, tuple) else str(key)
+        sizes[name] = sizes.get(name, 0) + deep_nbytes(value, seen)
+    return sizes
+
+
+def session_footprint(page):
+    """``(retained, peak)`` bytes of one more session of ``page`` (see ``benchmarks.pages``).
+
+    A first session warms the shared caches; the second is measured with
+    ``tracemalloc``, so only what is specific to a session is counted.
+    """
+    import gc
+    import tracemalloc
+    import warnings
+
+    from streamlit.testing.v1 import AppTest
+
+    from benchmarks.pages import PAGES, _widget
+    from core.paths import BASE_DIR
+
+    warnings.filterwarnings("ignore")
+
+    def run_session():
+        at = AppTest.from_file(f"{BASE_DIR}/{PAGES[page]}", default_timeout=600)
+        at.run()
+        if page == "prediction":
+            job_title = _widget(at.selectbox, "Job Title")
+            job_title.select(job_title.options[1])
+            _widget(at.button, "Predict Salary").click()
+            at.run()
+        return at
+
+    run_session()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        session = run_session()
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del session
+    return retained - before, peak - before
+
+
+def _mib(n):
+    return f"{n / 2**20:,.2f} MiB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the dataset's memory footprint and the cost per session.")
+    parser.add_argument("--csv", default=DATA_PATH, help="dataset to measure (default: the app's)")
+    parser.add_argument("--sessions", action="store_true", help="also measure one session of each page (slow)")
+    parser.add_argument("--estimate", type=int, nargs=2, metavar=("SESSIONS", "CONCURRENT"),
+                        help="print a pod memory estimate for this many open sessions and concurrent reruns")
+    args = parser.parse_args(argv)
+
+    dataset = get_dataset(args.csv)
+    columns = column_footprint(dataset.frame)
+    frame_bytes = int(columns["bytes"].sum())
+    print(f"Dataset: {len(dataset):,} rows, {_mib(frame_bytes)} ({frame_bytes / max(len(dataset), 1):,.0f} bytes/row)")
+    print(columns.to_string(formatters={"bytes": _mib, "bytes_per_row": "{:,.1f}".format}))
+
+    derived = derived_footprint(dataset)
+    shared = frame_bytes + sum(derived.values())
+    print("\nDerived structures (shared by every session):")
+    for key, size in sorted(derived.items(), key=lambda item: -item[1]):
+        print(f"  {key:<20} {_mib(size):>12}")
+    print(f"Shared total: {_mib(shared)}")
+
+    if not args.sessions:
+        return
+    print("\nPer session (retained / peak during a run):")
+    retained_max = peak_max = 0
+    for page in ("insights", "prediction"):
+        retained, peak = session_footprint(page)
+        retained_max, peak_max = max(retained_max, retained), max(peak_max, peak)
+        print(f"  {page:<12} {_mib(retained):>12} / {_mib(peak)}")
+    if args.estimate:
+        sessions, concurrent = args.estimate
+        total = shared + sessions * retained_max + concurrent * peak_max
+        print(f"\nEstimate for {sessions} sessions, {concurrent} concurrent reruns: {_mib(total)} "
+              "on top of the interpreter and libraries")
+
+
+if __name__ == "__main__":
+    main()
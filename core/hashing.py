@@ -0,0 +1,21 @@
+import hashlib
+
+CHUNK_SIZE = 1 << 20
+
+
+def content_hash(path, length=16):
+    """Return a short hex digest of the file's bytes, used as a version key."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:length]
+
+
+def combine_hashes(*parts, length=16):
+    """Return a short hex digest of several version keys, e.g. a base file and its deltas."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:length]
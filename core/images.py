@@ -0,0 +1,152 @@
+"""Resized, recompressed image variants in a content-addressed disk cache.
+
+The homepage and About Us page passed the full-size files in ``images/`` to
+``st.image``: a 7500px banner, 1920x2560 team photos shown 200px wide. On
+every page view Streamlit decoded each one, resized it to the displayed width
+and re-encoded it before sending it. :func:`responsive_image` returns instead
+a variant already at the displayed width, in a format Streamlit passes through
+as-is (JPEG for opaque images, PNG when there is transparency). Variants are
+named after a hash of the source's bytes plus the width, so an edited source
+simply gets new names. They are built on first request, or ahead of time with::
+
+    python -m core.images
+
+``variant(..., fmt="WEBP")`` produces WebP for consumers that serve the file
+directly; ``st.image`` re-encodes anything that isn't JPEG, PNG or GIF, so
+the pages don't use it.
+"""
+import argparse
+import os
+import threading
+
+from PIL import Image
+
+from core.paths import BASE_DIR
+from core.hashing import content_hash
+
+IMAGE_DIR = os.path.join(BASE_DIR, "images")
+CACHE_DIR = os.environ.get("IMAGE_CACHE_DIR", os.path.join(BASE_DIR, ".cache", "images"))
+
+# Streamlit's widest content area; ``use_container_width`` images are resized to this
+CONTAINER_WIDTH = 1460
+# Widths the pages display images at (team photos, page-3 header, full-width banners)
+DISPLAY_WIDTHS = (200, 350, CONTAINER_WIDTH)
+SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+EXTENSIONS = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp"}
+SAVE_OPTIONS = {
+    "JPEG": {"quality": 82, "optimize": True, "progressive": True},
+    "PNG": {"optimize": True},
+    "WEBP": {"quality": 80, "method": 4},
+}
+
+_hashes = {}
+_variants = {}
+_lock = threading.Lock()
+
+
+def _resolve(path):
+    return path if os.path.isabs(path) else os.path.join(BASE_DIR, path)
+
+
+def source_hash(path):
+    """Content hash of ``path``, recomputed only when its size or mtime changes."""
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        digest = _hashes.get(key)
+    if digest is None:
+        digest = content_hash(path)
+        with _lock:
+            _hashes[key] = digest
+    return digest
+
+
+def _has_alpha(image):
+    """Whether any pixel is actually transparent (several PNGs here carry an all-opaque alpha channel)."""
+    if image.mode == "P" and "transparency" in image.info:
+        image = image.convert("RGBA")
+    if image.mode not in ("RGBA", "LA", "PA"):
+        return False
+    return image.getchannel("A").getextrema()[0] < 255
+
+
+def variant(path, width, fmt=None):
+    """Path of ``path`` resized to ``width`` pixels wide (never upscaled), building it if needed.
+
+    ``fmt`` is ``"JPEG"``, ``"PNG"`` or ``"WEBP"``; by default PNG for images
+    with transparency and JPEG otherwise.
+    """
+    path = _resolve(path)
+    digest = source_hash(path)
+    key = (digest, int(width), fmt)
+    with _lock:
+        target = _variants.get(key)
+    if target is not None and os.path.exists(target):
+        return target
+    target = _build(path, digest, width, fmt)
+    with _lock:
+        _variants[key] = target
+    return target
+
+
+def _build(path, digest, width, fmt):
+    with Image.open(path) as image:
+        fmt = fmt or ("PNG" if _has_alpha(image) else "JPEG")
+        width = min(int(width), image.width)
+        target = os.path.join(CACHE_DIR, f"{digest}-{width}w{EXTENSIONS[fmt]}")
+        if os.path.exists(target):
+            return target
+
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS) if width != image.width else image.copy()
+    if fmt == "JPEG" and resized.mode != "RGB":
+        resized = resized.convert("RGB")
+    elif fmt == "PNG" and resized.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+        resized = resized.convert("RGBA")
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Write-then-rename, so concurrent sessions never serve half a file
+    tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+    resized.save(tmp, format=fmt, **SAVE_OPTIONS[fmt])
+    os.replace(tmp, target)
+    return target
+
+
+def responsive_image(path, width=None):
+    """What to pass to ``st.image`` for ``path`` shown ``width`` px wide (default: container width).
+
+    Falls back to the original file if a variant can't be built.
+    """
+    try:
+        return variant(path, width or CONTAINER_WIDTH)
+    except (OSError, ValueError):
+        return _resolve(path)
+
+
+def source_images():
+    """The app's images: everything in ``images/`` plus the prediction page's ``ai.png``."""
+    names = sorted(name for name in os.listdir(IMAGE_DIR) if name.lower().endswith(SOURCE_EXTENSIONS))
+    return [os.path.join(IMAGE_DIR, name) for name in names] + [os.path.join(BASE_DIR, "ai.png")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build resized image variants ahead of the first page view.")
+    parser.add_argument("paths", nargs="*", help="source images (default: images/ and ai.png)")
+    parser.add_argument("--widths", type=int, nargs="+", default=list(DISPLAY_WIDTHS), help="display widths (default: %(default)s)")
+    parser.add_argument("--webp", action="store_true", help="also build WebP variants")
+    args = parser.parse_args(argv)
+
+    original = built = 0
+    for path in args.paths or source_images():
+        original += os.path.getsize(path)
+        for width in args.widths:
+            for fmt in (None, "WEBP") if args.webp else (None,):
+                target = variant(path, width, fmt)
+                built += 1
+                print(f"{os.path.relpath(path, BASE_DIR)} @ {width}px -> {os.path.basename(target)} ({os.path.getsize(target) / 1024:,.0f} KiB)")
+    print(f"{built} variants from {original / 1024:,.0f} KiB of sources in {CACHE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Salary predictions served by a pool of worker processes.
+
+Streamlit runs every session's script as a thread of one process, so
+concurrent "Predict Salary" clicks (and the what-if sweeps behind them) queue
+on one interpreter. :class:`InferencePool` hands the encoded feature matrix to
+one of ``workers`` processes instead, so predictions run on as many cores as
+there are workers.
+
+Workers are started with ``forkserver`` (``spawn`` where that isn't
+available), never forked from the app: the Streamlit process runs many
+threads, and a child forked while one of them holds a lock can deadlock. The
+forkserver preloads :mod:`core.inference_preload`, which loads the model once;
+workers forked from it predict with that copy, shared copy-on-write, so an
+extra worker costs a few MB rather than another model. Only a worker of a
+pool for another version (after a hot swap), or one started with ``spawn``,
+loads its own copy. Each worker predicts single-threaded; the pool is the
+parallelism. A pool belongs to one model version and is replaced when the
+registry swaps the model.
+
+``INFERENCE_WORKERS`` sets the pool size. By default there is one worker per
+CPU beyond the first, which is left to the Streamlit process, up to
+``MAX_DEFAULT_WORKERS``; on a single CPU that is ``0`` and predictions run in
+the calling thread, since a worker could only add IPC to them.
+"""
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from core.encoding import predict_salaries
+from core.metrics import span
+from core.prediction_cache import predict_salary as _predict_salary
+
+PRELOAD_MODULE = "core.inference_preload"
+MAX_DEFAULT_WORKERS = 4
+
+
+def default_workers():
+    """``INFERENCE_WORKERS`` if set, else one worker per CPU beyond the first (at most ``MAX_DEFAULT_WORKERS``)."""
+    if os.environ.get("INFERENCE_WORKERS"):
+        return int(os.environ["INFERENCE_WORKERS"])
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    return min(MAX_DEFAULT_WORKERS, cpus - 1)
+
+
+DEFAULT_WORKERS = default_workers()
+
+# The bundle a worker predicts with, set by _init_worker
+_worker_bundle = None
+
+
+def _init_worker(model_path, encoder_path, version, started):
+    global _worker_bundle
+    # Present (and loaded) when this worker was forked from the preloading forkserver
+    preloaded = getattr(sys.modules.get(PRELOAD_MODULE), "bundle", None)
+    if preloaded is not None and preloaded.version == version:
+        _worker_bundle = preloaded
+    else:
+        from core.model_registry import load_bundle
+
+        _worker_bundle = load_bundle(model_path, encoder_path, version)
+    started.put((os.getpid(), _worker_bundle is preloaded))
+
+
+def _predict(encoded):
+    return np.expm1(_worker_bundle.model.predict(encoded, thread_count=1, verbose=False))
+
+
+class InferencePool:
+    """``workers`` processes predicting with one model version."""
+
+    def __init__(self, bundle, workers=DEFAULT_WORKERS):
+        self.version = bundle.version
+        self.workers = workers
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        context = multiprocessing.get_context(method)
+        if method == "forkserver":
+            # Takes effect when the forkserver starts, i.e. with the process's first pool
+            context.set_forkserver_preload([PRELOAD_MODULE])
+        # Each worker reports (PID, uses the preloaded model) here once its model is ready
+        self._started = context.SimpleQueue()
+        self._workers = {}
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=context, initializer=_init_worker,
+            initargs=(bundle.model_path, bundle.encoder_path, bundle.version, self._started),
+        )
+
+    def predict(self, encoded):
+        """Salaries in USD for an encoded ``(n_rows, n_features)`` matrix, computed by a worker."""
+        return self._executor.submit(_predict, encoded).result()
+
+    def start(self):
+        """Start every worker now rather than on the first predictions."""
+        for future in [self._executor.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    def _drain(self):
+        while not self._started.empty():
+            pid, preloaded = self._started.get()
+            self._workers[pid] = preloaded
+        return self._workers
+
+    def pids(self):
+        """PIDs of the workers started so far (those whose initializer has run)."""
+        return list(self._drain())
+
+    def preloaded_pids(self):
+        """PIDs of the started workers predicting with the forkserver's preloaded model."""
+        return [pid for pid, preloaded in self._drain().items() if preloaded]
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_inference_pool(bundle, workers=None):
+    """Return the process-wide :class:`InferencePool` for ``bundle``'s version, or ``None`` if disabled."""
+    global _pool
+    if workers is None:
+        workers = DEFAULT_WORKERS
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None or _pool.version != bundle.version:
+            if _pool is not None:
+                # In-flight predictions on the old version still finish
+                _pool.shutdown(wait=False)
+            _pool = InferencePool(bundle, workers)
+        return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def predict_encoded(bundle, encoded):
+    """Salaries in USD for an encoded matrix, on the pool when there is one."""
+    with span("inference", "predict"):
+        pool = get_inference_pool(bundle)
+        if pool is not None:
+            try:
+                return pool.predict(encoded)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory); the next call starts a fresh pool
+                _discard_pool(pool)
+        return predict_salaries(bundle.model, encoded)
+
+
+def predict_salary(bundle, *values, cache=None):
+    """:func:`core.prediction_cache.predict_salary`, with cache misses predicted on the pool."""
+    return _predict_salary(bundle, *values, cache=cache, predict=predict_encoded)
@@ -0,0 +1,16 @@
+"""The model, loaded once in the inference pool's forkserver.
+
+:class:`core.inference_pool.InferencePool` names this module in
+``set_forkserver_preload``, so the forkserver imports it, loading the current
+model from the registry, before it forks any worker. Workers then start with
+the model already in memory and share its pages copy-on-write instead of each
+loading a private copy. A worker whose pool serves a different version (after
+a hot swap) loads that version itself.
+"""
+from core.model_registry import get_model
+
+try:
+    bundle = get_model()
+except Exception:
+    # The forkserver only survives ImportError from a preload; workers load their own copy instead
+    bundle = None
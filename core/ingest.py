@@ -0,0 +1,68 @@
+"""Add a delta file of new job postings to the dataset.
+
+The delta is checked against the dataset (same columns, a ``job_id`` per row,
+numbers in the numeric columns), then copied into the dataset's delta
+directory, ``ai_job_dataset.deltas/`` by default. Running app processes pick
+it up on their next page run and append only its postings that are not in the
+dataset yet, without a restart or a full reload. Usage::
+
+    python -m core.ingest postings-2026-10-12.csv
+    python -m core.ingest postings.csv --dry-run     # only report new / duplicate rows
+
+Deltas are applied in file-name order; the copy is named after the ingest time
+so that order is the order of arrival.
+"""
+import argparse
+import os
+import shutil
+import time
+
+from core.dataset import DATA_PATH, ID_COLUMN, check_delta, get_store, new_rows, read_dataset
+
+
+def ingest(path, dataset_path=DATA_PATH, name=None):
+    """Copy the delta CSV at ``path`` into ``dataset_path``'s delta directory; returns the copy's path.
+
+    The file is written under a temporary name and renamed, so a running app
+    never reads a partial delta.
+    """
+    store = get_store(dataset_path)
+    os.makedirs(store.delta_dir, exist_ok=True)
+    name = name or f"{time.strftime('%Y%m%d-%H%M%S')}-{os.path.basename(path)}"
+    if not name.endswith(".csv"):
+        name += ".csv"
+    target = os.path.join(store.delta_dir, name)
+    if os.path.exists(target):
+        raise FileExistsError(target)
+    partial = os.path.join(store.delta_dir, f".{name}.tmp")
+    shutil.copyfile(path, partial)
+    os.replace(partial, target)
+    return target
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Append a delta file of new job postings to the dataset.")
+    parser.add_argument("delta", help="CSV file with the new postings, in the dataset's format")
+    parser.add_argument("--csv", default=DATA_PATH, help="dataset to add it to (default: the app's)")
+    parser.add_argument("--name", help="file name in the delta directory (default: ingest time + input name)")
+    parser.add_argument("--dry-run", action="store_true", help="check the delta and report, without adding it")
+    args = parser.parse_args(argv)
+
+    store = get_store(args.csv)
+    dataset = store.get()
+    delta = read_dataset(args.delta)
+    check_delta(delta, dataset.frame)
+    fresh = new_rows(delta, set(dataset.frame[ID_COLUMN].tolist()))
+    print(f"{args.delta}: {len(delta):,} rows, {len(fresh):,} new, {len(delta) - len(fresh):,} already in the dataset or repeated")
+    if args.dry_run:
+        return
+
+    target = ingest(args.delta, args.csv, args.name)
+    start = time.perf_counter()
+    updated = store.get()
+    seconds = time.perf_counter() - start
+    print(f"Added {target} ({len(dataset):,} -> {len(updated):,} rows, applied in {seconds * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
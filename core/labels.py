@@ -0,0 +1,55 @@
+"""Display labels shown in the UI for the dataset's coded columns, and the display currency."""
+
+# Salaries are stored in USD; the prediction page and career plans show them in MYR
+USD_TO_MYR = 4.13
+
+COMPANY_SIZE_LABELS = {"S": "Small", "M": "Medium", "L": "Large"}
+EMPLOYMENT_TYPE_LABELS = {"FT": "Full Time", "PT": "Part Time", "CT": "Contract", "FL": "Freelance"}
+EXPERIENCE_LEVEL_LABELS = {"EN": "Entry Level", "MI": "Mid Level", "SE": "Senior Level", "EX": "Executive"}
+
+DISPLAY_LABELS = {
+    "company_size": COMPANY_SIZE_LABELS,
+    "employment_type": EMPLOYMENT_TYPE_LABELS,
+    "experience_level": EXPERIENCE_LEVEL_LABELS,
+}
+
+# Columns the prediction page offers as selectboxes
+SELECT_COLUMNS = ("job_title", "employment_type", "experience_level", "company_location", "company_size", "education_required")
+
+# UI label -> dataset code, per column
+DATASET_CODES = {
+    col: {label: code for code, label in labels.items()}
+    for col, labels in DISPLAY_LABELS.items()
+}
+
+
+def to_code(column, value):
+    """Convert a UI label (e.g. "Small") to its dataset code ("S"); other values pass through."""
+    return DATASET_CODES.get(column, {}).get(value, value)
+
+
+def display_options(frame, columns):
+    """``{column: sorted UI labels of the values present}``, for the page's selectboxes."""
+    return {
+        col: sorted(DISPLAY_LABELS.get(col, {}).get(value, value) for value in frame[col].unique().tolist())
+        for col in columns
+    }
+
+
+def get_display_options(dataset, columns=SELECT_COLUMNS):
+    """Selectbox options for ``dataset``, computed once per dataset version."""
+    def extend(options, ds, start):
+        added = display_options(ds.frame.iloc[start:], columns)
+        return {col: sorted(set(options[col]).union(added[col])) for col in columns}
+
+    return dataset.derived(("display_options", tuple(columns)), lambda ds: display_options(ds.frame, columns), extend)
+
+
+def to_codes(frame):
+    """Return ``frame`` with UI labels in the coded columns replaced by dataset codes."""
+    converted = {
+        col: frame[col].replace(codes)
+        for col, codes in DATASET_CODES.items()
+        if col in frame.columns
+    }
+    return frame.assign(**converted) if converted else frame
@@ -0,0 +1,251 @@
+"""Lottie animations for the homepage, served from local copies.
+
+The homepage used to call ``requests.get`` once per animation, in series, with
+no timeout, on every rerun, so a slow CDN froze the landing page. The loader
+below answers from memory, then from the on-disk cache, then from the copies
+bundled with the app, and never waits on the network for an animation it has
+a local copy of. Copies older than ``ttl`` are revalidated in the background:
+all URLs are fetched concurrently through one pooled ``requests.Session`` with
+timeouts, using ``If-None-Match``/``If-Modified-Since``, so an unchanged
+animation costs a 304. An animation with no local copy at all (a fresh
+deploy without bundled copies, say) is fetched in the background too: the page
+renders without it and shows it on a later run. To refresh the cache and the
+bundled copies from the command line::
+
+    python -m core.lottie --bundle
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.paths import BASE_DIR
+
+LOTTIE_URLS = {
+    "ai": "https://assets9.lottiefiles.com/packages/lf20_0yfsb3a1.json",
+    "salary": "https://assets2.lottiefiles.com/packages/lf20_t24tpvcu.json",
+    "job": "https://assets2.lottiefiles.com/packages/lf20_pprxh53t.json",
+    "about": "https://assets9.lottiefiles.com/packages/lf20_u4yrau.json",
+}
+
+CACHE_DIR = os.environ.get("LOTTIE_CACHE_DIR", os.path.join(BASE_DIR, ".cache", "lottie"))
+BUNDLED_DIR = os.path.join(BASE_DIR, "assets", "lottie")
+DEFAULT_TTL = 24 * 60 * 60
+# (connect, read) seconds
+DEFAULT_TIMEOUT = (3.05, 10)
+# After a failed fetch, don't try that URL again (and don't block on it) for this long
+RETRY_AFTER = 60
+
+
+def make_session(pool_size=len(LOTTIE_URLS)):
+    """A ``requests.Session`` whose connection pool fits one concurrent fetch per URL."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class LottieLoader:
+    """Memory -> disk cache -> bundled copy lookup, with background revalidation.
+
+    ``urls`` maps animation names to URLs; pointing it (and ``cache_dir`` /
+    ``bundled_dir``) somewhere else, e.g. a local ``http.server``, is all a
+    test needs.
+    """
+
+    def __init__(self, urls=LOTTIE_URLS, cache_dir=CACHE_DIR, bundled_dir=BUNDLED_DIR,
+                 ttl=DEFAULT_TTL, timeout=DEFAULT_TIMEOUT, retry_after=RETRY_AFTER, session=None):
+        self.urls = dict(urls)
+        self.cache_dir = cache_dir
+        self.bundled_dir = bundled_dir
+        self.ttl = ttl
+        self.timeout = timeout
+        self.retry_after = retry_after
+        # Created on the first fetch, so a page served from local copies never imports requests
+        self._session = session
+        self._pool = ThreadPoolExecutor(max_workers=max(1, len(self.urls)), thread_name_prefix="lottie")
+        self._lock = threading.Lock()
+        self._memory = {}
+        self._failed = {}
+        self._refreshing = {}
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                self._session = make_session(max(1, len(self.urls)))
+            return self._session
+
+    # ---------- local copies ----------
+    def _paths(self, name):
+        base = os.path.join(self.cache_dir, name)
+        return base + ".json", base + ".meta.json"
+
+    def _read_cache(self, name):
+        """``(animation, meta)`` from the disk cache, or ``(None, {})``."""
+        data_path, meta_path = self._paths(name)
+        try:
+            with open(data_path, encoding="utf-8") as f:
+                data = json.load(f)
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None, {}
+        return data, meta
+
+    def _read_bundled(self, name):
+        try:
+            with open(os.path.join(self.bundled_dir, name + ".json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, name, meta, body=None):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data_path, meta_path = self._paths(name)
+        files = [(meta_path, json.dumps(meta).encode())]
+        if body is not None:
+            files.insert(0, (data_path, body))
+        # Write-then-rename, so a concurrent reader never sees half a file
+        for path, content in files:
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(content)
+            os.replace(tmp, path)
+
+    def _local(self, name):
+        """Best local copy as ``(animation, fetched_at)``; ``fetched_at`` is 0 if it needs fetching."""
+        with self._lock:
+            entry = self._memory.get(name)
+        if entry is not None:
+            return entry
+        data, meta = self._read_cache(name)
+        entry = (data, meta.get("fetched_at", 0)) if data is not None else (self._read_bundled(name), 0)
+        if entry[0] is not None:
+            with self._lock:
+                self._memory.setdefault(name, entry)
+        return entry
+
+    # ---------- network ----------
+    def fetch(self, name):
+        """Revalidate one animation against its URL; returns ``"updated"``, ``"not-modified"`` or ``"error"``."""
+        import requests
+
+        data, meta = self._read_cache(name)
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        try:
+            response = self.session.get(self.urls[name], headers=headers, timeout=self.timeout)
+            now = time.time()
+            if response.status_code == 304 and data is not None:
+                meta["fetched_at"] = now
+                self._write_cache(name, meta)
+                status = "not-modified"
+            elif response.status_code == 200:
+                data = response.json()
+                meta = {
+                    "url": self.urls[name],
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "fetched_at": now,
+                }
+                self._write_cache(name, meta, response.content)
+                status = "updated"
+            else:
+                status = "error"
+        except (requests.RequestException, ValueError, OSError):
+            status = "error"
+        with self._lock:
+            if status == "error":
+                self._failed[name] = time.time()
+            else:
+                self._failed.pop(name, None)
+                self._memory[name] = (data, now)
+        return status
+
+    def refresh(self, names=None):
+        """Fetch ``names`` (default: all) concurrently and wait; returns ``{name: status}``."""
+        names = list(self.urls if names is None else names)
+        return dict(zip(names, self._pool.map(self.fetch, names)))
+
+    def _refresh_in_background(self, names):
+        with self._lock:
+            for name in names:
+                future = self._refreshing.get(name)
+                if future is None or future.done():
+                    self._refreshing[name] = self._pool.submit(self.fetch, name)
+
+    # ---------- page API ----------
+    def load(self, names=None):
+        """``{name: animation or None}``, never waiting on the network; ``None`` until fetched."""
+        names = list(self.urls if names is None else names)
+        now = time.time()
+        result, stale = {}, []
+        for name in names:
+            data, fetched_at = self._local(name)
+            result[name] = data
+            with self._lock:
+                backing_off = now - self._failed.get(name, 0) < self.retry_after
+            if backing_off:
+                continue
+            if data is None or now - fetched_at > self.ttl:
+                stale.append(name)
+        if stale:
+            # Missing ones included: the page renders without them rather than wait on the network
+            self._refresh_in_background(stale)
+        return result
+
+    def bundle(self, names=None):
+        """Copy the cached animations into ``bundled_dir``; returns the names copied."""
+        os.makedirs(self.bundled_dir, exist_ok=True)
+        copied = []
+        for name in list(self.urls if names is None else names):
+            data, _ = self._read_cache(name)
+            if data is not None:
+                with open(os.path.join(self.bundled_dir, name + ".json"), "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                copied.append(name)
+        return copied
+
+
+_loader = None
+_loader_lock = threading.Lock()
+
+
+def get_lottie_loader():
+    """Return the process-wide :class:`LottieLoader`."""
+    global _loader
+    with _loader_lock:
+        if _loader is None:
+            _loader = LottieLoader()
+        return _loader
+
+
+def load_lottie_animations(names=None):
+    """``{name: animation or None}`` for the homepage's animations (see :meth:`LottieLoader.load`)."""
+    return get_lottie_loader().load(names)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh the cached Lottie animations.")
+    parser.add_argument("--bundle", action="store_true", help=f"also copy them into {BUNDLED_DIR}")
+    args = parser.parse_args(argv)
+
+    loader = get_lottie_loader()
+    for name, status in loader.refresh().items():
+        print(f"{name}: {status}")
+    if args.bundle:
+        print(f"Bundled: {', '.join(loader.bundle()) or 'nothing'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Per-section timing spans, aggregated into latency histograms.
+
+Pages and the hot paths in ``core`` wrap their work in :func:`span`. With
+metrics enabled, every span's duration goes into a histogram per
+``(scope, section)`` (the scope being a page or a core component), which can
+be scraped in Prometheus' text format or written periodically to a rotating
+local file.
+With metrics disabled (the default) ``span`` returns a shared no-op object,
+so the instrumentation costs a function call.
+
+Configured from the environment when the app starts::
+
+    APP_METRICS=1                    # collect
+    METRICS_PORT=9464                # serve http://host:9464/metrics
+    METRICS_FILE=metrics.jsonl       # append a snapshot every METRICS_INTERVAL seconds (60)
+"""
+import bisect
+import json
+import os
+import threading
+import time
+
+# Upper bounds, in seconds (Prometheus' defaults plus a finer low end)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC_NAME = "app_section_seconds"
+DEFAULT_INTERVAL = 60
+FILE_MAX_BYTES = 10 * 1024 * 1024
+FILE_BACKUPS = 5
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram, as Prometheus exposes it."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the ``q`` quantile (``inf`` past the last bucket)."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class MetricsRegistry:
+    """Histograms keyed by ``(scope, section)``: a page or core component, and a named section of it."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, scope, section, seconds):
+        with self._lock:
+            histogram = self._histograms.get((scope, section))
+            if histogram is None:
+                histogram = self._histograms[(scope, section)] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def snapshot(self):
+        """``{"scope.section": {"count", "sum", "p50", "p95", "p99"}}``, quantiles as bucket bounds."""
+        with self._lock:
+            return {
+                f"{scope}.{section}": {
+                    "count": h.count, "sum": round(h.sum, 6),
+                    "p50": h.quantile(0.5), "p95": h.quantile(0.95), "p99": h.quantile(0.99),
+                }
+                for (scope, section), h in sorted(self._histograms.items())
+            }
+
+    def prometheus(self):
+        """All histograms in the Prometheus text exposition format."""
+        lines = [f"# HELP {METRIC_NAME} Time spent in each section of a page or core component.", f"# TYPE {METRIC_NAME} histogram"]
+        with self._lock:
+            for (scope, section), h in sorted(self._histograms.items()):
+                labels = f'scope="{_escape(scope)}",section="{_escape(section)}"'
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+                lines.append(f'{METRIC_NAME}_bucket{{{labels},le="+Inf"}} {h.count}')
+                lines.append(f"{METRIC_NAME}_sum{{{labels}}} {h.sum:.6f}")
+                lines.append(f"{METRIC_NAME}_count{{{labels}}} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Span:
+    __slots__ = ("registry", "scope", "section", "start")
+
+    def __init__(self, registry, scope, section):
+        self.registry = registry
+        self.scope = scope
+        self.section = section
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.scope, self.section, time.perf_counter() - self.start)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+_registry = None
+_exporters = []
+_lock = threading.Lock()
+
+
+def span(scope, section):
+    """Context manager timing ``section`` of ``scope``; a no-op unless metrics are enabled."""
+    registry = _registry
+    if registry is None:
+        return _NOOP
+    return _Span(registry, scope, section)
+
+
+def get_metrics():
+    """The process-wide :class:`MetricsRegistry`, or ``None`` when metrics are disabled."""
+    return _registry
+
+
+# ---------- exporters ----------
+# Imported only when an exporter is started, so disabled metrics import nothing extra
+def serve_prometheus(port, host="0.0.0.0"):
+    """Serve ``/metrics`` from a daemon thread; returns the server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics" or _registry is None:
+                self.send_error(404)
+                return
+            body = _registry.prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def write_snapshots(path, interval=DEFAULT_INTERVAL, max_bytes=FILE_MAX_BYTES, backups=FILE_BACKUPS):
+    """Append a JSON snapshot line to ``path`` every ``interval`` seconds, rotating the file by size."""
+    import logging
+    import logging.handlers
+
+    handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+    logger = logging.getLogger("app.metrics")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    stopped = threading.Event()
+
+    def run():
+        while not stopped.wait(interval):
+            logger.info(json.dumps({"time": time.time(), "sections": _registry.snapshot()}))
+
+    threading.Thread(target=run, name="metrics-file", daemon=True).start()
+    return stopped
+
+
+def enable(port=None, path=None, interval=DEFAULT_INTERVAL):
+    """Start collecting, plus the Prometheus endpoint and/or snapshot file if given. Idempotent."""
+    global _registry
+    with _lock:
+        if _registry is not None:
+            return _registry
+        _registry = MetricsRegistry()
+        if port:
+            _exporters.append(serve_prometheus(int(port)))
+        if path:
+            _exporters.append(write_snapshots(path, interval))
+        return _registry
+
+
+if os.environ.get("APP_METRICS", "").lower() in ("1", "true", "yes"):
+    enable(port=os.environ.get("METRICS_PORT"), path=os.environ.get("METRICS_FILE"),
+           interval=float(os.environ.get("METRICS_INTERVAL", DEFAULT_INTERVAL)))
@@ -0,0 +1,267 @@
+"""Warm, versioned, process-wide cache of the salary model and its label encoders.
+
+The prediction page used to ``pickle.load`` the CatBoost model and
+``joblib.load`` the encoders on every rerun. The registry loads each artifact
+version once, keys it by the content hash of the files, runs a warm-up
+prediction before publishing it and swaps the current version atomically, so
+sessions never see a half-loaded model.
+
+Run ``python -m core.model_registry --export-cbm`` to write CatBoost's native
+``salary_predictor.cbm`` next to the pickle; the registry prefers it because
+it loads faster than unpickling. Likewise ``--export-encoders`` writes the
+encoders' classes to ``label_encoders.json``, which loads without importing
+scikit-learn (over a second of a cold start). Each export records the content
+hash of the pickle it came from (``<export>.source``) and is only used while
+that pickle is unchanged: replacing the pickle loads the pickle, so a stale
+export never shadows a new model.
+"""
+import argparse
+import json
+import os
+import pickle
+import threading
+import time
+
+import numpy as np
+
+from core.paths import BASE_DIR
+from core.encoding import FEATURE_COLUMNS, CompiledEncoder
+from core.hashing import content_hash
+from core.metrics import span
+
+MODEL_DIR = os.path.join(BASE_DIR, "pages")
+MODEL_PATH = os.path.join(MODEL_DIR, "salary_predictor.pkl")
+CBM_PATH = os.path.join(MODEL_DIR, "salary_predictor.cbm")
+ENCODER_PATH = os.path.join(MODEL_DIR, "label_encoders.pkl")
+ENCODER_JSON_PATH = os.path.join(MODEL_DIR, "label_encoders.json")
+# Written next to an export: the content hash of the pickle it was exported from
+SOURCE_SUFFIX = ".source"
+
+# Number of recently used versions kept in memory so swapping back is instant.
+MAX_VERSIONS = 2
+
+
+class ModelBundle:
+    """A loaded model version: the regressor plus the encoders it was trained with."""
+
+    def __init__(self, version, model, label_encoders, model_path, encoder_path, load_seconds):
+        self.version = version
+        self.model = model
+        self.label_encoders = label_encoders
+        self.encoder = CompiledEncoder(label_encoders)
+        self.model_path = model_path
+        self.encoder_path = encoder_path
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+
+    def __repr__(self):
+        return f"ModelBundle(version={self.version!r}, model={os.path.basename(self.model_path)!r})"
+
+
+def load_model(path):
+    """Load a regressor from a ``.cbm`` file or a pickle."""
+    if path.endswith(".cbm"):
+        from catboost import CatBoostRegressor
+
+        model = CatBoostRegressor()
+        model.load_model(path)
+        return model
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+class LabelClasses:
+    """The part of a fitted ``LabelEncoder`` the app reads (``classes_``), loaded from JSON."""
+
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes, dtype=object)
+
+
+def load_label_encoders(path):
+    """Load ``{column: encoder}`` from ``label_encoders.json`` or the joblib pickle."""
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return {col: LabelClasses(classes) for col, classes in json.load(f).items()}
+    import joblib
+
+    return joblib.load(path)
+
+
+def warm_up(model):
+    """Run one throw-away prediction so the first user click doesn't pay for lazy init."""
+    model.predict(np.zeros((1, len(FEATURE_COLUMNS))))
+
+
+def artifact_version(model_path, encoder_path):
+    """Version key of a model/encoder pair, derived from both files' contents."""
+    return content_hash(model_path, length=8) + content_hash(encoder_path, length=8)
+
+
+def exported(path, export_path):
+    """``export_path`` if it was exported from ``path``'s current contents, else ``None``.
+
+    An export without its pickle (a deploy that ships only the export) is used as is.
+    """
+    if not os.path.exists(export_path):
+        return None
+    if not os.path.exists(path):
+        return export_path
+    try:
+        with open(export_path + SOURCE_SUFFIX, encoding="utf-8") as f:
+            source = f.read().strip()
+    except OSError:
+        return None
+    return export_path if source == content_hash(path) else None
+
+
+def resolve_model_path(path):
+    """The file to load for ``path``: its up-to-date ``.cbm`` export if there is one, else ``path``."""
+    if path.endswith(".pkl"):
+        return exported(path, os.path.splitext(path)[0] + ".cbm") or path
+    return path
+
+
+def resolve_encoder_path(path):
+    """The file to load for ``path``: its up-to-date ``.json`` export if there is one, else ``path``."""
+    if path.endswith(".pkl"):
+        return exported(path, os.path.splitext(path)[0] + ".json") or path
+    return path
+
+
+def load_bundle(model_path, encoder_path, version=None):
+    """Load, warm up and version one model/encoder pair (from their exports when up to date)."""
+    start = time.perf_counter()
+    with span("model", "load"):
+        version = version or artifact_version(model_path, encoder_path)
+        model_path, encoder_path = resolve_model_path(model_path), resolve_encoder_path(encoder_path)
+        model = load_model(model_path)
+        label_encoders = load_label_encoders(encoder_path)
+        warm_up(model)
+    return ModelBundle(version, model, label_encoders, model_path, encoder_path,
+                       time.perf_counter() - start)
+
+
+def default_model_path():
+    """The pickle, or the native CatBoost file when only that is deployed (see :func:`resolve_model_path`)."""
+    return MODEL_PATH if os.path.exists(MODEL_PATH) or not os.path.exists(CBM_PATH) else CBM_PATH
+
+
+def default_encoder_path():
+    """The pickle, or the exported JSON classes when only those are deployed."""
+    return ENCODER_PATH if os.path.exists(ENCODER_PATH) or not os.path.exists(ENCODER_JSON_PATH) else ENCODER_JSON_PATH
+
+
+class ModelRegistry:
+    """Holds the current :class:`ModelBundle` and swaps it without a restart.
+
+    ``get()`` re-stats the artifact files and transparently loads a new
+    version when they change on disk; ``swap()`` switches to explicit paths.
+    Either way the new bundle is fully loaded and warmed up before it replaces
+    the current one, so concurrent readers always get a usable model.
+    """
+
+    def __init__(self, model_path=None, encoder_path=None):
+        self.model_path = model_path or default_model_path()
+        self.encoder_path = encoder_path or default_encoder_path()
+        self._lock = threading.Lock()
+        self._bundles = {}
+        self._current = None
+        self._stat = None
+
+    def _stat_key(self, model_path, encoder_path):
+        a, b = os.stat(model_path), os.stat(encoder_path)
+        return (model_path, a.st_mtime_ns, a.st_size, encoder_path, b.st_mtime_ns, b.st_size)
+
+    def get(self):
+        """Return the current bundle, loading it on first use or after a file change."""
+        stat_key = self._stat_key(self.model_path, self.encoder_path)
+        current = self._current
+        if current is not None and self._stat == stat_key:
+            return current
+        with self._lock:
+            # Re-stat under the lock: a concurrent swap() may have changed the paths.
+            stat_key = self._stat_key(self.model_path, self.encoder_path)
+            if self._current is None or self._stat != stat_key:
+                self._activate(self.model_path, self.encoder_path, stat_key)
+            return self._current
+
+    def swap(self, model_path, encoder_path=None):
+        """Atomically switch to another model version and return its bundle."""
+        encoder_path = encoder_path or self.encoder_path
+        stat_key = self._stat_key(model_path, encoder_path)
+        with self._lock:
+            self._activate(model_path, encoder_path, stat_key)
+            self.model_path, self.encoder_path = model_path, encoder_path
+            return self._current
+
+    @property
+    def version(self):
+        return self.get().version
+
+    def _activate(self, model_path, encoder_path, stat_key):
+        version = artifact_version(model_path, encoder_path)
+        bundle = self._bundles.pop(version, None)
+        if bundle is None:
+            bundle = load_bundle(model_path, encoder_path, version)
+        self._bundles[version] = bundle
+        while len(self._bundles) > MAX_VERSIONS:
+            self._bundles.pop(next(iter(self._bundles)))
+        self._current = bundle
+        self._stat = stat_key
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Return the process-wide :class:`ModelRegistry`."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
+
+
+def get_model():
+    """Return the current :class:`ModelBundle` from the process-wide registry."""
+    return get_registry().get()
+
+
+def _write_source(path, export_path):
+    with open(export_path + SOURCE_SUFFIX, "w", encoding="utf-8") as f:
+        f.write(content_hash(path) + "\n")
+
+
+def export_cbm(model_path=MODEL_PATH, cbm_path=CBM_PATH):
+    """Save the pickled CatBoost model in CatBoost's native format."""
+    load_model(model_path).save_model(cbm_path)
+    _write_source(model_path, cbm_path)
+    return cbm_path
+
+
+def export_encoders(encoder_path=ENCODER_PATH, json_path=ENCODER_JSON_PATH):
+    """Save the pickled encoders' classes as JSON."""
+    classes = {col: le.classes_.tolist() for col, le in load_label_encoders(encoder_path).items()}
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(classes, f, indent=1)
+    _write_source(encoder_path, json_path)
+    return json_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or convert the salary model artifacts.")
+    parser.add_argument("--export-cbm", action="store_true", help=f"write {os.path.basename(CBM_PATH)} from the pickle")
+    parser.add_argument("--export-encoders", action="store_true", help=f"write {os.path.basename(ENCODER_JSON_PATH)} from the pickle")
+    args = parser.parse_args(argv)
+
+    if args.export_cbm:
+        print(f"Wrote {export_cbm()}")
+    if args.export_encoders:
+        print(f"Wrote {export_encoders()}")
+    bundle = ModelRegistry().get()
+    print(f"{bundle!r} loaded and warmed up in {bundle.load_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
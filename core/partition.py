@@ -0,0 +1,92 @@
+"""Job-title partition index: each title's rows as one contiguous slice.
+
+The prediction page used to filter the full frame with
+``df[df['job_title'] == title]`` once per follow-up section, and the Insights
+page did the same for its job filter. The partition sorts the row positions by
+title once per dataset version and records where each title's run starts, so
+fetching one title's rows costs O(rows of that title), not O(dataset). When
+delta rows are appended, they are inserted at the end of their title's run
+rather than re-sorting every row.
+"""
+import numpy as np
+import pandas as pd
+
+TITLE_COLUMN = "job_title"
+
+
+class TitlePartition:
+    """Row positions grouped by title, with ``offsets`` delimiting each group."""
+
+    def __init__(self, frame, column=TITLE_COLUMN):
+        codes, keys = pd.factorize(frame[column], sort=True)
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes[codes >= 0], minlength=len(keys))
+        # Rows with a missing title (code -1) sort first and belong to no group.
+        offsets = np.concatenate([[0], np.cumsum(counts)]) + np.count_nonzero(codes < 0)
+        self._assign(frame, column, order, offsets, list(keys))
+
+    def _assign(self, frame, column, order, offsets, keys):
+        self.frame = frame
+        self.column = column
+        self.order = order
+        self.offsets = offsets
+        self.keys = keys
+        self._positions = {key: i for i, key in enumerate(keys)}
+
+    def extended(self, frame, start):
+        """The partition of ``frame``, given that this one indexes its rows before ``start``.
+
+        The new rows are placed after each title's existing run, which keeps
+        every run in file order, so the result equals a fresh build.
+        """
+        titles = frame[self.column].iloc[start:]
+        keys = sorted(set(self.keys).union(titles.dropna().unique().tolist()))
+        codes = pd.Categorical(titles, categories=keys).codes.astype(np.intp)
+        counts = np.zeros(len(keys), dtype=np.int64)
+        positions = {key: i for i, key in enumerate(keys)}
+        counts[[positions[key] for key in self.keys]] = np.diff(self.offsets)
+        missing = self.offsets[0]
+        # End of each title's current run; the extra last entry is where code -1 (no title) goes.
+        ends = np.concatenate([missing + np.cumsum(counts), [missing]])
+        rows = start + np.argsort(codes, kind="stable")
+        order = np.insert(self.order, ends[codes[rows - start]], rows)
+        counts += np.bincount(codes[codes >= 0], minlength=len(keys))
+        offsets = np.concatenate([[0], np.cumsum(counts)]) + missing + np.count_nonzero(codes < 0)
+        partition = TitlePartition.__new__(TitlePartition)
+        partition._assign(frame, self.column, order, offsets, keys)
+        return partition
+
+    def codes(self, start):
+        """Positions in ``keys`` of the titles of rows ``start:`` (-1 for a missing title)."""
+        return pd.Categorical(self.frame[self.column].iloc[start:], categories=self.keys).codes.astype(np.intp)
+
+    def positions(self, titles):
+        """Positions in ``keys`` of ``titles`` (all of them keys), one dict lookup each."""
+        return np.fromiter((self._positions[title] for title in titles), dtype=np.intp, count=len(titles))
+
+    def bounds(self, title):
+        """``(start, stop)`` of ``title``'s run in ``order``; ``(0, 0)`` if unknown."""
+        i = self._positions.get(title)
+        if i is None:
+            return 0, 0
+        return self.offsets[i], self.offsets[i + 1]
+
+    def rows(self, title):
+        """Positional indices (into the dataset frame) of ``title``'s rows, in file order."""
+        start, stop = self.bounds(title)
+        return self.order[start:stop]
+
+    def count(self, title):
+        start, stop = self.bounds(title)
+        return int(stop - start)
+
+    def frame_for(self, title, columns=None):
+        """``title``'s rows of the dataset frame (optionally only ``columns``)."""
+        subset = self.frame.take(self.rows(title))
+        return subset if columns is None else subset[columns]
+
+
+def get_title_partition(dataset):
+    """Return the title partition for ``dataset``, built once per dataset version."""
+    return dataset.derived("title_partition", lambda ds: TitlePartition(ds.frame),
+                           extend=lambda partition, ds, start: partition.extended(ds.frame, start))
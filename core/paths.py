@@ -0,0 +1,4 @@
+"""Repository paths, kept free of heavy imports so any page can use them cheaply."""
+import os
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,198 @@
+"""Per-title sorted salary arrays for percentile and summary lookups.
+
+The "Your Percentile" metric used to compare the prediction against a freshly
+filtered salary Series and recompute mean/min/max on every rerun. Here every
+title's ``salary_usd`` values are sorted once per dataset version into one
+concatenated array (CSR-style ``offsets`` per title), with count, mean, min
+and max precomputed. A percentile is a ``np.searchsorted`` on the title's
+block, and whole batches of predictions are ranked at once. Appended rows are
+merged into their title's sorted block with one ``np.searchsorted`` per title.
+
+With ``SALARY_STATS=sketch`` the same queries are answered from one KLL
+sketch per title instead (see ``core.sketches``), in memory that does not grow
+with the number of postings; percentiles and histograms are then estimates.
+"""
+import numpy as np
+import pandas as pd
+
+from core.partition import TITLE_COLUMN, get_title_partition
+from core.sketches import DEFAULT_K, SKETCH_STATS, group_sketches, merge_sketches
+
+SALARY_COLUMN = "salary_usd"
+
+
+class SalaryDistribution:
+    """Sorted salaries and summary statistics per job title."""
+
+    def __init__(self, partition, column=SALARY_COLUMN):
+        self.column = column
+        salaries = partition.frame[column].to_numpy(dtype=np.float64)
+        first = partition.offsets[0]
+        group = np.repeat(np.arange(len(partition.keys)), np.diff(partition.offsets))
+        values = salaries[partition.order[first:]]
+        keep = ~np.isnan(values)
+        group, values = group[keep], values[keep]
+        order = np.lexsort((values, group))
+        self._assign(partition.keys, values[order], np.bincount(group, minlength=len(partition.keys)))
+
+    def _assign(self, keys, values, counts, sums=None):
+        self.values = values
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.counts = counts
+        self.keys = keys
+        self._positions = {key: i for i, key in enumerate(self.keys)}
+
+        nonempty = counts > 0
+        starts, stops = self.offsets[:-1], self.offsets[1:]
+        if sums is None:
+            sums = np.zeros(len(counts))
+            sums[nonempty] = np.add.reduceat(self.values, starts[nonempty])
+        self.sums = sums
+        self.means = np.divide(self.sums, counts, out=np.full(len(counts), np.nan), where=nonempty)
+        if not len(self.values):
+            # No salaries at all (an empty frame, or every value NaN): nothing to index into
+            self.mins = self.maxs = np.full(len(counts), np.nan)
+            return
+        self.mins = np.where(nonempty, self.values[np.minimum(starts, len(self.values) - 1)], np.nan)
+        self.maxs = np.where(nonempty, self.values[np.maximum(stops - 1, 0)], np.nan)
+
+    def extended(self, partition, start):
+        """The distribution over ``partition``, given that this one covers its rows before ``start``."""
+        codes = partition.codes(start)
+        values = partition.frame[self.column].iloc[start:].to_numpy(dtype=np.float64)
+        keep = (codes >= 0) & ~np.isnan(values)
+        codes, values = codes[keep], values[keep]
+        order = np.lexsort((values, codes))
+        codes, values = codes[order], values[order]
+
+        # This distribution's blocks, laid out in the (possibly longer) new key list
+        remap = partition.positions(self.keys)
+        counts = np.zeros(len(partition.keys), dtype=np.int64)
+        counts[remap] = self.counts
+        sums = np.zeros(len(partition.keys))
+        sums[remap] = self.sums
+        starts = np.concatenate([[0], np.cumsum(counts)])[:-1]
+        at = np.empty(len(values), dtype=np.intp)
+        for code in np.unique(codes):
+            rows = slice(*np.searchsorted(codes, [code, code + 1]))
+            at[rows] = starts[code] + np.searchsorted(self.salaries(partition.keys[code]), values[rows])
+        counts += np.bincount(codes, minlength=len(partition.keys))
+        sums += np.bincount(codes, weights=values, minlength=len(partition.keys))
+
+        distribution = SalaryDistribution.__new__(SalaryDistribution)
+        distribution.column = self.column
+        distribution._assign(partition.keys, np.insert(self.values, at, values), counts, sums)
+        return distribution
+
+    def _block(self, title):
+        i = self._positions.get(title)
+        if i is None:
+            return None, self.values[:0]
+        return i, self.values[self.offsets[i]:self.offsets[i + 1]]
+
+    def salaries(self, title):
+        """``title``'s salaries in ascending order (a read-only view)."""
+        return self._block(title)[1]
+
+    def stats(self, title):
+        """``{"count", "mean", "min", "max"}`` for ``title``, or ``None`` if it has no salaries."""
+        i = self._positions.get(title)
+        if i is None or not self.counts[i]:
+            return None
+        return {"count": int(self.counts[i]), "mean": self.means[i], "min": self.mins[i], "max": self.maxs[i]}
+
+    def percentile(self, title, salary):
+        """Share of ``title``'s postings paying less than ``salary``, in percent (NaN if none)."""
+        block = self.salaries(title)
+        if not len(block):
+            return np.nan
+        return np.searchsorted(block, salary, side="left") / len(block) * 100
+
+    def histogram(self, title, bins=20):
+        """``(counts, edges)`` of ``title``'s salaries in ``bins`` equal-width bins."""
+        return np.histogram(self.salaries(title), bins=bins)
+
+    def percentiles(self, titles, salaries):
+        """Vectorized :meth:`percentile` for aligned arrays of titles and salaries."""
+        titles = np.asarray(titles, dtype=object)
+        salaries = np.asarray(salaries, dtype=np.float64)
+        result = np.full(len(salaries), np.nan)
+        for title in set(titles.tolist()):
+            block = self.salaries(title)
+            if len(block):
+                rows = titles == title
+                result[rows] = np.searchsorted(block, salaries[rows], side="left") / len(block) * 100
+        return result
+
+
+class SalarySketches:
+    """Per-title salary sketches answering :class:`SalaryDistribution`'s queries approximately.
+
+    Count, mean, min and max are exact; percentile ranks and histograms are
+    estimates. There is no ``salaries()``: the individual values are not kept.
+    """
+
+    def __init__(self, frame, column=SALARY_COLUMN, title_column=TITLE_COLUMN, k=DEFAULT_K):
+        self.column = column
+        self.title_column = title_column
+        self.k = k
+        codes, keys = pd.factorize(frame[title_column], sort=True)
+        salaries = frame[column].to_numpy(dtype=np.float64)
+        self.sketches = dict(zip(keys.tolist(), group_sketches(salaries, codes, len(keys), k)))
+
+    def extended(self, frame, start):
+        """The sketches of ``frame``, given that these cover its rows before ``start``."""
+        delta = SalarySketches(frame.iloc[start:], self.column, self.title_column, self.k)
+        sketches = SalarySketches.__new__(SalarySketches)
+        sketches.column, sketches.title_column, sketches.k = self.column, self.title_column, self.k
+        sketches.sketches = merge_sketches(self.sketches, delta.sketches)
+        return sketches
+
+    @property
+    def keys(self):
+        return sorted(self.sketches)
+
+    def stats(self, title):
+        """``{"count", "mean", "min", "max"}`` for ``title``, or ``None`` if it has no salaries."""
+        sketch = self.sketches.get(title)
+        if sketch is None or not sketch.count:
+            return None
+        return {"count": sketch.count, "mean": sketch.mean, "min": sketch.min, "max": sketch.max}
+
+    def percentile(self, title, salary):
+        """Estimated share of ``title``'s postings paying less than ``salary``, in percent (NaN if none)."""
+        sketch = self.sketches.get(title)
+        if sketch is None or not sketch.count:
+            return np.nan
+        return sketch.rank(salary) * 100
+
+    def histogram(self, title, bins=20):
+        """Estimated ``(counts, edges)`` of ``title``'s salaries in ``bins`` equal-width bins."""
+        sketch = self.sketches.get(title)
+        if sketch is None:
+            return np.zeros(bins, dtype=np.int64), np.linspace(0, 1, bins + 1)
+        return sketch.histogram(bins)
+
+    def percentiles(self, titles, salaries):
+        """Vectorized :meth:`percentile` for aligned arrays of titles and salaries."""
+        titles = np.asarray(titles, dtype=object)
+        salaries = np.asarray(salaries, dtype=np.float64)
+        result = np.full(len(salaries), np.nan)
+        for title in set(titles.tolist()):
+            sketch = self.sketches.get(title)
+            if sketch is not None and sketch.count:
+                rows = titles == title
+                result[rows] = sketch.rank(salaries[rows]) * 100
+        return result
+
+
+def get_salary_distribution(dataset):
+    """Return the per-title salary distribution for ``dataset``, built once per version.
+
+    A :class:`SalarySketches` when the app runs with ``SALARY_STATS=sketch``.
+    """
+    if SKETCH_STATS:
+        return dataset.derived("salary_distribution", lambda ds: SalarySketches(ds.frame),
+                               extend=lambda sketches, ds, start: sketches.extended(ds.frame, start))
+    return dataset.derived("salary_distribution", lambda ds: SalaryDistribution(get_title_partition(ds)),
+                           extend=lambda dist, ds, start: dist.extended(get_title_partition(ds), start))
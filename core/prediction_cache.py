@@ -0,0 +1,111 @@
+"""Bounded LRU cache of salary predictions, shared by every session in the process.
+
+Page 3's input space is small and repetitive, so most clicks ask for a profile
+that has already been predicted. Entries are keyed on the normalized seven
+feature values; the cache remembers which model version filled it and empties
+itself the first time it sees a different version, so a hot-swapped model
+never serves stale predictions.
+"""
+import threading
+from collections import OrderedDict
+
+from core.encoding import predict_salaries
+
+DEFAULT_MAXSIZE = 4096
+
+
+def normalize_profile(values):
+    """Canonical cache key for one profile given in ``FEATURE_COLUMNS`` order."""
+    return tuple(v.strip() if isinstance(v, str) else v for v in values)
+
+
+class PredictionCache:
+    """Thread-safe LRU mapping of profile -> predicted salary for one model version."""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, version, key):
+        """Return the cached salary for ``key`` under ``version``, or ``None``."""
+        with self._lock:
+            if version != self.version:
+                self._invalidate(version)
+            salary = self._entries.get(key)
+            if salary is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return salary
+
+    def put(self, version, key, salary):
+        with self._lock:
+            if version != self.version:
+                self._invalidate(version)
+            self._entries[key] = salary
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _invalidate(self, version):
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+        self.version = version
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Counters for monitoring: hits, misses, evictions, size and hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "model_version": self.version,
+            }
+
+
+_cache = PredictionCache()
+
+
+def get_prediction_cache():
+    """Return the process-wide :class:`PredictionCache`."""
+    return _cache
+
+
+def predict_salary(bundle, *values, cache=None, predict=None):
+    """Predict one profile's annual salary in USD, answering repeats from the cache.
+
+    ``predict(bundle, encoded)`` computes a miss, e.g.
+    :func:`core.inference_pool.predict_encoded`; by default the bundle's model
+    predicts in the calling thread.
+    """
+    if cache is None:
+        cache = _cache
+    key = normalize_profile(values)
+    salary = cache.get(bundle.version, key)
+    if salary is None:
+        encoded = bundle.encoder.encode_row(*key)
+        salaries = predict(bundle, encoded) if predict is not None else predict_salaries(bundle.model, encoded)
+        salary = float(salaries[0])
+        cache.put(bundle.version, key, salary)
+    return salary
@@ -0,0 +1,374 @@
+"""Headless salary-prediction HTTP service with dynamic micro-batching.
+
+Serves the same model and encoders as the prediction page (through the
+process-wide registry, so a swapped model is picked up without a restart)
+over a small JSON API, using nothing but ``asyncio``::
+
+    python -m core.service --port 8502 --max-batch 256 --max-wait-ms 2
+
+    POST /predict        {"job_title": ..., "experience_level": "SE", ...}
+    POST /predict/batch  {"profiles": [{...}, {...}]}
+    GET  /stats          batch-size and latency statistics
+    GET  /health
+
+Concurrent ``/predict`` requests are queued and coalesced: the batcher takes
+whatever arrived within ``max_wait`` of the first request (up to
+``max_batch``) and predicts it with one ``model.predict`` call off the event
+loop, so under load many requests share each call. Profiles already in the
+shared prediction cache are answered without queuing. The registry's file
+check (and any reload it triggers) also runs off the event loop, at most once
+every ``model_check`` seconds. Coded features accept
+dataset codes ("SE") or the app's labels ("Senior Level").
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import deque
+
+import numpy as np
+
+from core.encoding import FEATURE_COLUMNS, NUMERIC_COLUMNS, predict_salaries
+from core.labels import to_code
+from core.model_registry import get_model
+from core.prediction_cache import get_prediction_cache, normalize_profile
+
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_WAIT = 0.002
+# Seconds between checks of the model files for a new version
+DEFAULT_MODEL_CHECK = 1.0
+MAX_BODY_BYTES = 8 * 1024 * 1024
+LATENCY_WINDOW = 10_000
+
+
+class BadRequest(ValueError):
+    """A request the client has to fix; answered with HTTP 400."""
+
+
+class HTTPError(Exception):
+    """A request rejected before routing (bad framing, oversized body), with its status code."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_profile(data):
+    """Validate one JSON profile and return its feature values, dataset-coded, in ``FEATURE_COLUMNS`` order."""
+    if not isinstance(data, dict):
+        raise BadRequest("A profile must be a JSON object")
+    missing = [col for col in FEATURE_COLUMNS if col not in data]
+    if missing:
+        raise BadRequest(f"Profile is missing: {', '.join(missing)}")
+    values = []
+    for col in FEATURE_COLUMNS:
+        value = data[col]
+        if col in NUMERIC_COLUMNS:
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                raise BadRequest(f"{col} must be a number") from None
+        else:
+            value = to_code(col, str(value))
+        values.append(value)
+    return normalize_profile(values)
+
+
+def predict_profiles(bundle, profiles):
+    """One ``model.predict`` for a list of parsed profiles; returns salaries in USD."""
+    columns = {col: [profile[j] for profile in profiles] for j, col in enumerate(FEATURE_COLUMNS)}
+    return predict_salaries(bundle.model, bundle.encoder.encode(columns))
+
+
+class BatchStats:
+    """Batch sizes and request latencies (enqueue to result) of the micro-batcher."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.requests = 0
+        self.batches = 0
+        self.max_batch_size = 0
+        self.size_histogram = {}
+        self.predict_seconds = 0.0
+        self.latencies = deque(maxlen=window)
+
+    def record_batch(self, size, predict_seconds, latencies):
+        self.requests += size
+        self.batches += 1
+        self.max_batch_size = max(self.max_batch_size, size)
+        # Power-of-two buckets: "1", "2-3", "4-7", ...
+        low = 1 << (size.bit_length() - 1)
+        bucket = str(low) if low == 1 else f"{low}-{2 * low - 1}"
+        self.size_histogram[bucket] = self.size_histogram.get(bucket, 0) + 1
+        self.predict_seconds += predict_seconds
+        self.latencies.extend(latencies)
+
+    def snapshot(self):
+        ordered = sorted(self.latencies)
+
+        def percentile(q):
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)] * 1000, 3)
+
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "batch_size_histogram": dict(sorted(self.size_histogram.items(), key=lambda item: int(item[0].split("-")[0]))),
+            "predict_ms_total": round(self.predict_seconds * 1000, 3),
+            "latency_ms": {"p50": percentile(0.50), "p95": percentile(0.95), "p99": percentile(0.99),
+                           "max": round(ordered[-1] * 1000, 3) if ordered else None},
+        }
+
+
+class MicroBatcher:
+    """Coalesces concurrent single predictions into batched ``model.predict`` calls."""
+
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, max_wait=DEFAULT_MAX_WAIT, model_provider=get_model, cache=None,
+                 model_check=DEFAULT_MODEL_CHECK):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.model_provider = model_provider
+        self.model_check = model_check
+        self.cache = get_prediction_cache() if cache is None else cache
+        self.stats = BatchStats()
+        self._queue = None
+        self._worker = None
+        self._bundle = None
+        self._checked_at = 0.0
+        self._checking = None
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+    async def model(self):
+        """The current model bundle.
+
+        ``model_provider`` stats the artifact files and may load a new version,
+        so it runs in the executor, at most every ``model_check`` seconds, and
+        concurrent callers share one check.
+        """
+        loop = asyncio.get_running_loop()
+        if self._bundle is not None and loop.time() - self._checked_at < self.model_check:
+            return self._bundle
+        if self._checking is None:
+            self._checking = loop.run_in_executor(None, self.model_provider)
+        checking = self._checking
+        try:
+            bundle = await checking
+        finally:
+            if self._checking is checking:
+                self._checking = None
+        self._bundle, self._checked_at = bundle, loop.time()
+        return bundle
+
+    async def predict(self, profile):
+        """Salary for one parsed profile, from the cache or the next batch."""
+        bundle = await self.model()
+        salary = self.cache.get(bundle.version, profile)
+        if salary is not None:
+            return salary, bundle.version
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((profile, future, time.perf_counter()))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0 and self._queue.empty():
+                    break
+                try:
+                    batch.append(self._queue.get_nowait() if timeout <= 0 else
+                                 await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._predict_batch(batch)
+
+    async def _predict_batch(self, batch):
+        profiles = [profile for profile, _, _ in batch]
+        try:
+            bundle = await self.model()
+            start = time.perf_counter()
+            # Off the event loop, so requests keep being accepted while the model runs
+            salaries = await asyncio.get_running_loop().run_in_executor(None, predict_profiles, bundle, profiles)
+            done = time.perf_counter()
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (profile, future, queued_at), salary in zip(batch, salaries.tolist()):
+            self.cache.put(bundle.version, profile, salary)
+            if not future.done():
+                future.set_result((salary, bundle.version))
+        self.stats.record_batch(len(batch), done - start, [done - queued_at for _, _, queued_at in batch])
+
+
+class PredictionService:
+    """The HTTP front end: request parsing, routing and JSON responses."""
+
+    def __init__(self, batcher=None):
+        self.batcher = batcher or MicroBatcher()
+        self.started_at = time.time()
+        self._server = None
+        self._connections = set()
+
+    async def start(self, host="127.0.0.1", port=8502):
+        await self.batcher.start()
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            # Idle keep-alive connections would otherwise hold wait_closed() open
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+        await self.batcher.stop()
+
+    async def _handle(self, reader, writer):
+        self._connections.add(writer)
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                if isinstance(body, HTTPError):
+                    status, payload = body.status, {"error": str(body)}
+                else:
+                    status, payload = await self._route(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self._respond(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            return None
+        headers = {}
+        while True:
+            header = await reader.readline()
+            if header in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = header.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        # The body can't be skipped without a valid length, so errors here close the connection
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            return method, target, {"connection": "close"}, HTTPError(400, "Invalid Content-Length header")
+        if length > MAX_BODY_BYTES:
+            return method, target, {"connection": "close"}, HTTPError(413, f"Request body over {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method, target.split("?", 1)[0], headers, body
+
+    async def _route(self, method, path, body):
+        try:
+            if path == "/predict" and method == "POST":
+                salary, version = await self.batcher.predict(parse_profile(_json(body)))
+                return 200, {"predicted_salary_usd": round(salary, 2), "model_version": version}
+            if path == "/predict/batch" and method == "POST":
+                bundle = await self.batcher.model()
+                # Parsing and predicting a large client batch would stall every other request
+                return 200, await asyncio.get_running_loop().run_in_executor(None, self._predict_batch, bundle, body)
+            if path == "/stats" and method == "GET":
+                return 200, {"batching": self.batcher.stats.snapshot(),
+                             "max_batch": self.batcher.max_batch,
+                             "max_wait_ms": self.batcher.max_wait * 1000,
+                             "prediction_cache": self.batcher.cache.stats()}
+            if path == "/health" and method == "GET":
+                return 200, {"status": "ok", "model_version": (await self.batcher.model()).version,
+                             "uptime_s": round(time.time() - self.started_at, 1)}
+            if path in ("/predict", "/predict/batch", "/stats", "/health"):
+                return 405, {"error": f"{method} not allowed on {path}"}
+            return 404, {"error": f"Unknown path {path}"}
+        except BadRequest as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    @staticmethod
+    def _predict_batch(bundle, body):
+        # A client batch is already one predict call; it doesn't go through the coalescing queue
+        data = _json(body)
+        profiles = data.get("profiles") if isinstance(data, dict) else data
+        if not isinstance(profiles, list):
+            raise BadRequest('Expected {"profiles": [...]} or a JSON array of profiles')
+        parsed = [parse_profile(profile) for profile in profiles]
+        salaries = predict_profiles(bundle, parsed) if parsed else np.empty(0)
+        return {"predictions": np.round(salaries, 2).tolist(), "model_version": bundle.version}
+
+    @staticmethod
+    def _respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                  413: "Payload Too Large", 500: "Internal Server Error"}[status]
+        head = (f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+
+
+def _json(body):
+    try:
+        return json.loads(body or b"null")
+    except ValueError:
+        raise BadRequest("Request body is not valid JSON") from None
+
+
+async def serve(host, port, max_batch=DEFAULT_MAX_BATCH, max_wait=DEFAULT_MAX_WAIT):
+    get_model()  # load and warm up before accepting requests
+    service = PredictionService(MicroBatcher(max_batch, max_wait))
+    host, port = await service.start(host, port)
+    print(f"Serving salary predictions on http://{host}:{port} (max batch {max_batch}, max wait {max_wait * 1000:g} ms)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve salary predictions over HTTP with micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="largest coalesced batch (default: %(default)s)")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT * 1000,
+                        help="how long a batch waits for more requests after the first (default: %(default)s)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_batch, args.max_wait_ms / 1000))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
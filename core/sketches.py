@@ -0,0 +1,183 @@
+"""Mergeable quantile sketches (KLL) for salary medians, percentile ranks and histograms.
+
+The exact statistics keep every salary: per-title sorted arrays for percentile
+ranks, and a full group-by for the Insights medians. A KLL sketch keeps at most
+about ``3 * k`` values per group whatever the group's size, answers ranks and
+quantiles with a rank error that shrinks as ``1 / k`` (within about 1% of the
+count at the default ``k = 200``), and two sketches merge into one with the
+same guarantee. Sketches of disjoint partitions of the data (chunks of a file,
+delta files, worker processes) can therefore be built separately and merged.
+
+The app uses them when started with ``SALARY_STATS=sketch`` (``SKETCH_K`` sets
+``k``); counts, sums, means, minimums and maximums stay exact in both modes.
+"""
+import math
+import os
+
+import numpy as np
+
+SKETCH_STATS = os.environ.get("SALARY_STATS", "exact").lower() == "sketch"
+DEFAULT_K = int(os.environ.get("SKETCH_K", 200))
+# Shrink factor of the level capacities below the top one
+CAPACITY_DECAY = 2 / 3
+MIN_CAPACITY = 8
+
+
+class KLLSketch:
+    """Quantile sketch over a stream of floats (Karnin, Lang & Liberty, 2016).
+
+    Values enter level 0. When a level outgrows its capacity it is sorted and
+    every other value (odd or even positions, at random) moves one level up
+    with twice the weight, so a level-``h`` value stands for ``2**h`` inputs.
+    Count, sum, min and max are tracked exactly.
+    """
+
+    def __init__(self, k=DEFAULT_K, seed=None):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._seed = seed
+        self._rng = None
+        self._sorted = None
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(MIN_CAPACITY, int(math.ceil(self.k * CAPACITY_DECAY ** depth)))
+
+    def update(self, values):
+        """Add an array (or any iterable) of values; NaNs are ignored. Returns ``self``."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        self.count += len(values)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold ``other`` into this sketch (``other`` is left unchanged). Returns ``self``."""
+        if not other.count:
+            return self
+        self.levels.extend(np.empty(0) for _ in range(len(other.levels) - len(self.levels)))
+        for level, values in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], values])
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def copy(self):
+        sketch = KLLSketch(self.k)
+        sketch.levels = list(self.levels)
+        sketch.count, sketch.sum, sketch.min, sketch.max = self.count, self.sum, self.min, self.max
+        # A seed of its own, derived deterministically, so copies don't share a random stream
+        sketch._seed = ((self._seed or 0) * 1_000_003 + self.count) % (1 << 63)
+        return sketch
+
+    def _compress(self):
+        self._sorted = None
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                if self._rng is None:
+                    # Created on the first compaction: most small groups never need one
+                    self._rng = np.random.default_rng(self._seed)
+                values = np.sort(self.levels[level])
+                # An odd value out stays behind, so the level's weight is preserved exactly
+                keep, values = values[len(values) - len(values) % 2:], values[:len(values) - len(values) % 2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], values[self._rng.integers(2)::2]])
+            level += 1
+
+    def _weighted(self):
+        """Retained values in ascending order and their cumulative weights."""
+        if self._sorted is None:
+            values = np.concatenate(self.levels)
+            weights = np.concatenate([np.full(len(v), 1 << level, dtype=np.int64) for level, v in enumerate(self.levels)])
+            order = np.argsort(values, kind="stable")
+            self._sorted = values[order], np.cumsum(weights[order])
+        return self._sorted
+
+    @property
+    def size(self):
+        """Number of values retained."""
+        return sum(len(values) for values in self.levels)
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else math.nan
+
+    def rank(self, x):
+        """Estimated share of the values strictly below ``x`` (a scalar or an array), in ``[0, 1]``."""
+        if not self.count:
+            return np.full(np.shape(x), np.nan) if np.ndim(x) else math.nan
+        values, cumulative = self._weighted()
+        below = np.searchsorted(values, x, side="left")
+        weight = np.where(below > 0, cumulative[np.maximum(below - 1, 0)], 0)
+        return weight / self.count
+
+    def quantile(self, q):
+        """Estimated ``q`` quantile (``q`` a scalar or an array in ``[0, 1]``).
+
+        Exact at 0 and 1, and for sketches that hold fewer than ``k`` values.
+        """
+        if not self.count:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else math.nan
+        q = np.asarray(q, dtype=np.float64)
+        if len(self.levels) == 1:
+            # Nothing compacted yet: every value is here, so interpolate like np.median
+            result = np.quantile(self.levels[0], np.clip(q, 0, 1))
+            return float(result) if result.ndim == 0 else result
+        values, cumulative = self._weighted()
+        index = np.minimum(np.searchsorted(cumulative, q * self.count, side="left"), len(values) - 1)
+        result = np.where(q <= 0, self.min, np.where(q >= 1, self.max, values[index]))
+        return float(result) if result.ndim == 0 else result
+
+    def histogram(self, bins=20, range=None):
+        """Estimated ``(counts, edges)`` for ``bins`` equal-width bins, like ``np.histogram``."""
+        lo, hi = range if range is not None else (self.min, self.max)
+        edges = np.linspace(lo, hi, bins + 1)
+        if not self.count:
+            return np.zeros(bins, dtype=np.int64), edges
+        cumulative = self.rank(edges) * self.count
+        # The last bin is closed on the right, as in np.histogram
+        cumulative[-1] = self.count if hi >= self.max else self.rank(np.nextafter(hi, math.inf)) * self.count
+        return np.round(np.diff(cumulative)).astype(np.int64), edges
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return f"KLLSketch(k={self.k}, count={self.count}, retained={self.size})"
+
+
+def group_sketches(values, codes, n_groups, k=DEFAULT_K):
+    """One sketch per group: ``values[codes == i]`` for ``i`` in ``range(n_groups)`` (code -1 is skipped)."""
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.asarray(codes)
+    if n_groups < 1 << 15:
+        # numpy radix-sorts 16-bit integers
+        codes = codes.astype(np.int16)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(n_groups + 1))
+    sorted_values = values[order]
+    return [KLLSketch(k, seed=i).update(sorted_values[bounds[i]:bounds[i + 1]]) for i in range(n_groups)]
+
+
+def merge_sketches(sketches, updates):
+    """``{key: sketch}`` with ``updates`` merged in; the input sketches are not modified."""
+    merged = dict(sketches)
+    for key, sketch in updates.items():
+        merged[key] = merged[key].copy().merge(sketch) if key in merged else sketch
+    return merged
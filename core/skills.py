@@ -0,0 +1,101 @@
+"""Sparse job x skill index over the ``required_skills`` column.
+
+Both pages used to split and explode the skill strings on every rerun, and
+with different delimiters (", " on the Insights page, "," + strip on the
+prediction page), so their counts could disagree. The index parses the column
+once per dataset version into an interned vocabulary plus a CSR matrix
+(``indptr``/``indices``, one row per posting). Skill counts for any set of
+postings are then a ``np.bincount`` over that subset's column indices.
+Appended postings add rows to the matrix and new skills to the end of the
+vocabulary.
+"""
+import numpy as np
+import pandas as pd
+
+SKILLS_COLUMN = "required_skills"
+SKILL_DELIMITER = ","
+
+
+class SkillIndex:
+    """Interned skill vocabulary and CSR posting x skill matrix."""
+
+    def __init__(self, vocabulary, indptr, indices, total=None):
+        self.vocabulary = vocabulary
+        self.indptr = indptr
+        self.indices = indices
+        self._total = np.bincount(indices, minlength=len(vocabulary)) if total is None else total
+
+    @classmethod
+    def from_series(cls, skills):
+        """Parse comma-separated skill strings (one per posting) into an index."""
+        lists = skills.fillna("").astype(str).str.split(SKILL_DELIMITER)
+        exploded = lists.explode().str.strip()
+        rows = np.repeat(np.arange(len(skills)), lists.str.len().to_numpy())
+        keep = (exploded != "").to_numpy()
+        codes, vocabulary = pd.factorize(exploded[keep])
+        indptr = np.zeros(len(skills) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows[keep], minlength=len(skills)), out=indptr[1:])
+        return cls(np.asarray(vocabulary, dtype=object), indptr, codes.astype(np.int32))
+
+    def extended(self, skills):
+        """This index with the postings in ``skills`` appended as new rows."""
+        delta = SkillIndex.from_series(skills)
+        lookup = {skill: i for i, skill in enumerate(self.vocabulary.tolist())}
+        added = [skill for skill in delta.vocabulary.tolist() if skill not in lookup]
+        lookup.update((skill, len(self.vocabulary) + i) for i, skill in enumerate(added))
+        remap = np.array([lookup[skill] for skill in delta.vocabulary.tolist()], dtype=np.int32)
+        vocabulary = np.concatenate([self.vocabulary, np.asarray(added, dtype=object)])
+        total = np.concatenate([self._total, np.zeros(len(added), dtype=self._total.dtype)])
+        total[remap] += delta.counts()
+        return SkillIndex(
+            vocabulary,
+            np.concatenate([self.indptr, self.indptr[-1] + delta.indptr[1:]]),
+            np.concatenate([self.indices, remap[delta.indices]]),
+            total,
+        )
+
+    @property
+    def n_rows(self):
+        return len(self.indptr) - 1
+
+    def _columns(self, rows):
+        """Skill indices of the postings in ``rows`` (a slice or positional index array)."""
+        if isinstance(rows, slice):
+            start, stop, step = rows.indices(self.n_rows)
+            if step == 1:
+                return self.indices[self.indptr[start]:self.indptr[max(start, stop)]]
+            rows = np.arange(start, stop, step)
+        rows = np.asarray(rows)
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        if not lengths.sum():
+            return self.indices[:0]
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return self.indices[offsets + np.arange(lengths.sum())]
+
+    def counts(self, rows=None):
+        """Number of postings per skill (aligned with ``vocabulary``), optionally over ``rows``."""
+        if rows is None:
+            return self._total
+        return np.bincount(self._columns(rows), minlength=len(self.vocabulary))
+
+    def top(self, n=10, rows=None):
+        """The ``n`` most requested skills as a Series of counts indexed by skill name.
+
+        Ranked the way ``value_counts`` on the exploded skills ranks them
+        (counts in order of first appearance within ``rows``, then
+        ``sort_values``), so ties come out in the same order.
+        """
+        columns = self.indices if rows is None else self._columns(rows)
+        counts = np.bincount(columns, minlength=len(self.vocabulary))
+        seen, positions = np.unique(columns, return_index=True)
+        appearance = seen[np.argsort(positions)]
+        order = pd.Series(counts[appearance], index=appearance).sort_values(ascending=False).index.to_numpy()[:n]
+        order = order[counts[order] > 0]
+        return pd.Series(counts[order], index=pd.Index(self.vocabulary[order], name="skill"), name="count")
+
+
+def get_skill_index(dataset):
+    """Return the skill index for ``dataset``, built once per dataset version."""
+    return dataset.derived("skill_index", lambda ds: SkillIndex.from_series(ds.frame[SKILLS_COLUMN]),
+                           extend=lambda index, ds, start: index.extended(ds.frame[SKILLS_COLUMN].iloc[start:]))
@@ -0,0 +1,49 @@
+"""What-if sweeps: predict a whole grid of profile variations in one model call.
+
+Moving the years slider or flipping the experience level one click at a time
+costs a full rerun and a single-row predict per step. A sweep varies one or
+two features of a base profile over every requested value, encodes the whole
+cartesian grid into one matrix and predicts it with one ``model.predict``, so
+a 31 x N grid costs about the same as a single prediction.
+"""
+import numpy as np
+import pandas as pd
+
+from core.encoding import FEATURE_COLUMNS, predict_salaries
+
+YEARS_RANGE = list(range(0, 31))
+
+
+def build_grid(base_profile, dimensions):
+    """Return ``{column: values}`` for every combination of ``dimensions`` over ``base_profile``."""
+    if not 1 <= len(dimensions) <= 2:
+        raise ValueError("A sweep varies one or two features")
+    unknown = [col for col in list(base_profile) + list(dimensions) if col not in FEATURE_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown feature(s): {', '.join(unknown)}")
+
+    axes = np.meshgrid(*[np.asarray(values, dtype=object) for values in dimensions.values()], indexing="ij")
+    n_rows = axes[0].size
+    grid = {col: np.full(n_rows, base_profile.get(col), dtype=object) for col in FEATURE_COLUMNS}
+    for col, axis in zip(dimensions, axes):
+        grid[col] = axis.ravel()
+    return grid
+
+
+def sweep(bundle, base_profile, dimensions, predict=None):
+    """Predict ``base_profile`` across every combination of ``dimensions``.
+
+    ``base_profile`` maps feature names to dataset codes (e.g. ``"SE"``, not
+    ``"Senior Level"``); ``dimensions`` maps one or two of those features to
+    the values to try, e.g. ``{"years_experience": range(31),
+    "experience_level": ["EN", "MI", "SE", "EX"]}``. Returns one row per
+    combination with the varied columns and ``predicted_salary_usd``.
+    ``predict(bundle, encoded)``, e.g. :func:`core.inference_pool.predict_encoded`,
+    replaces the in-process model call.
+    """
+    grid = build_grid(base_profile, dimensions)
+    encoded = bundle.encoder.encode(grid)
+    salaries = predict(bundle, encoded) if predict else predict_salaries(bundle.model, encoded)
+    result = pd.DataFrame({col: grid[col] for col in dimensions}).infer_objects()
+    result["predicted_salary_usd"] = salaries
+    return result
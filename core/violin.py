@@ -0,0 +1,135 @@
+"""Summarized violin plots with server-side density estimation.
+
+``px.violin(df, points="all")`` ships every row's salary to the browser and
+lets plotly.js estimate the densities there, so the payload and the client
+render time grow with the dataset. The summary computes, once per dataset
+version, a binned Gaussian KDE curve and the quartiles for each group, plus a
+capped, stratified sample of points. The figure is drawn from those alone, so
+its size is set by ``grid_points`` and the ``max_points`` budget the page
+passes in, not by the row count.
+"""
+import math
+
+import numpy as np
+import plotly.graph_objects as go
+
+GRID_POINTS = 128
+# Default payload budget: the most raw points sent to the browser across all
+# groups. Each group keeps at least MIN_POINTS_PER_GROUP (or an even share of
+# the budget when there are too many groups for that) plus a share of the rest
+# in proportion to its size. Together with GRID_POINTS this bounds the
+# figure's JSON size.
+MAX_POINTS = 1500
+MIN_POINTS_PER_GROUP = 30
+HISTOGRAM_BINS = 1024
+
+
+def binned_kde(values, grid_points=GRID_POINTS, bins=HISTOGRAM_BINS):
+    """Gaussian KDE of ``values`` evaluated on an even grid.
+
+    The bandwidth follows Silverman's rule of thumb, as plotly.js does for its
+    own violins, so the curves match what ``px.violin`` would draw. Values are
+    histogrammed first and the histogram is convolved with the kernel, so the
+    cost is O(n + bins) instead of O(n * grid).
+    """
+    lo, hi = float(values.min()), float(values.max())
+    q1, q3 = np.percentile(values, [25, 75])
+    spread = min(values.std(), (q3 - q1) / 1.349) or values.std()
+    bandwidth = 1.059 * spread * len(values) ** (-1 / 5) if len(values) > 1 else 0.0
+    if hi == lo or bandwidth == 0:
+        return np.array([lo, hi]), np.array([1.0, 1.0])
+    lo, hi = lo - 3 * bandwidth, hi + 3 * bandwidth
+    counts, edges = np.histogram(values, bins=bins, range=(lo, hi))
+    step = edges[1] - edges[0]
+    # The padded range spans at least 6 bandwidths, so half the bins still
+    # covers 3 of them; longer kernels would make np.convolve grow the output.
+    half_width = min((bins - 1) // 2, int(math.ceil(4 * bandwidth / step)))
+    offsets = np.arange(-half_width, half_width + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    density = np.convolve(counts, kernel, mode="same") / (len(values) * bandwidth * math.sqrt(2 * math.pi))
+    centers = (edges[:-1] + edges[1:]) / 2
+    grid = np.linspace(lo, hi, grid_points)
+    return grid, np.interp(grid, centers, density)
+
+
+class ViolinSummary:
+    """Per-group KDE curves, box statistics and a stratified point sample."""
+
+    def __init__(self, frame, group_col, value_col, grid_points=GRID_POINTS,
+                 max_points=MAX_POINTS, min_points=MIN_POINTS_PER_GROUP, seed=0):
+        data = frame[[group_col, value_col]].dropna()
+        groups = data[group_col].to_numpy()
+        values = data[value_col].to_numpy(dtype=np.float64)
+        rng = np.random.default_rng(seed)
+        # Keep plotly's category order: order of first appearance.
+        self.groups = list(dict.fromkeys(groups.tolist()))
+        total = len(values)
+        # Every group gets the minimum (clamped so the minimums alone fit the budget),
+        # and the rest of the budget is shared in proportion to the group sizes
+        min_points = min(min_points, max_points // max(len(self.groups), 1))
+        spare = max_points - min_points * len(self.groups)
+        self.curves = {}
+        for group in self.groups:
+            group_values = values[groups == group]
+            grid, density = binned_kde(group_values, grid_points)
+            q1, median, q3 = np.percentile(group_values, [25, 50, 75])
+            share = min_points + math.floor(spare * len(group_values) / total)
+            sample = rng.choice(group_values, size=min(share, len(group_values)), replace=False)
+            self.curves[group] = {
+                "grid": grid,
+                "density": density,
+                "q1": q1,
+                "median": median,
+                "q3": q3,
+                "min": group_values.min(),
+                "max": group_values.max(),
+                "count": len(group_values),
+                "sample": sample,
+            }
+
+    def figure(self, rate=1.0, colors=None, labels=None, width=0.4, seed=0):
+        """Violin figure with values multiplied by ``rate`` (e.g. a currency conversion)."""
+        colors = colors or [None]
+        labels = labels or {}
+        rng = np.random.default_rng(seed)
+        fig = go.Figure()
+        for i, group in enumerate(self.groups):
+            curve = self.curves[group]
+            color = colors[i % len(colors)]
+            half = curve["density"] / curve["density"].max() * width
+            y = curve["grid"] * rate
+            fig.add_trace(go.Scatter(
+                x=np.concatenate([i - half, (i + half)[::-1]]),
+                y=np.concatenate([y, y[::-1]]),
+                fill="toself", mode="lines", line=dict(color=color, width=1),
+                name=str(group), legendgroup=str(group), hoverinfo="skip",
+            ))
+            fig.add_trace(go.Box(
+                x=[i], q1=[curve["q1"] * rate], median=[curve["median"] * rate], q3=[curve["q3"] * rate],
+                lowerfence=[curve["min"] * rate], upperfence=[curve["max"] * rate],
+                width=width / 4, marker_color=color, line=dict(color=color), fillcolor="rgba(255,255,255,0.6)",
+                name=str(group), legendgroup=str(group), showlegend=False, boxpoints=False,
+            ))
+            sample = curve["sample"]
+            fig.add_trace(go.Scatter(
+                x=i - width - 0.1 + rng.uniform(-0.05, 0.05, len(sample)), y=sample * rate,
+                mode="markers", marker=dict(color=color, size=3, opacity=0.5),
+                name=str(group), legendgroup=str(group), showlegend=False,
+                hovertemplate=f"{group}<br>%{{y:,.0f}}<extra>sample of {curve['count']:,}</extra>",
+            ))
+        fig.update_layout(
+            xaxis=dict(tickmode="array", tickvals=list(range(len(self.groups))),
+                       ticktext=[str(g) for g in self.groups], title=labels.get("x")),
+            yaxis=dict(title=labels.get("y")),
+            legend=dict(title=labels.get("x")),
+        )
+        return fig
+
+
+def get_violin_summary(dataset, group_col="experience_level", value_col="salary_usd",
+                       grid_points=GRID_POINTS, max_points=MAX_POINTS, min_points=MIN_POINTS_PER_GROUP):
+    """Return the violin summary for ``dataset``, built once per dataset version and budget."""
+    return dataset.derived(
+        ("violin", group_col, value_col, grid_points, max_points, min_points),
+        lambda ds: ViolinSummary(ds.frame, group_col, value_col, grid_points, max_points, min_points),
+    )
@@ -1,6 +1,8 @@
 import os
 import streamlit as st
 
+from core.images import responsive_image
+
 # --- PAGE CONFIG ---
 <<<<<<< HEAD
 st.set_page_config(page_title="🔍 About Us | Future of Jobs Dashboard", page_icon="👥", layout="wide")
@@ -10,7 +12,7 @@ st.set_page_config(page_title="About Us | Future of Jobs Dashboard", page_icon="
 
 # -------------------- TOP BANNER --------------------
 st.image(
-    "images/aboutUs.jpg",  
+    responsive_image("images/aboutUs.jpg"),  
     use_container_width=True  # spans the full width of the page/container
 )
 
@@ -78,7 +80,7 @@ for member in team_members:
     st.markdown("---")
     col1, col2 = st.columns([1, 3])
     with col1:
-        st.image(member["image"], width=200)
+        st.image(responsive_image(member["image"], 200), width=200)
     with col2:
         st.markdown(f"### {member['name']}")
         st.markdown(f"**{member['role']}**")
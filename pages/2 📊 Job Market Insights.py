@@ -1,11 +1,26 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 
+from core.aggregates import get_salary_cube
+from core.dataset import get_dataset
+from core.figure_cache import cached_figure
+from core.metrics import span
+from core.partition import get_title_partition
+from core.skills import get_skill_index
+from core.violin import get_violin_summary
+
 st.set_page_config(page_title="📊 Job Market Insights | Future of Jobs Dashboard", page_icon="📈", layout="wide")
 
+# Most salary points the violin plot sends to the browser, across all experience levels
+VIOLIN_MAX_POINTS = 1500
+
 # ---------------- Load Data ---------------- #
-df = pd.read_csv("ai_job_dataset.csv")
+# Shared, read-only frame: parsed once per server process, not once per rerun.
+with span("insights", "load_data"):
+    dataset = get_dataset()
+    df = dataset.frame
+    # Group-by results computed once per dataset version; currency is a rescale of these.
+    cube = get_salary_cube(dataset)
 
 # ---------------- Page Title & Description ---------------- #
 st.title("📊 Job Market Insights Dashboard")
@@ -28,8 +43,6 @@ currency_type = st.radio(
 )
 conversion_rates = {"USD": 1, "MYR": 4.5}
 conversion_rate = conversion_rates[currency_type]
-if "salary_usd" in df.columns:
-    df["converted_salary"] = df["salary_usd"] * conversion_rate
 
 # ---------------- Tabs for EDA ---------------- #
 tab1, tab2, tab3, tab4, tab5 = st.tabs([
@@ -41,7 +54,7 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
 ])
 
 # ---------------- Tab 1: Employee Count & Top Skills ---------------- #
-with tab1:
+with tab1, span("insights", "employee_count_skills"):
     st.subheader("💡 Employee Count by Country & Top Skills")
 
     # ---------------- Filter by Job Title ---------------- #
@@ -49,9 +62,10 @@ with tab1:
     job_options = ["All"] + sorted(df["job_title"].unique())
     selected_job = st.selectbox("", job_options, index=0, key="job_filter")
 
-    df_filtered = df if selected_job == "All" else df[df["job_title"] == selected_job]
+    job_rows = None if selected_job == "All" else get_title_partition(dataset).rows(selected_job)
+    job_filter = None if selected_job == "All" else ("job_title", selected_job)
 
-    st.info(f"Displaying insights for: **{selected_job}**. Total records: {len(df_filtered)}")
+    st.info(f"Displaying insights for: **{selected_job}**. Total records: {cube.count(where=job_filter)}")
 
     col_map, col_skills = st.columns([3, 1])
 
@@ -59,26 +73,30 @@ with tab1:
     with col_map:
         st.markdown("#### ⚙️ Map of Employee Residence")
 
-        country_counts = df_filtered.groupby("employee_residence").size().reset_index(name="count")
-        map_fig = px.choropleth(
-            country_counts,
-            locations="employee_residence",
-            locationmode="country names",
-            color="count",
-            color_continuous_scale=["#FFFFFF", "#FFC0CB", "#B22222"],
-            hover_name="employee_residence",
-            hover_data={"count": True},
-        )
-        map_fig.update_layout(
-            geo=dict(
-                showframe=True,
-                showcoastlines=True,
-                projection_type="natural earth",
-                bgcolor="rgba(0,0,0,0)"
-            ),
-            margin=dict(l=0, r=0, t=0, b=0),
-            coloraxis_colorbar=dict(title="Number of People")
-        )
+        def build_map_figure():
+            country_counts = cube.stats(("employee_residence",), where=job_filter)[["employee_residence", "count"]]
+            map_fig = px.choropleth(
+                country_counts,
+                locations="employee_residence",
+                locationmode="country names",
+                color="count",
+                color_continuous_scale=["#FFFFFF", "#FFC0CB", "#B22222"],
+                hover_name="employee_residence",
+                hover_data={"count": True},
+            )
+            map_fig.update_layout(
+                geo=dict(
+                    showframe=True,
+                    showcoastlines=True,
+                    projection_type="natural earth",
+                    bgcolor="rgba(0,0,0,0)"
+                ),
+                margin=dict(l=0, r=0, t=0, b=0),
+                coloraxis_colorbar=dict(title="Number of People")
+            )
+            return map_fig
+
+        map_fig = cached_figure("insights.map", build_map_figure, dataset=dataset, job=selected_job)
         st.plotly_chart(map_fig, width='stretch')
 
         st.write(
@@ -92,9 +110,9 @@ with tab1:
     with col_skills:
         st.markdown("#### 🧠 Top 10 Skills")
 
-        if "required_skills" in df_filtered.columns and len(df_filtered) > 0:
-            skills_series = df_filtered["required_skills"].dropna().str.split(", ").explode()
-            top_skills = skills_series.value_counts().head(10).reset_index()
+        if "required_skills" in df.columns and cube.count(where=job_filter) > 0:
+            # Sparse column sum over the selected postings, from the shared skill index
+            top_skills = get_skill_index(dataset).top(10, rows=job_rows).reset_index()
             top_skills.columns = ["Skill", "Count"]
 
             for idx, row in top_skills.iterrows():
@@ -103,35 +121,41 @@ with tab1:
             st.info("No skill data available for this selection.")
 
 # ---------------- Tab 2: Job Distribution by Industry ---------------- #
-with tab2:
+with tab2, span("insights", "industry"):
     st.subheader("🏭 Job Distribution by Industry")
 
     col_chart, col_text_table = st.columns([3, 2])
 
     # ---------------- Radar Chart ---------------- #
     with col_chart:
-        industry_counts = df["industry"].value_counts().reset_index()
+        # Ties (equal counts) are ordered by name, so the chart order doesn't depend on the sort algorithm
+        industry_counts = cube.stats(("industry",))[["industry", "count"]].sort_values(
+            ["count", "industry"], ascending=[False, True], kind="stable")
         industry_counts.columns = ["Industry", "Count"]
 
         if not industry_counts.empty:
-            fig_industry = px.line_polar(
-                industry_counts,
-                r="Count",
-                theta="Industry",
-                line_close=True,
-                template="plotly_dark",
-                color_discrete_sequence=["#B22222"]
-            )
-            fig_industry.update_traces(
-                fill='toself',
-                fillcolor='rgba(255, 76, 76, 0.3)',
-                line=dict(color='#FF1A1A', width=3)
-            )
-            fig_industry.update_layout(
-                height=600,
-                width=800,
-                margin=dict(l=20, r=20, t=20, b=20)
-            )
+            def build_industry_figure():
+                fig_industry = px.line_polar(
+                    industry_counts,
+                    r="Count",
+                    theta="Industry",
+                    line_close=True,
+                    template="plotly_dark",
+                    color_discrete_sequence=["#B22222"]
+                )
+                fig_industry.update_traces(
+                    fill='toself',
+                    fillcolor='rgba(255, 76, 76, 0.3)',
+                    line=dict(color='#FF1A1A', width=3)
+                )
+                fig_industry.update_layout(
+                    height=600,
+                    width=800,
+                    margin=dict(l=20, r=20, t=20, b=20)
+                )
+                return fig_industry
+
+            fig_industry = cached_figure("insights.industry", build_industry_figure, dataset=dataset)
             st.plotly_chart(fig_industry, width='stretch')
 
             st.write(
@@ -144,24 +168,25 @@ with tab2:
             st.warning("⚠️ No industry data available for this selection.")
 
 # ---------------- Tab 3: Salary Distribution by Experience Level ---------------- #
-with tab3:
+with tab3, span("insights", "experience_salary"):
     st.subheader("📊 Salary Distribution by Experience Level")
 
     if "experience_level" in df.columns:
-        violin_fig = px.violin(
-            df,
-            x="experience_level",
-            y="converted_salary",
-            box=True,
-            points="all",
-            color="experience_level",
-            color_discrete_sequence=px.colors.qualitative.Set2,
-            labels={"experience_level": "Experience Level", "converted_salary": f"Salary ({currency_type})"}
+        # KDE curves, quartiles and a capped point sample computed server-side, so the
+        # figure sent to the browser stays the same size however many rows there are
+        violin_fig = cached_figure(
+            "insights.violin",
+            lambda: get_violin_summary(dataset, max_points=VIOLIN_MAX_POINTS).figure(
+                rate=conversion_rate,
+                colors=px.colors.qualitative.Set2,
+                labels={"x": "Experience Level", "y": f"Salary ({currency_type})"}
+            ),
+            dataset=dataset, currency=currency_type, max_points=VIOLIN_MAX_POINTS
         )
         st.plotly_chart(violin_fig, width='stretch')
 
         # --- Enhanced Explanation with Statistics --- #
-        exp_stats = df.groupby("experience_level")['converted_salary'].agg(['count','mean','median','min','max']).reset_index()
+        exp_stats = cube.stats(("experience_level",), conversion_rate)[['experience_level','count','mean','median','min','max']]
         st.markdown("<b>Statistics by Experience Level:</b>", unsafe_allow_html=True)
         st.dataframe(exp_stats)
         st.markdown(
@@ -188,18 +213,22 @@ with tab3:
         st.warning("Experience level data is not available.")
 
 # ---------------- Tab 4: Average Salary by Company Size ---------------- #
-with tab4:
+with tab4, span("insights", "company_size_salary"):
     st.subheader("💰 Average Salary by Company Size")
 
     if "company_size" in df.columns:
-        company_salary = df.groupby("company_size")["converted_salary"].mean().reset_index()
-        bar_fig = px.bar(
-            company_salary,
-            x="company_size",
-            y="converted_salary",
-            color="converted_salary",
-            color_continuous_scale="Blues",
-            labels={"company_size": "Company Size", "converted_salary": f"Average Salary ({currency_type})"}
+        company_salary = cube.stats(("company_size",), conversion_rate)[["company_size", "mean"]].rename(columns={"mean": "converted_salary"})
+        bar_fig = cached_figure(
+            "insights.company_size",
+            lambda: px.bar(
+                company_salary,
+                x="company_size",
+                y="converted_salary",
+                color="converted_salary",
+                color_continuous_scale="Blues",
+                labels={"company_size": "Company Size", "converted_salary": f"Average Salary ({currency_type})"}
+            ),
+            dataset=dataset, currency=currency_type
         )
         st.plotly_chart(bar_fig, width='stretch')
         # --- Enhanced Explanation with Statistics --- #
@@ -224,25 +253,31 @@ with tab4:
         st.warning("Company size data is not available.")
 
 # ---------------- Tab 5: Salary by Years of Experience & Education ---------------- #
-with tab5:
+with tab5, span("insights", "years_education_salary"):
     st.subheader("📚 Salary by Years of Experience & Education")
 
     if "years_experience" in df.columns and "education_required" in df.columns:
-        heatmap_data = df.groupby(["years_experience", "education_required"])["converted_salary"].mean().reset_index()
-        heatmap_pivot = heatmap_data.pivot(index="education_required", columns="years_experience", values="converted_salary")
-
-        heatmap_fig = px.imshow(
-            heatmap_pivot,
-            color_continuous_scale="Turbo",  # Use a distinct color scale
-            labels={"x": "Years of Experience", "y": "Education Level", "color": f"Average Salary ({currency_type})"},
-            text_auto=True  # Annotate each cell with salary values
-        )
-        heatmap_fig.update_layout(
-            title="Average Salary by Years of Experience & Education",
-            xaxis_title="Years of Experience",
-            yaxis_title="Education Level",
-            coloraxis_colorbar=dict(title=f"Average Salary ({currency_type})")
-        )
+        heatmap_data = cube.stats(("years_experience", "education_required"), conversion_rate)
+        heatmap_data = heatmap_data[["years_experience", "education_required", "mean"]].rename(columns={"mean": "converted_salary"})
+
+        def build_heatmap_figure():
+            heatmap_pivot = heatmap_data.pivot(index="education_required", columns="years_experience", values="converted_salary")
+
+            heatmap_fig = px.imshow(
+                heatmap_pivot,
+                color_continuous_scale="Turbo",  # Use a distinct color scale
+                labels={"x": "Years of Experience", "y": "Education Level", "color": f"Average Salary ({currency_type})"},
+                text_auto=True  # Annotate each cell with salary values
+            )
+            heatmap_fig.update_layout(
+                title="Average Salary by Years of Experience & Education",
+                xaxis_title="Years of Experience",
+                yaxis_title="Education Level",
+                coloraxis_colorbar=dict(title=f"Average Salary ({currency_type})")
+            )
+            return heatmap_fig
+
+        heatmap_fig = cached_figure("insights.heatmap", build_heatmap_figure, dataset=dataset, currency=currency_type)
         st.plotly_chart(heatmap_fig, width='stretch')
 
         # Add paragraph explanation
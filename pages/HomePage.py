@@ -1,6 +1,8 @@
 import streamlit as st
 from streamlit_lottie import st_lottie
-import requests
+
+from core.images import responsive_image
+from core.lottie import load_lottie_animations
 
 # -------------------- PAGE CONFIG --------------------
 st.set_page_config(
@@ -10,16 +12,6 @@ st.set_page_config(
 )
 
 # -------------------- HELPER FUNCTIONS --------------------
-def load_lottieurl(url: str):
-    """Safely load a Lottie animation from a given URL."""
-    try:
-        r = requests.get(url)
-        if r.status_code != 200:
-            return None
-        return r.json()
-    except Exception:
-        return None
-
 def clickable_card(title, description, lottie_url, page_path, key):
     """Create a styled clickable card with optional animation and navigation."""
     card_style = """
@@ -46,15 +38,18 @@ def clickable_card(title, description, lottie_url, page_path, key):
     st.markdown("</div>", unsafe_allow_html=True)
 
 # -------------------- LOAD LOTTIE ANIMATIONS --------------------
-lottie_ai = load_lottieurl("https://assets9.lottiefiles.com/packages/lf20_0yfsb3a1.json")
-lottie_salary = load_lottieurl("https://assets2.lottiefiles.com/packages/lf20_t24tpvcu.json")
-lottie_job = load_lottieurl("https://assets2.lottiefiles.com/packages/lf20_pprxh53t.json")
-lottie_about = load_lottieurl("https://assets9.lottiefiles.com/packages/lf20_u4yrau.json")
+# Served from the local cache (or the bundled copies); stale ones are revalidated in the background
+lottie = load_lottie_animations()
+lottie_ai = lottie["ai"]
+lottie_salary = lottie["salary"]
+lottie_job = lottie["job"]
+lottie_about = lottie["about"]
 lottie_cert = lottie_about  # Move animation from About Us to Cert Recommendations
 
 # -------------------- TOP BANNER --------------------
+# The file is banner.PNG: the old "banner.png" only resolved on case-insensitive filesystems
 st.image(
-    "images/banner.png",  # path to your local banner image
+    responsive_image("images/banner.PNG"),  # banner resized to the page width (cached)
     use_container_width=True
 )
 
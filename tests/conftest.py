@@ -0,0 +1,48 @@
+"""Synthetic postings in the dataset's format, for the index equivalence tests."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.dataset import append_rows, prepare_frame
+
+TITLES = ["AI Architect", "Data Scientist", "ML Engineer", "NLP Engineer", "Research Scientist"]
+SKILLS = ["Python", "SQL", "PyTorch", "TensorFlow", "AWS", "Docker", "NLP", "Spark", "R", "Tableau"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark"]
+
+
+def make_postings(n, seed=0, titles=TITLES, start_id=0):
+    """``n`` postings with repeated salaries (ties), a few missing values and skill lists."""
+    rng = np.random.default_rng(seed)
+    salary = rng.integers(40, 260, n) * 1000.0
+    salary[rng.random(n) < 0.03] = np.nan
+    title = rng.choice(np.asarray(titles, dtype=object), n)
+    title[rng.random(n) < 0.02] = None
+    company = rng.choice(np.asarray(COMPANIES, dtype=object), n)
+    company[rng.random(n) < 0.05] = None
+    skills = [", ".join(rng.choice(SKILLS, rng.integers(1, 6), replace=False)) for _ in range(n)]
+    return pd.DataFrame({
+        "job_id": [f"AI{start_id + i:05d}" for i in range(n)],
+        "job_title": title,
+        "salary_usd": salary,
+        "company_name": company,
+        "company_location": rng.choice(["United States", "Germany", "India"], n),
+        "company_size": rng.choice(["S", "M", "L"], n),
+        "required_skills": skills,
+    })
+
+
+@pytest.fixture()
+def postings():
+    return prepare_frame(make_postings(600))
+
+
+@pytest.fixture()
+def appended():
+    """``(base, whole)``: a frame and the same frame with delta rows (and a new title) appended."""
+    base = prepare_frame(make_postings(600))
+    delta = prepare_frame(make_postings(80, seed=1, titles=TITLES[1:] + ["Head of AI"], start_id=600))
+    return base, append_rows(base, delta)
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: takes seconds (e.g. fresh interpreters); deselect with -m 'not slow'")
@@ -0,0 +1,42 @@
+"""CompanySalaryIndex against the page's original boolean-mask windows and ``nlargest``."""
+import numpy as np
+
+from core.companies import COMPANY_COLUMNS, CompanySalaryIndex
+from core.partition import TitlePartition
+
+PREDICTIONS = [35_000, 80_000, 120_000, 150_000, 200_000, 240_000]
+
+
+def baseline(frame, title, predicted_salary):
+    """The section's original filtering, returning ``(row labels, lower, upper)``."""
+    job_companies = frame[frame["job_title"] == title][COMPANY_COLUMNS].dropna()
+    lower_bound, upper_bound = predicted_salary * 1.05, predicted_salary * 1.30
+    window = (job_companies["salary_usd"] >= lower_bound) & (job_companies["salary_usd"] <= upper_bound)
+    if window.sum() < 5:
+        lower_bound, upper_bound = predicted_salary * 1.00, predicted_salary * 1.50
+        window = (job_companies["salary_usd"] >= lower_bound) & (job_companies["salary_usd"] <= upper_bound)
+    top = job_companies[window].nlargest(10, "salary_usd")
+    return top.index.to_numpy(), lower_bound, upper_bound
+
+
+def assert_matches_baseline(index, frame):
+    for title in frame["job_title"].dropna().unique().tolist() + ["Not A Title"]:
+        for salary in PREDICTIONS:
+            rows, lower, upper = index.target_companies(title, salary)
+            expected_rows, expected_lower, expected_upper = baseline(frame, title, salary)
+            np.testing.assert_array_equal(rows, expected_rows, err_msg=f"{title} @ {salary}")
+            assert (lower, upper) == (expected_lower, expected_upper)
+
+
+def test_windows_match_boolean_masks(postings):
+    assert_matches_baseline(CompanySalaryIndex(TitlePartition(postings)), postings)
+
+
+def test_extension_matches_a_fresh_build(appended):
+    base, whole = appended
+    partition = TitlePartition(base)
+    extended = CompanySalaryIndex(partition).extended(partition.extended(whole, len(base)), len(base))
+    fresh = CompanySalaryIndex(TitlePartition(whole))
+    np.testing.assert_array_equal(extended.rows, fresh.rows)
+    np.testing.assert_array_equal(extended.offsets, fresh.offsets)
+    assert_matches_baseline(extended, whole)
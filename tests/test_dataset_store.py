@@ -0,0 +1,107 @@
+"""DatasetStore: incremental deltas, in-place edits and the version of the applied files."""
+import os
+
+import pandas as pd
+import pytest
+
+from core.dataset import DatasetStore, delta_dir
+
+
+def write_csv(path, ids, title="Data Scientist", salary=100_000):
+    pd.DataFrame({
+        "job_id": [f"AI{i:05d}" for i in ids],
+        "job_title": title,
+        "salary_usd": salary,
+        "required_skills": "Python, SQL",
+    }).to_csv(path, index=False)
+
+
+def write_delta(store, name, ids, **kwargs):
+    os.makedirs(store.delta_dir, exist_ok=True)
+    path = os.path.join(store.delta_dir, name)
+    existed = os.path.exists(path)
+    mtime = os.stat(path).st_mtime_ns if existed else 0
+    write_csv(path, ids, **kwargs)
+    if existed:
+        # A rewrite within the filesystem's timestamp resolution would otherwise look unchanged
+        os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+    return path
+
+
+@pytest.fixture()
+def store(tmp_path):
+    path = tmp_path / "jobs.csv"
+    write_csv(path, range(10))
+    assert delta_dir(str(path)).startswith(str(tmp_path))
+    return DatasetStore(str(path))
+
+
+def test_new_delta_is_appended(store):
+    base = store.get()
+    write_delta(store, "001.csv", range(8, 14))
+    updated = store.get()
+    assert len(updated) == 14
+    assert updated.version != base.version
+    assert store.get() is updated
+
+
+def test_delta_edited_in_place_is_picked_up(store):
+    write_delta(store, "001.csv", range(10, 12))
+    first = store.get()
+    write_delta(store, "001.csv", range(10, 12), salary=250_000)
+    edited = store.get()
+    assert edited is not first
+    assert edited.version != first.version
+    assert edited.frame["salary_usd"].iloc[-1] == 250_000
+
+
+def test_all_duplicate_delta_changes_the_version(store):
+    base = store.get()
+    write_delta(store, "001.csv", range(5))
+    duplicates = store.get()
+    assert len(duplicates) == len(base)
+    assert duplicates.frame is base.frame
+    assert duplicates.version != base.version
+
+
+def test_version_depends_only_on_the_files(store):
+    store.get()
+    write_delta(store, "001.csv", range(5))
+    store.get()
+    write_delta(store, "002.csv", range(10, 15))
+    incremental = store.get()
+    store.clear()
+    restarted = store.get()
+    assert restarted.version == incremental.version
+    pd.testing.assert_frame_equal(restarted.frame, incremental.frame)
+
+
+@pytest.mark.parametrize("content", [
+    "job_id,job_title\nAI00100,Data Scientist\n",                          # no salary_usd column
+    "job_id,job_title,salary_usd,required_skills\n,Data Scientist,1,SQL\n",  # row without a job_id
+    "job_id,job_title,salary_usd,required_skills\nAI00100,Data Scientist,lots,SQL\n",
+    "",
+])
+def test_malformed_delta_is_skipped(store, caplog, content):
+    base = store.get()
+    os.makedirs(store.delta_dir, exist_ok=True)
+    with open(os.path.join(store.delta_dir, "001.csv"), "w") as f:
+        f.write(content)
+    write_delta(store, "002.csv", range(10, 12))
+    with caplog.at_level("WARNING", logger="core.dataset"):
+        updated = store.get()
+    # The good delta is applied on top of the last good dataset; the bad one is logged
+    assert len(updated) == len(base) + 2
+    assert [r.getMessage().split(" in ")[0] for r in caplog.records] == ["Skipping delta 001.csv"]
+
+    # Not retried (or logged again) until the file changes
+    caplog.clear()
+    write_delta(store, "003.csv", range(12, 13))
+    with caplog.at_level("WARNING", logger="core.dataset"):
+        assert len(store.get()) == len(base) + 3
+    assert not caplog.records
+    write_delta(store, "001.csv", range(20, 25))
+    fixed = store.get()
+    assert len(fixed) == len(base) + 8
+    store.clear()
+    assert store.get().version == fixed.version
@@ -0,0 +1,65 @@
+"""CompiledEncoder against the prediction page's original ``encode_input``."""
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.encoding import FEATURE_COLUMNS, CompiledEncoder
+from core.model_registry import ENCODER_PATH, load_label_encoders
+
+
+@pytest.fixture(scope="module")
+def label_encoders():
+    return load_label_encoders(ENCODER_PATH)
+
+
+def legacy_encode_input(label_encoders, *values):
+    """The page's per-call encoder, as it was before ``CompiledEncoder``."""
+    from sklearn.preprocessing import LabelEncoder
+
+    input_data = pd.DataFrame({col: [value] for col, value in zip(FEATURE_COLUMNS, values)})
+    for col in input_data.columns:
+        if input_data[col].dtype == "object":
+            if col in label_encoders:
+                le = label_encoders[col]
+                input_data[col] = input_data[col].apply(lambda x: x if x in le.classes_ else le.classes_[0])
+                input_data[col] = le.transform(input_data[col])
+            else:
+                le = LabelEncoder()
+                input_data[col] = le.fit_transform(input_data[col])
+    return input_data.to_numpy(dtype=np.float64)
+
+
+def profiles(label_encoders):
+    """Known classes of every column (first, middle, last) plus values no encoder has seen."""
+    options = []
+    for col in FEATURE_COLUMNS:
+        if col == "years_experience":
+            options.append([0, 7, 19])
+            continue
+        classes = list(label_encoders[col].classes_) if col in label_encoders else []
+        picked = [classes[0], classes[len(classes) // 2], classes[-1]] if classes else []
+        options.append(picked + ["None", "Not A Real Value"])
+    # One axis varied at a time from a base profile, plus a few full combinations
+    base = [values[0] for values in options]
+    for j, values in enumerate(options):
+        for value in values:
+            yield tuple(base[:j] + [value] + base[j + 1:])
+    yield from itertools.islice(itertools.product(*options), 0, None, 499)
+
+
+def test_encode_row_matches_encode_input(label_encoders):
+    encoder = CompiledEncoder(label_encoders)
+    for profile in profiles(label_encoders):
+        np.testing.assert_array_equal(encoder.encode_row(*profile), legacy_encode_input(label_encoders, *profile),
+                                      err_msg=str(profile))
+
+
+def test_batch_encode_matches_encode_input(label_encoders):
+    encoder = CompiledEncoder(label_encoders)
+    rows = list(profiles(label_encoders))
+    columns = {col: [row[j] for row in rows] for j, col in enumerate(FEATURE_COLUMNS)}
+    expected = np.vstack([legacy_encode_input(label_encoders, *row) for row in rows])
+    np.testing.assert_array_equal(encoder.encode(columns), expected)
+    np.testing.assert_array_equal(encoder.encode(pd.DataFrame(columns)), expected)
@@ -0,0 +1,30 @@
+"""Cold-import times of the app's scripts against ``benchmarks.import_time.BUDGETS``."""
+import time
+
+import pytest
+
+from benchmarks.import_time import BUDGETS, by_package, profile
+
+REPEAT = 3
+ROUNDS = 3
+ROUND_PAUSE = 5.0
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("script", list(BUDGETS))
+def test_script_imports_within_budget(script):
+    # BUDGETS assume warm disk and bytecode caches, so the first run only warms them up
+    profile(script)
+    # The best of several fresh interpreters: other load on a shared CI runner only ever adds time,
+    # and the budget is for what the imports themselves cost. That load comes in bursts longer than
+    # one round, so a script over budget is measured again a little later before it fails
+    runs = []
+    for round_ in range(ROUNDS):
+        if round_:
+            time.sleep(ROUND_PAUSE)
+        runs += [profile(script) for _ in range(REPEAT)]
+        seconds, imports = min(runs, key=lambda run: run[0])
+        if seconds <= BUDGETS[script]:
+            break
+    heaviest = ", ".join(f"{package} {self_us / 1e3:.0f} ms" for package, self_us in by_package(imports)[:5])
+    assert seconds <= BUDGETS[script], f"{script} imports in {seconds:.3f}s (budget {BUDGETS[script]}s): {heaviest}"
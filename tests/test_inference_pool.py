@@ -0,0 +1,59 @@
+"""InferencePool workers: started without fork, predicting with the forkserver's preloaded model."""
+import os
+
+import numpy as np
+
+from core import inference_pool
+from core.encoding import predict_salaries
+from core.inference_pool import InferencePool, default_workers, get_inference_pool
+from core.model_registry import get_model
+from core.prediction_cache import PredictionCache, predict_salary
+
+PROFILES = [
+    ("Data Scientist", "SE", "FT", "United States", "L", "Master", 5),
+    ("AI Architect", "EX", "FT", "Germany", "M", "PhD", 12),
+    ("ML Engineer", "EN", "PT", "India", "S", "Bachelor", 0),
+]
+
+
+def test_pool_predicts_like_the_app_process():
+    bundle = get_model()
+    encoded = bundle.encoder.encode_row("Data Scientist", "SE", "FT", "United States", "L", "Master", 5)
+    pool = InferencePool(bundle, workers=1)
+    try:
+        pool.start()
+        np.testing.assert_allclose(pool.predict(encoded), predict_salaries(bundle.model, encoded))
+        pids = pool.pids()
+        assert len(pids) == 1
+        assert os.getpid() not in pids
+    finally:
+        pool.shutdown()
+
+
+def test_requests_through_the_pool_match_in_process_predictions(monkeypatch):
+    bundle = get_model()
+    monkeypatch.setattr(inference_pool, "DEFAULT_WORKERS", 2)
+    monkeypatch.setattr(inference_pool, "_pool", None)
+    try:
+        pooled = [inference_pool.predict_salary(bundle, *profile, cache=PredictionCache()) for profile in PROFILES]
+        pool = get_inference_pool(bundle)
+        assert pool is not None and pool.workers == 2
+        in_process = [predict_salary(bundle, *profile, cache=PredictionCache()) for profile in PROFILES]
+        np.testing.assert_allclose(pooled, in_process)
+        pids = pool.pids()
+        assert pids and os.getpid() not in pids
+        # The model was loaded once, in the forkserver; no worker loaded its own copy
+        assert sorted(pool.preloaded_pids()) == sorted(pids)
+    finally:
+        if inference_pool._pool is not None:
+            inference_pool._pool.shutdown()
+
+
+def test_default_pool_size(monkeypatch):
+    monkeypatch.setenv("INFERENCE_WORKERS", "3")
+    assert default_workers() == 3
+    monkeypatch.delenv("INFERENCE_WORKERS")
+    # One CPU stays with the app; a single-CPU machine predicts in process
+    for cpus, workers in ((1, 0), (2, 1), (4, 3), (16, inference_pool.MAX_DEFAULT_WORKERS)):
+        monkeypatch.setattr(os, "sched_getaffinity", lambda pid, cpus=cpus: set(range(cpus)), raising=False)
+        assert default_workers() == workers
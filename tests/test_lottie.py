@@ -0,0 +1,136 @@
+"""LottieLoader against a local http.server: ETag revalidation, timeouts and the bundled fallback."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.lottie import LOTTIE_URLS, LottieLoader
+
+ANIMATION = {"v": "5.5.7", "fr": 30, "layers": []}
+ETAG = '"anim-1"'
+SLOW_SECONDS = 1.0
+
+
+class Handler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        Handler.requests_seen.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/slow.json":
+            time.sleep(SLOW_SECONDS)
+        if self.path == "/missing.json":
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps(ANIMATION).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server():
+    Handler.requests_seen = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_loader(tmp_path, urls, **kwargs):
+    kwargs.setdefault("timeout", (1, 0.2))
+    return LottieLoader(urls, cache_dir=str(tmp_path / "cache"), bundled_dir=str(tmp_path / "bundled"), **kwargs)
+
+
+def wait_for(loader, name):
+    with loader._lock:
+        future = loader._refreshing[name]
+    return future.result(timeout=5)
+
+
+def test_etag_revalidation_costs_a_304(server, tmp_path):
+    loader = make_loader(tmp_path, {"ai": f"{server}/ai.json"})
+    assert loader.fetch("ai") == "updated"
+    assert loader.fetch("ai") == "not-modified"
+    assert Handler.requests_seen == [("/ai.json", None), ("/ai.json", ETAG)]
+    # A fresh loader (a restarted app) is served from the disk cache without a request
+    assert make_loader(tmp_path, {"ai": f"{server}/ai.json"}).load() == {"ai": ANIMATION}
+    assert len(Handler.requests_seen) == 2
+
+
+def test_missing_animation_is_fetched_in_the_background(server, tmp_path):
+    loader = make_loader(tmp_path, {"slow": f"{server}/slow.json"}, timeout=(1, 5))
+    start = time.perf_counter()
+    assert loader.load() == {"slow": None}
+    assert time.perf_counter() - start < SLOW_SECONDS / 2
+    assert wait_for(loader, "slow") == "updated"
+    assert loader.load() == {"slow": ANIMATION}
+
+
+def test_timeout_is_an_error_and_backs_off(server, tmp_path):
+    loader = make_loader(tmp_path, {"slow": f"{server}/slow.json"}, retry_after=60)
+    start = time.perf_counter()
+    assert loader.fetch("slow") == "error"
+    assert time.perf_counter() - start < SLOW_SECONDS
+    seen = len(Handler.requests_seen)
+    assert loader.load() == {"slow": None}
+    # Backing off: no new request was started
+    assert "slow" not in loader._refreshing
+    assert len(Handler.requests_seen) == seen
+
+
+def test_bundled_copy_is_the_fallback(server, tmp_path):
+    bundled = tmp_path / "bundled"
+    bundled.mkdir()
+    (bundled / "about.json").write_text(json.dumps(ANIMATION))
+    loader = make_loader(tmp_path, {"about": f"{server}/missing.json"})
+    start = time.perf_counter()
+    assert loader.load() == {"about": ANIMATION}
+    assert time.perf_counter() - start < SLOW_SECONDS / 2
+    # The bundled copy counts as stale, so it is revalidated in the background; a 404 keeps it
+    assert wait_for(loader, "about") == "error"
+    assert loader.load() == {"about": ANIMATION}
+
+
+class NoNetwork:
+    """Stands in for the ``requests.Session``: any fetch fails, as it would offline."""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        import requests
+
+        self.calls.append(url)
+        raise requests.ConnectionError(f"offline: {url}")
+
+
+def test_default_loader_has_every_animation_offline():
+    session = NoNetwork()
+    loader = LottieLoader(session=session)
+    start = time.perf_counter()
+    animations = loader.load()
+    assert time.perf_counter() - start < SLOW_SECONDS / 2
+    assert set(animations) == set(LOTTIE_URLS)
+    assert all(animation is not None and animation["layers"] for animation in animations.values())
+    # The copies shipped in assets/lottie cover every URL, whatever is in the disk cache
+    assert all(loader._read_bundled(name) is not None for name in LOTTIE_URLS)
+    # The background revalidation fails, and the page keeps its animations
+    for name in list(loader._refreshing):
+        assert wait_for(loader, name) == "error"
+    assert loader.load() == animations
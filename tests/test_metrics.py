@@ -0,0 +1,33 @@
+"""Spans record their section even when the page stops or fails inside it."""
+import pytest
+
+from core import metrics
+
+
+@pytest.fixture()
+def registry(monkeypatch):
+    registry = metrics.MetricsRegistry()
+    monkeypatch.setattr(metrics, "_registry", registry)
+    return registry
+
+
+class StopPage(Exception):
+    """Stands in for the exception ``st.stop()`` raises to end a script run."""
+
+
+def test_span_is_recorded_when_the_section_raises(registry):
+    with metrics.span("prediction", "inputs"):
+        pass
+    with pytest.raises(StopPage):
+        with metrics.span("prediction", "prediction"):
+            raise StopPage
+    snapshot = registry.snapshot()
+    assert snapshot["prediction.inputs"]["count"] == 1
+    assert snapshot["prediction.prediction"]["count"] == 1
+
+
+def test_disabled_metrics_record_nothing(monkeypatch):
+    monkeypatch.setattr(metrics, "_registry", None)
+    with metrics.span("prediction", "inputs") as span:
+        assert span is metrics._NOOP
+    assert metrics.get_metrics() is None
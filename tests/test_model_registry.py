@@ -0,0 +1,53 @@
+"""ModelRegistry: exported artifacts are used only while their pickle is unchanged."""
+import os
+import pickle
+import shutil
+
+import numpy as np
+import pytest
+
+from core.model_registry import ENCODER_PATH, MODEL_PATH, ModelRegistry, export_cbm, export_encoders
+
+ROW = np.array([[3, 2, 1, 5, 0, 2, 5]], dtype=np.float64)
+
+
+@pytest.fixture()
+def artifacts(tmp_path):
+    model_path, encoder_path = tmp_path / "salary_predictor.pkl", tmp_path / "label_encoders.pkl"
+    shutil.copyfile(MODEL_PATH, model_path)
+    shutil.copyfile(ENCODER_PATH, encoder_path)
+    return str(model_path), str(encoder_path)
+
+
+def test_fresh_exports_are_preferred(artifacts):
+    model_path, encoder_path = artifacts
+    cbm, classes = export_cbm(model_path, model_path[:-4] + ".cbm"), export_encoders(encoder_path, encoder_path[:-4] + ".json")
+    bundle = ModelRegistry(model_path, encoder_path).get()
+    assert (bundle.model_path, bundle.encoder_path) == (cbm, classes)
+
+
+def test_replaced_pickle_wins_over_a_stale_export(artifacts):
+    model_path, encoder_path = artifacts
+    export_cbm(model_path, model_path[:-4] + ".cbm")
+    registry = ModelRegistry(model_path, encoder_path)
+    first = registry.get()
+    assert first.model_path.endswith(".cbm")
+
+    # Hot-swap: a different model replaces the pickle; the .cbm is now stale
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+    model.set_scale_and_bias(2.0, model.get_scale_and_bias()[1])
+    with open(model_path + ".tmp", "wb") as f:
+        pickle.dump(model, f)
+    os.replace(model_path + ".tmp", model_path)
+
+    swapped = registry.get()
+    assert swapped.version != first.version
+    assert swapped.model_path == model_path
+    assert not np.allclose(swapped.model.predict(ROW), first.model.predict(ROW))
+
+
+def test_an_export_can_be_loaded_directly(artifacts, tmp_path):
+    model_path, encoder_path = artifacts
+    cbm = export_cbm(model_path, str(tmp_path / "only.cbm"))
+    assert ModelRegistry(cbm, encoder_path).get().model_path == cbm
@@ -0,0 +1,29 @@
+"""TitlePartition against the pages' original ``df[df["job_title"] == title]`` filters."""
+import numpy as np
+import pandas as pd
+
+from core.partition import TitlePartition
+
+
+def assert_matches_masks(partition, frame):
+    titles = frame["job_title"].dropna().unique().tolist()
+    assert partition.keys == sorted(titles)
+    for title in titles + ["Not A Title"]:
+        mask = frame["job_title"] == title
+        np.testing.assert_array_equal(partition.rows(title), np.flatnonzero(mask))
+        assert partition.count(title) == int(mask.sum())
+        pd.testing.assert_frame_equal(partition.frame_for(title, ["salary_usd"]), frame[mask][["salary_usd"]])
+
+
+def test_rows_match_boolean_masks(postings):
+    assert_matches_masks(TitlePartition(postings), postings)
+
+
+def test_extension_matches_a_fresh_build(appended):
+    base, whole = appended
+    extended = TitlePartition(base).extended(whole, len(base))
+    fresh = TitlePartition(whole)
+    assert extended.keys == fresh.keys
+    np.testing.assert_array_equal(extended.order, fresh.order)
+    np.testing.assert_array_equal(extended.offsets, fresh.offsets)
+    assert_matches_masks(extended, whole)
@@ -0,0 +1,56 @@
+"""SalaryDistribution against the prediction page's original per-rerun filtering."""
+import numpy as np
+import pytest
+
+from core.partition import TitlePartition
+from core.percentiles import SalaryDistribution
+
+PROBES = [0, 39_999, 40_000, 100_000, 150_500, 259_000, 300_000]
+
+
+def assert_matches_baseline(distribution, frame):
+    for title in frame["job_title"].dropna().unique().tolist() + ["Not A Title"]:
+        market = frame[frame["job_title"] == title]["salary_usd"].dropna()
+        stats = distribution.stats(title)
+        if market.empty:
+            assert stats is None
+            assert np.isnan(distribution.percentile(title, 100_000))
+            continue
+        assert stats["count"] == len(market)
+        assert stats["mean"] == pytest.approx(market.mean())
+        assert (stats["min"], stats["max"]) == (market.min(), market.max())
+        for salary in PROBES:
+            assert distribution.percentile(title, salary) == pytest.approx((market < salary).sum() / len(market) * 100)
+        np.testing.assert_array_equal(distribution.salaries(title), np.sort(market.to_numpy()))
+        counts, edges = distribution.histogram(title)
+        expected_counts, expected_edges = np.histogram(market.to_numpy(), bins=20)
+        np.testing.assert_array_equal(counts, expected_counts)
+        np.testing.assert_allclose(edges, expected_edges)
+
+
+def test_lookups_match_filtered_series(postings):
+    assert_matches_baseline(SalaryDistribution(TitlePartition(postings)), postings)
+
+
+def test_vectorized_percentiles(postings):
+    distribution = SalaryDistribution(TitlePartition(postings))
+    titles = np.array(["Data Scientist", "AI Architect", "Not A Title", "Data Scientist"], dtype=object)
+    salaries = np.array([90_000, 120_000, 100_000, 200_000])
+    expected = [distribution.percentile(t, s) for t, s in zip(titles, salaries)]
+    np.testing.assert_array_equal(distribution.percentiles(titles, salaries), expected)
+
+
+def test_extension_matches_a_fresh_build(appended):
+    base, whole = appended
+    extended = SalaryDistribution(TitlePartition(base)).extended(TitlePartition(base).extended(whole, len(base)), len(base))
+    fresh = SalaryDistribution(TitlePartition(whole))
+    np.testing.assert_array_equal(extended.values, fresh.values)
+    np.testing.assert_array_equal(extended.offsets, fresh.offsets)
+    assert_matches_baseline(extended, whole)
+
+
+def test_no_salaries_at_all(postings):
+    empty = postings.assign(salary_usd=np.nan)
+    distribution = SalaryDistribution(TitlePartition(empty))
+    assert distribution.stats("Data Scientist") is None
+    assert np.isnan(distribution.percentile("Data Scientist", 100_000))
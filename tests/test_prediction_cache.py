@@ -0,0 +1,66 @@
+"""PredictionCache: LRU eviction, invalidation on a new model version, and cached predictions."""
+import numpy as np
+
+from core.encoding import predict_salaries
+from core.model_registry import get_model
+from core.prediction_cache import PredictionCache, normalize_profile, predict_salary
+
+PROFILE = ("Data Scientist", "SE", "FT", "United States", "L", "Master", 5)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(maxsize=2)
+    cache.put("v1", "a", 1.0)
+    cache.put("v1", "b", 2.0)
+    assert cache.get("v1", "a") == 1.0  # "b" is now the least recently used
+    cache.put("v1", "c", 3.0)
+    assert cache.get("v1", "b") is None
+    assert (cache.get("v1", "a"), cache.get("v1", "c")) == (1.0, 3.0)
+    stats = cache.stats()
+    assert (stats["size"], stats["evictions"], stats["hits"], stats["misses"]) == (2, 1, 3, 1)
+
+
+def test_new_model_version_empties_the_cache():
+    cache = PredictionCache()
+    cache.put("v1", "a", 1.0)
+    assert cache.get("v2", "a") is None
+    assert len(cache) == 0
+    assert cache.stats()["invalidations"] == 1
+    cache.put("v2", "a", 2.0)
+    # Going back to the old version doesn't resurrect its entries
+    assert cache.get("v1", "a") is None
+
+
+def test_keys_ignore_surrounding_whitespace():
+    assert normalize_profile([" Data Scientist ", "SE", 5]) == normalize_profile(["Data Scientist", "SE", 5])
+
+
+class CountingModel:
+    def __init__(self, model):
+        self.model = model
+        self.calls = 0
+
+    def predict(self, encoded):
+        self.calls += 1
+        return self.model.predict(encoded)
+
+
+class Bundle:
+    def __init__(self, bundle, version):
+        self.model = CountingModel(bundle.model)
+        self.encoder = bundle.encoder
+        self.version = version
+
+
+def test_predict_salary_matches_the_model_and_predicts_once():
+    real = get_model()
+    bundle = Bundle(real, "v1")
+    cache = PredictionCache()
+    expected = float(predict_salaries(real.model, real.encoder.encode_row(*PROFILE))[0])
+    assert predict_salary(bundle, *PROFILE, cache=cache) == expected
+    assert predict_salary(bundle, *PROFILE, cache=cache) == expected
+    assert bundle.model.calls == 1
+
+    swapped = Bundle(real, "v2")
+    assert np.isclose(predict_salary(swapped, *PROFILE, cache=cache), expected)
+    assert swapped.model.calls == 1
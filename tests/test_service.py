@@ -0,0 +1,107 @@
+"""The prediction service on an ephemeral port: micro-batching and the error responses."""
+import asyncio
+import json
+
+import pytest
+
+from core.labels import to_code
+from core.prediction_cache import PredictionCache
+from core.service import MAX_BODY_BYTES, MicroBatcher, PredictionService
+
+PROFILE = {
+    "job_title": "Data Scientist",
+    "experience_level": "SE",
+    "employment_type": "FT",
+    "company_location": "United States",
+    "company_size": "L",
+    "education_required": "Master",
+    "years_experience": 5,
+}
+
+
+async def request(port, method, path, body=b"", headers=None):
+    """One HTTP/1.1 request on its own connection; returns ``(status, payload)``."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    headers = {"Content-Length": str(len(body)), "Connection": "close", **(headers or {})}
+    head = f"{method} {path} HTTP/1.1\r\nHost: test\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+    writer.write(head.encode("latin-1") + b"\r\n" + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    status_line, _, rest = response.partition(b"\r\n")
+    return int(status_line.split()[1]), json.loads(rest.partition(b"\r\n\r\n")[2])
+
+
+def run_service(test, **batcher_options):
+    async def main():
+        service = PredictionService(MicroBatcher(cache=PredictionCache(), **batcher_options))
+        _, port = await service.start(port=0)
+        try:
+            return await test(service, port)
+        finally:
+            await service.stop()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_are_coalesced():
+    async def test(service, port):
+        # Distinct profiles, so none is answered from the cache
+        profiles = [dict(PROFILE, years_experience=years) for years in range(32)]
+        responses = await asyncio.gather(*(request(port, "POST", "/predict", json.dumps(p).encode())
+                                           for p in profiles))
+        return responses, service.batcher.stats.snapshot()
+
+    responses, stats = run_service(test, max_wait=0.05)
+    assert [status for status, _ in responses] == [200] * 32
+    assert all(payload["predicted_salary_usd"] > 0 for _, payload in responses)
+    assert stats["requests"] == 32
+    assert stats["batches"] < 32
+    assert stats["max_batch_size"] > 1
+
+
+def test_batch_endpoint_matches_single_predictions():
+    async def test(service, port):
+        profiles = [dict(PROFILE, years_experience=years) for years in (1, 10)]
+        batch = await request(port, "POST", "/predict/batch", json.dumps({"profiles": profiles}).encode())
+        singles = [await request(port, "POST", "/predict", json.dumps(p).encode()) for p in profiles]
+        return batch, singles
+
+    (status, payload), singles = run_service(test)
+    assert status == 200
+    assert payload["predictions"] == [single["predicted_salary_usd"] for _, single in singles]
+
+
+@pytest.mark.parametrize("method, path, body, headers, expected", [
+    ("POST", "/predict", b"{not json", None, 400),
+    ("POST", "/predict", json.dumps({"job_title": "Data Scientist"}).encode(), None, 400),
+    ("POST", "/predict", json.dumps(dict(PROFILE, years_experience="five")).encode(), None, 400),
+    ("POST", "/predict/batch", json.dumps({"profiles": "none"}).encode(), None, 400),
+    ("POST", "/predict", b"", {"Content-Length": "abc"}, 400),
+    ("POST", "/predict", b"", {"Content-Length": "-1"}, 400),
+    ("POST", "/predict", b"", {"Content-Length": str(MAX_BODY_BYTES + 1)}, 413),
+    ("GET", "/nowhere", b"", None, 404),
+    ("GET", "/predict", b"", None, 405),
+])
+def test_error_responses(method, path, body, headers, expected):
+    async def test(service, port):
+        status, payload = await request(port, method, path, body, headers)
+        # The service is still up afterwards
+        health = await request(port, "GET", "/health")
+        return status, payload, health
+
+    status, payload, (health_status, _) = run_service(test)
+    assert status == expected
+    assert "error" in payload
+    assert health_status == 200
+
+
+def test_labels_and_codes_predict_the_same():
+    labelled = dict(PROFILE, experience_level="Senior Level")
+    assert to_code("experience_level", "Senior Level") == "SE"
+
+    async def test(service, port):
+        return [await request(port, "POST", "/predict", json.dumps(p).encode()) for p in (PROFILE, labelled)]
+
+    (_, coded), (_, named) = run_service(test)
+    assert coded["predicted_salary_usd"] == named["predicted_salary_usd"]
@@ -0,0 +1,105 @@
+"""KLLSketch rank and quantile errors against the exact sorted data."""
+import numpy as np
+import pytest
+
+from core.sketches import KLLSketch, group_sketches, merge_sketches
+
+N = 100_000
+SEEDS = range(3)
+
+
+def rank_error_bound(k):
+    # Observed maxima are ~2 / k over these streams and seeds; the module docstring promises ~1% at k=200
+    return 3 / k
+
+
+def streams():
+    rng = np.random.default_rng(0)
+    ascending = np.sort(rng.normal(size=N))
+    return {
+        "uniform": rng.uniform(0, 1, N),
+        # Salary-like: skewed, and rounded to the thousand, so heavily tied
+        "salaries": np.round(rng.lognormal(11.5, 0.5, N), -3),
+        "ascending": ascending,
+        "descending": ascending[::-1].copy(),
+    }
+
+
+STREAMS = streams()
+
+
+def sketched(values, k, seed, chunks=37):
+    sketch = KLLSketch(k, seed=seed)
+    for chunk in np.array_split(values, chunks):
+        sketch.update(chunk)
+    return sketch
+
+
+def merged(values, k, seed, parts=8):
+    sketches = [KLLSketch(k, seed=seed * 100 + i).update(part) for i, part in enumerate(np.array_split(values, parts))]
+    for sketch in sketches[1:]:
+        sketches[0].merge(sketch)
+    return sketches[0]
+
+
+def max_rank_error(sketch, values):
+    exact = np.sort(values)
+    probes = np.quantile(exact, np.linspace(0, 1, 201))
+    return np.abs(sketch.rank(probes) - np.searchsorted(exact, probes, side="left") / len(exact)).max()
+
+
+def max_quantile_error(sketch, values):
+    """How far the true rank of each estimated quantile is from ``q`` (any rank within a tie counts)."""
+    exact = np.sort(values)
+    q = np.linspace(0.01, 0.99, 99)
+    estimates = sketch.quantile(q)
+    low = np.searchsorted(exact, estimates, side="left") / len(exact)
+    high = np.searchsorted(exact, estimates, side="right") / len(exact)
+    return np.maximum(low - q, q - high).clip(min=0).max()
+
+
+@pytest.mark.parametrize("k", [50, 200])
+@pytest.mark.parametrize("name", list(STREAMS))
+@pytest.mark.parametrize("build", [sketched, merged])
+def test_rank_and_quantile_errors_within_bound(build, name, k):
+    values = STREAMS[name]
+    for seed in SEEDS:
+        sketch = build(values, k, seed)
+        assert max_rank_error(sketch, values) <= rank_error_bound(k), (name, seed)
+        assert max_quantile_error(sketch, values) <= rank_error_bound(k), (name, seed)
+        # Bounded memory, and the summary statistics stay exact
+        assert sketch.size <= 3 * k
+        assert (sketch.count, sketch.min, sketch.max) == (N, values.min(), values.max())
+        assert sketch.sum == pytest.approx(values.sum())
+
+
+def test_histogram_counts_within_bound():
+    values = STREAMS["salaries"]
+    sketch = sketched(values, 200, seed=0)
+    counts, edges = sketch.histogram(bins=20)
+    expected, expected_edges = np.histogram(values, bins=20)
+    np.testing.assert_allclose(edges, expected_edges)
+    assert counts.sum() == N
+    # Each bin count is a difference of two ranks
+    assert np.abs(counts - expected).max() <= 2 * rank_error_bound(200) * N
+
+
+def test_small_sketch_is_exact():
+    values = np.random.default_rng(1).normal(size=150)
+    sketch = KLLSketch(200).update(values)
+    q = np.linspace(0, 1, 11)
+    np.testing.assert_allclose(sketch.quantile(q), np.quantile(values, q))
+    np.testing.assert_array_equal(sketch.rank(np.sort(values)), np.arange(150) / 150)
+
+
+def test_group_sketches_merge_like_one_pass():
+    rng = np.random.default_rng(2)
+    values, codes = rng.normal(size=20_000), rng.integers(-1, 3, 20_000)
+    first = dict(enumerate(group_sketches(values[:15_000], codes[:15_000], 3)))
+    updates = dict(enumerate(group_sketches(values[15_000:], codes[15_000:], 3)))
+    combined = merge_sketches(first, updates)
+    assert combined[0] is not first[0] and first[0].count == np.count_nonzero(codes[:15_000] == 0)
+    for group in range(3):
+        members = values[codes == group]
+        assert combined[group].count == len(members)
+        assert max_rank_error(combined[group], members) <= rank_error_bound(200)
@@ -0,0 +1,48 @@
+"""SkillIndex against the pages' original split/explode/value_counts skill counts."""
+import numpy as np
+import pandas as pd
+
+from core.partition import TitlePartition
+from core.skills import SkillIndex
+
+
+def baseline_top(frame, n=10):
+    skills = frame["required_skills"].dropna().astype(str).str.split(",").explode().str.strip()
+    return skills.value_counts().head(n)
+
+
+def assert_matches_baseline(index, frame):
+    partition = TitlePartition(frame)
+    expected = baseline_top(frame)
+    got = index.top(10)
+    assert got.index.tolist() == expected.index.tolist()
+    assert got.tolist() == expected.tolist()
+    for title in partition.keys + ["Not A Title"]:
+        rows = partition.rows(title)
+        expected = baseline_top(frame[frame["job_title"] == title])
+        got = index.top(10, rows=rows)
+        # Same skills, counts and tie order
+        assert got.index.tolist() == expected.index.tolist(), title
+        assert got.tolist() == expected.tolist(), title
+
+
+def test_top_skills_match_value_counts(postings):
+    assert_matches_baseline(SkillIndex.from_series(postings["required_skills"]), postings)
+
+
+def test_counts_over_slices_and_positions(postings):
+    index = SkillIndex.from_series(postings["required_skills"])
+    rows = np.array([5, 3, 99, 3])
+    for selection, subset in ((slice(10, 50), postings.iloc[10:50]), (rows, postings.iloc[rows])):
+        counts = pd.Series(index.counts(selection), index=index.vocabulary)
+        expected = baseline_top(subset, n=None)
+        assert counts[counts > 0].sort_index().to_dict() == expected.sort_index().to_dict()
+
+
+def test_extension_matches_a_fresh_build(appended):
+    base, whole = appended
+    extended = SkillIndex.from_series(base["required_skills"]).extended(whole["required_skills"].iloc[len(base):])
+    fresh = SkillIndex.from_series(whole["required_skills"])
+    np.testing.assert_array_equal(extended.indptr, fresh.indptr)
+    assert extended.vocabulary[extended.indices].tolist() == fresh.vocabulary[fresh.indices].tolist()
+    assert_matches_baseline(extended, whole)
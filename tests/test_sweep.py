@@ -0,0 +1,65 @@
+"""What-if sweeps against one prediction per grid point."""
+import itertools
+
+import numpy as np
+import pytest
+
+from core.encoding import FEATURE_COLUMNS, predict_salaries
+from core.model_registry import get_model
+from core.sweep import YEARS_RANGE, build_grid, sweep
+
+BASE = {
+    "job_title": "Data Scientist",
+    "experience_level": "SE",
+    "employment_type": "FT",
+    "company_location": "United States",
+    "company_size": "L",
+    "education_required": "Master",
+    "years_experience": 5,
+}
+LEVELS = ["EN", "MI", "SE", "EX"]
+
+
+def point_prediction(bundle, profile):
+    return float(predict_salaries(bundle.model, bundle.encoder.encode_row(*[profile[c] for c in FEATURE_COLUMNS]))[0])
+
+
+def test_build_grid_is_the_cartesian_product():
+    grid = build_grid(BASE, {"years_experience": [0, 1, 2], "experience_level": LEVELS})
+    rows = list(zip(*(grid[col] for col in FEATURE_COLUMNS)))
+    expected = [tuple(dict(BASE, years_experience=y, experience_level=e)[c] for c in FEATURE_COLUMNS)
+                for y, e in itertools.product([0, 1, 2], LEVELS)]
+    assert rows == expected
+
+
+@pytest.mark.parametrize("dimensions", [
+    {"years_experience": YEARS_RANGE},
+    {"years_experience": [0, 10, 20], "experience_level": LEVELS},
+    {"company_location": ["United States", "Germany", "Nowhere"]},
+])
+def test_sweep_matches_per_point_predictions(dimensions):
+    bundle = get_model()
+    result = sweep(bundle, BASE, dimensions)
+    assert list(result.columns) == list(dimensions) + ["predicted_salary_usd"]
+    for row in result.to_dict("records"):
+        profile = dict(BASE, **{col: row[col] for col in dimensions})
+        assert np.isclose(row["predicted_salary_usd"], point_prediction(bundle, profile)), profile
+
+
+def test_custom_predictor_gets_the_encoded_grid():
+    bundle = get_model()
+    seen = []
+
+    def predict(b, encoded):
+        seen.append(encoded.shape)
+        return predict_salaries(b.model, encoded)
+
+    result = sweep(bundle, BASE, {"years_experience": [1, 2]}, predict=predict)
+    assert seen == [(2, len(FEATURE_COLUMNS))]
+    assert len(result) == 2
+
+
+@pytest.mark.parametrize("dimensions", [{}, {"a": [1], "b": [2], "c": [3]}, {"salary": [1]}])
+def test_invalid_dimensions(dimensions):
+    with pytest.raises(ValueError):
+        build_grid(BASE, dimensions)
@@ -0,0 +1,44 @@
+"""ViolinSummary: box statistics and the point budget."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.violin import ViolinSummary
+
+
+def frame_with_groups(sizes, seed=0):
+    rng = np.random.default_rng(seed)
+    groups = np.repeat([f"g{i}" for i in range(len(sizes))], sizes)
+    return pd.DataFrame({"group": groups, "salary": rng.normal(100_000, 20_000, len(groups))})
+
+
+def sample_sizes(summary):
+    return {group: len(curve["sample"]) for group, curve in summary.curves.items()}
+
+
+def test_box_statistics_match_the_data():
+    frame = frame_with_groups([500, 80, 1200])
+    summary = ViolinSummary(frame, "group", "salary")
+    assert summary.groups == ["g0", "g1", "g2"]
+    for group, values in frame.groupby("group")["salary"]:
+        curve = summary.curves[group]
+        assert (curve["q1"], curve["median"], curve["q3"]) == pytest.approx(np.percentile(values, [25, 50, 75]))
+        assert (curve["min"], curve["max"], curve["count"]) == (values.min(), values.max(), len(values))
+
+
+@pytest.mark.parametrize("sizes, budget", [
+    ([5000, 40, 40, 40], 300),          # small groups lifted to the minimum
+    ([200] * 100, 500),                 # more groups than budget / minimum
+    ([10_000, 3_000, 500], 1500),
+])
+def test_sample_stays_within_the_budget(sizes, budget):
+    summary = ViolinSummary(frame_with_groups(sizes), "group", "salary", max_points=budget, min_points=30)
+    sizes_taken = sample_sizes(summary)
+    assert sum(sizes_taken.values()) <= budget
+    floor = min(30, budget // len(sizes))
+    assert all(n >= min(floor, size) for n, size in zip(sizes_taken.values(), sizes))
+
+
+def test_budget_is_shared_by_group_size():
+    summary = ViolinSummary(frame_with_groups([9000, 1000]), "group", "salary", max_points=1000, min_points=0)
+    assert sample_sizes(summary) == {"g0": 900, "g1": 100}